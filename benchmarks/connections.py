@@ -0,0 +1,40 @@
+# Counts TCP connections opened while walking a synthetic organisation the README way.
+#
+#   python -m benchmarks.connections [circles] [roles] [people] [assignments]
+import sys
+import time
+
+from glassfrog import models
+from glassfrog.client import GlassFrogClient, count_requests
+from glassfrog.testing import FakeGlassFrogServer, generate_org
+
+
+def traverse():
+    with count_requests() as counter:
+        for circle in models.Circle.list():
+            for role in circle.roles:
+                for _ in role.people:
+                    pass
+    return counter.count
+
+
+def run(label, org, keep_alive):
+    GlassFrogClient.configure(keep_alive=keep_alive)
+    with FakeGlassFrogServer(org) as server, server.client():
+        start = time.perf_counter()
+        requests_made = traverse()
+        elapsed = time.perf_counter() - start
+
+    print(f'{label:<12} requests={requests_made:<6} connections={server.connections:<6} wall={elapsed:.3f}s')
+
+
+def main(argv):
+    circles, roles, people, assignments = [int(arg) for arg in argv] + [5, 40, 30, 80][len(argv):]
+    org = generate_org(circles=circles, roles=roles, people=people, assignments=assignments)
+    run('per-request', org, keep_alive=False)
+    run('pooled', org, keep_alive=True)
+    GlassFrogClient.configure(keep_alive=True)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,82 @@
+# Per-access cost of model fields and per-instance memory, for the slotted memoised models
+# against an equivalent unslotted, parse-on-every-access model.
+#
+#   python -m benchmarks.models [instances]
+import sys
+import timeit
+import tracemalloc
+
+from glassfrog import models
+
+
+class UnslottedProject:
+    # Stores its state in a __dict__ and parses dates on every access, like the models used to
+    def __init__(self, data, linked_data=None):
+        self._data = data
+        self._linked_data = linked_data
+        self._session = None
+
+    _get = models.Project._get
+    id = models.Project.id
+    status = models.Project.status
+    created_at = property(models.Project.created_at.fget.__wrapped__)
+    archived_at = property(models.Project.archived_at.fget.__wrapped__)
+
+
+def sample(pk):
+    return {
+        'id': pk,
+        'description': 'Please, fill up the experts in Hollywood',
+        'status': 'Waiting',
+        'value': 4,
+        'effort': 10,
+        'roi': 0.6,
+        'private_to_circle': True,
+        'created_at': '2016-11-06T18:51:12Z',
+        'archived_at': '2019-11-06T18:51:12Z',
+        'links': {'role': 100, 'person': 10, 'circle': 1},
+    }
+
+
+def access_cost(model_klass, field, number=20_000):
+    obj = model_klass(data=sample(1))
+    getattr(obj, field)
+    seconds = timeit.timeit(lambda: getattr(obj, field), number=number)
+    return seconds / number * 1e9
+
+
+def instance_memory(model_klass, count, fields=()):
+    data = [sample(pk) for pk in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [model_klass(data=item) for item in data]
+    for obj in objects:
+        for field in fields:
+            getattr(obj, field)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return allocated / count
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 20_000
+
+    print(f'{"field":<14} {"before":>10} {"after":>10}')
+    for field in ('id', 'status', 'created_at', 'archived_at'):
+        before = access_cost(UnslottedProject, field)
+        after = access_cost(models.Project, field)
+        print(f'{field:<14} {before:>8.0f}ns {after:>8.0f}ns')
+
+    before = instance_memory(UnslottedProject, count)
+    after = instance_memory(models.Project, count)
+    print(f'{"bytes/object":<14} {before:>10.0f} {after:>10.0f}')
+
+    # The unslotted model parses again on every access, so it keeps nothing; the slotted one keeps the datetime
+    before = instance_memory(UnslottedProject, count, fields=('created_at',))
+    after = instance_memory(models.Project, count, fields=('created_at',))
+    print(f'{"  + date read":<14} {before:>10.0f} {after:>10.0f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+# Times saving and re-opening a synthetic organisation snapshot.
+#
+#   python -m benchmarks.snapshots [assignments]
+import os
+import sys
+import tempfile
+import time
+
+from glassfrog import models
+from glassfrog.snapshot import OrganizationSnapshot
+
+
+def build_snapshot(assignments):
+    people = max(assignments // 5, 1)
+    roles = max(assignments // 10, 1)
+    circles = max(roles // 20, 1)
+    records = {
+        'circles': {
+            pk: {'id': pk, 'name': f'Circle {pk}', 'links': {'roles': []}}
+            for pk in range(1, circles + 1)
+        },
+        'roles': {
+            pk: {
+                'id': pk, 'name': f'Role {pk}', 'is_core': pk % 7 == 0, 'purpose': 'Keep things moving',
+                'links': {'circle': pk % circles + 1, 'people': [], 'domains': [], 'accountabilities': []},
+            }
+            for pk in range(1, roles + 1)
+        },
+        'people': {
+            pk: {'id': pk, 'name': f'Person {pk}', 'email': f'person{pk}@example.com', 'links': {'circles': []}}
+            for pk in range(1, people + 1)
+        },
+        'assignments': {
+            pk: {
+                'id': pk, 'election': '2020-01-01', 'exclude_from_meetings': False, 'focus': None,
+                'links': {'person': pk % people + 1, 'role': pk % roles + 1},
+            }
+            for pk in range(1, assignments + 1)
+        },
+    }
+    return OrganizationSnapshot(records=records)
+
+
+def main(argv):
+    assignments = int(argv[0]) if argv else 50_000
+    org_snapshot = build_snapshot(assignments)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'org.snapshot')
+
+        start = time.perf_counter()
+        org_snapshot.save(path)
+        saved = time.perf_counter()
+        print(f'save          {saved - start:.3f}s  {os.path.getsize(path) / 1024 / 1024:.1f} MiB')
+
+        for verify in (True, False):
+            start = time.perf_counter()
+            with OrganizationSnapshot.open(path, verify=verify) as opened:
+                open_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                assignment = opened.lookup(models.Assignment, assignments // 2)
+                _ = assignment.role.name
+                lookup_time = time.perf_counter() - start
+            print(f'open verify={verify!s:<5} {open_time * 1000:.2f}ms  first lookup {lookup_time * 1000:.2f}ms')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
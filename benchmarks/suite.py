@@ -0,0 +1,164 @@
+# Benchmarks traversal, field access, build() lookups and (de)serialisation against synthetic organisations
+# served locally, and stores the results as JSON so runs can be compared.
+#
+#   python -m benchmarks.suite [--sizes small,medium] [--output results.json] [--compare baseline.json]
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.models import sample as project_sample
+from glassfrog import models
+from glassfrog.client import count_requests
+from glassfrog.testing import FakeGlassFrogServer, generate_org
+
+# The served organisation, and how many objects the in-memory benchmarks use
+SIZES = {
+    'small': ({'circles': 3, 'roles': 12, 'people': 10, 'assignments': 24}, 1_000),
+    'medium': ({'circles': 10, 'roles': 100, 'people': 80, 'assignments': 300}, 10_000),
+    'large': ({'circles': 30, 'roles': 600, 'people': 400, 'assignments': 2_400}, 100_000),
+}
+METRICS = ('requests', 'seconds', 'retained_blocks', 'peak_bytes')
+_UNTRACED = (tracemalloc.Filter(False, tracemalloc.__file__),)  # the snapshots themselves
+
+
+def measure(func, repeat):
+    # Best wall time of `repeat` runs, then the memory blocks one more run leaves allocated (not how many it
+    # allocates in all, which tracemalloc can't count) and its peak memory
+    gc.collect()
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(_UNTRACED)
+    with count_requests() as counter:
+        func()
+    after = tracemalloc.take_snapshot().filter_traces(_UNTRACED)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    return {'requests': counter.count, 'seconds': min(seconds), 'retained_blocks': retained, 'peak_bytes': peak}
+
+
+def traversal():
+    # The README example
+    for circle in models.Circle.list():
+        for role in circle.roles:
+            for person in role.people:
+                _ = person.name
+
+
+def role_field_access(role_data):
+    # Fresh objects, so memoised fields are parsed once per object as in real use
+    for data in role_data:
+        role = models.Role(data=data)
+        _ = (role.id, role.name, role.is_core, role.elected_until, role.elected_until)
+
+
+def project_field_access(project_data):
+    for data in project_data:
+        project = models.Project(data=data)
+        _ = (project.id, project.status, project.value, project.roi, project.created_at, project.archived_at)
+
+
+def build_lookups(role_ids, linked_data):
+    for role_id in role_ids:
+        models.Role.build(id=role_id, linked_data=linked_data)
+
+
+def serialisation(roles):
+    for role in roles:
+        models.Role.deserialize(**role.serialize())
+
+
+def bulk_serialisation(roles):
+    models.Role.deserialize_many(models.Role.serialize_many(roles))
+
+
+def role_sample(pk):
+    return {
+        'id': pk,
+        'name': f'Role {pk}',
+        'is_core': pk % 4 == 0,
+        'elected_until': '2021-01-01' if pk % 4 == 0 else None,
+        'links': {'circle': pk % 10 + 1, 'people': [pk * 10, pk * 10 + 1]},
+    }
+
+
+def run_size(size, repeat):
+    shape, objects = SIZES[size]
+    org = generate_org(**shape)
+    role_data = [role_sample(pk) for pk in range(objects)]
+    project_data = [project_sample(pk) for pk in range(objects)]
+    roles = [models.Role(data=data) for data in role_data]
+    linked_data = models.LinkedData({'roles': role_data})
+
+    with FakeGlassFrogServer(org) as server, server.client():
+        results = {'traversal': measure(traversal, repeat)}
+
+    results['role_field_access'] = measure(lambda: role_field_access(role_data), repeat)
+    results['project_field_access'] = measure(lambda: project_field_access(project_data), repeat)
+    results['build_lookups'] = measure(lambda: build_lookups(range(objects), linked_data), repeat)
+    results['serialisation'] = measure(lambda: serialisation(roles), repeat)
+    listed_roles = [models.Role(data=data, linked_data=linked_data) for data in role_data]
+    results['bulk_serialisation'] = measure(lambda: bulk_serialisation(listed_roles), repeat)
+    return {f'{size}/{name}': result for name, result in results.items()}
+
+
+def compare(results, baseline):
+    print(f'{"benchmark":<32} {"metric":<16} {"baseline":>12} {"current":>12} {"change":>8}')
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in METRICS:
+            before, after = previous.get(metric), result[metric]
+            if before is None:  # not measured by that run
+                continue
+            change = f'{(after - before) / before * 100:+.1f}%' if before else ''
+            print(f'{name:<32} {metric:<16} {before:>12.4g} {after:>12.4g} {change:>8}')
+
+
+def report(results):
+    print(f'{"benchmark":<32} {"requests":>9} {"seconds":>10} {"retained blocks":>16} {"peak KiB":>10}')
+    for name, result in results.items():
+        print(
+            f'{name:<32} {result["requests"]:>9} {result["seconds"]:>10.4f} {result["retained_blocks"]:>16} '
+            f'{result["peak_bytes"] / 1024:>10.1f}'
+        )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    parser.add_argument('--sizes', default='small,medium', help=f'comma separated, among {", ".join(SIZES)}')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='compare with the results in this JSON file')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes.split(','):
+        results.update(run_size(size, repeat=args.repeat))
+
+    report(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'results': results,
+            }, output, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline:
+            compare(results, json.load(baseline)['results'])
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,7 +1,9 @@
+from glassfrog.concurrency import link_workers, set_link_workers
 from glassfrog.exceptions import (
     UnsupportedModelException,
     TokenUndefinedException,
 )
+from glassfrog.identity import session
 from glassfrog.models import (
     Organization,
     Circle,
@@ -11,15 +13,20 @@ from glassfrog.models import (
     Policy,
     Project,
 )
+from glassfrog.snapshot import OrganizationSnapshot
 
 __all__ = (
     'Accountability',
     'Circle',
     'Domain',
     'Organization',
+    'OrganizationSnapshot',
     'Policy',
     'Project',
     'Role',
     'TokenUndefinedException',
     'UnsupportedModelException',
+    'link_workers',
+    'session',
+    'set_link_workers',
 )
@@ -0,0 +1,175 @@
+# pylint: disable=redefined-builtin
+import asyncio
+import json
+from collections import namedtuple
+
+from requests import HTTPError, Response
+
+from glassfrog import exceptions
+from glassfrog.client import GlassFrogClient, _count_request
+from glassfrog.metrics import RequestEvent, observe
+from glassfrog.singleflight import AsyncSingleFlight
+
+try:
+    import aiohttp
+except ImportError:  # installed with the `async` extra
+    aiohttp = None
+
+
+class _Response(namedtuple('_Response', ['status_code', 'headers', 'content'])):
+    # A response already read in full, retried by the rate limiter like a sync one
+    def close(self):
+        pass
+
+
+class AsyncGlassFrogClient:
+    _LIMIT = 100  # connections kept open in total
+    _LIMIT_PER_HOST = 10  # connections kept open per host
+    _CONCURRENCY = 50  # requests in flight at once
+
+    _session = None
+    _semaphore = None
+    _loop = None
+    _closer = None  # async generator closing the session when its loop shuts down
+    _single_flight = AsyncSingleFlight()
+
+    @classmethod
+    def configure(cls, limit=None, limit_per_host=None, concurrency=None):
+        if limit is not None:
+            cls._LIMIT = limit
+        if limit_per_host is not None:
+            cls._LIMIT_PER_HOST = limit_per_host
+        if concurrency is not None:
+            cls._CONCURRENCY = concurrency
+        # applies to sessions opened from now on, `await close()` to drop the current one
+
+    @classmethod
+    async def close(cls):
+        closer = cls._closer
+        cls._session, cls._semaphore, cls._loop, cls._closer = None, None, None, None
+        if closer is not None:
+            await closer.aclose()
+
+    @classmethod
+    async def _get_session(cls):
+        if aiohttp is None:
+            raise exceptions.DependencyMissingException("Install glassfrog[async] to use the asyncio client")
+
+        loop = asyncio.get_running_loop()
+        if cls._session is None or cls._session.closed or cls._loop is not loop:
+            cls._detach()
+            connector = aiohttp.TCPConnector(limit=cls._LIMIT, limit_per_host=cls._LIMIT_PER_HOST)
+            cls._session = aiohttp.ClientSession(connector=connector)
+            cls._semaphore = asyncio.Semaphore(cls._CONCURRENCY)
+            cls._loop = loop
+            cls._closer = cls._closing(cls._session)
+            await cls._closer.asend(None)
+        return cls._session, cls._semaphore
+
+    @staticmethod
+    async def _closing(session):
+        # Loops close the async generators left open before shutting down (asyncio.run does), so the session's
+        # connections are closed while their loop can still do it
+        try:
+            yield
+        finally:
+            await session.close()
+
+    @classmethod
+    def _detach(cls):
+        # Dropping the closer has a loop still running close the session; a closed one can only drop its connections
+        session, loop = cls._session, cls._loop
+        cls._session, cls._semaphore, cls._loop, cls._closer = None, None, None, None
+        if session is not None and not session.closed and loop.is_closed():
+            connector = session.connector
+            session.detach()
+            connector._close()
+
+    @classmethod
+    async def get(cls, resource, id=None, from_resource=None):
+        url = GlassFrogClient._build_url(resource=resource, id=id, from_resource=from_resource)
+        with observe(GlassFrogClient._observers, RequestEvent(resource=resource, url=url)) as event:
+            key = GlassFrogClient._cache_key(resource=resource, id=id, from_resource=from_resource)
+            return await cls._get(url=url, key=key, event=event)
+
+    @classmethod
+    async def _get(cls, url, key, event):
+        cache = GlassFrogClient._cache
+        if cache is not None:
+            data = cache.get(key)
+            if data is not None:
+                event.source = 'memory'
+                return data
+
+        headers = GlassFrogClient._get_headers()
+        data, size = await cls._single_flight.do(
+            (GlassFrogClient._TOKEN, url),
+            lambda: cls._fetch(url=url, headers=headers, event=event),
+        )
+        if not event.attempts:
+            event.source = 'coalesced'
+        event.size = size
+
+        if cache is not None:
+            cache.set(key, data, size=size)
+        return data
+
+    @classmethod
+    async def _fetch(cls, url, headers, event=None):
+        disk_cache = GlassFrogClient._disk_cache
+        if disk_cache is None:
+            response = await cls._request(url=url, headers=headers, event=event)
+            cls._raise_for_status(url=url, response=response)
+            return json.loads(response.content), len(response.content)
+
+        # Entries are read and written (under a file lock) in the default executor, off the loop's thread
+        loop = asyncio.get_running_loop()
+        disk_key = GlassFrogClient._disk_key(url)
+        entry = await loop.run_in_executor(None, disk_cache.get, disk_key)
+        headers = GlassFrogClient._revalidation_headers(headers, entry)
+        response = await cls._request(url=url, headers=headers, event=event)
+        if entry is not None and response.status_code == 304:
+            if event is not None:
+                event.source = 'disk'
+            return entry.data, entry.size
+
+        cls._raise_for_status(url=url, response=response)
+        data = json.loads(response.content)
+        await loop.run_in_executor(None, GlassFrogClient._store_disk_entry, disk_cache, disk_key, response, data)
+        return data, len(response.content)
+
+    @classmethod
+    def _raise_for_status(cls, url, response):
+        if response.status_code >= 400:
+            raise cls._build_error(url=url, status=response.status_code, content=response.content)
+
+    @classmethod
+    def coalescing_stats(cls):
+        return cls._single_flight.stats()
+
+    @classmethod
+    async def _request(cls, url, headers, event=None):
+        session, semaphore = await cls._get_session()
+
+        async def send():
+            async with semaphore:  # pylint: disable=not-async-context-manager
+                _count_request()
+                if event is not None:
+                    event.attempts += 1
+                async with session.get(url, headers=headers) as response:
+                    content = await response.read()
+                    if event is not None:
+                        event.status = response.status
+                    return _Response(status_code=response.status, headers=response.headers, content=content)
+
+        retry_on = (ConnectionError, aiohttp.ClientConnectionError)
+        return await GlassFrogClient._rate_limiter.acall(send, retry_on=retry_on)
+
+    @classmethod
+    def _build_error(cls, url, status, content):
+        # Same error type as the sync client, so models handle both alike
+        response = Response()
+        response.status_code = status
+        response.url = url
+        response._content = content
+        return HTTPError(f'{status} Error for url: {url}', response=response)
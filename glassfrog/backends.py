@@ -0,0 +1,169 @@
+import math
+import sqlite3
+import threading
+import time
+
+
+class CacheBackend:
+    # Bytes by string key, shared by whoever uses the same backend. A ttl is in seconds: None never expires and
+    # one that has already run out (<= 0) removes the key.
+    def get(self, key):
+        raise NotImplementedError
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    # Shared by the threads of one process
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._entries = {}  # key -> (expires_at or None, value)
+        self._purge_at = 1024  # size from which expired entries are dropped, doubled as the cache grows
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl=None):
+        if ttl is not None and ttl <= 0:
+            self.delete(key)
+            return
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, bytes(value))
+            if len(self._entries) >= self._purge_at:
+                self._purge()
+                self._purge_at = max(1024, 2 * len(self._entries))
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _purge(self):
+        now = self._clock()
+        for key, (expires_at, _) in list(self._entries.items()):
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend(CacheBackend):
+    # Shared by every process on the host that opens the same file
+    _PURGE_EVERY = 1000  # sets between deletions of expired rows
+
+    def __init__(self, path, clock=time.time, timeout=30):
+        self.path = path
+        self._clock = clock
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._sets = 0
+        with self._lock:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS glassfrog_cache '
+                '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)'
+            )
+
+    def _execute(self, sql, parameters=()):
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def get(self, key):
+        return self.get_many([key])[0]
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        placeholders = ','.join('?' * len(keys))
+        rows = self._execute(
+            f'SELECT key, value FROM glassfrog_cache WHERE key IN ({placeholders}) '
+            'AND (expires_at IS NULL OR expires_at > ?)',
+            (*keys, self._clock()),
+        )
+        found = dict(rows)
+        return [found.get(key) for key in keys]
+
+    def set(self, key, value, ttl=None):
+        if ttl is not None and ttl <= 0:
+            self.delete(key)
+            return
+        expires_at = None if ttl is None else self._clock() + ttl
+        self._execute(
+            'INSERT OR REPLACE INTO glassfrog_cache (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, bytes(value), expires_at),
+        )
+        self._sets += 1
+        if not self._sets % self._PURGE_EVERY:
+            self.purge()
+
+    def delete(self, key):
+        self._execute('DELETE FROM glassfrog_cache WHERE key = ?', (key,))
+
+    def clear(self):
+        self._execute('DELETE FROM glassfrog_cache')
+
+    def purge(self):
+        self._execute('DELETE FROM glassfrog_cache WHERE expires_at <= ?', (self._clock(),))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class KeyValueBackend(CacheBackend):
+    # Adapts a key-value client with the redis-py calls get, set(ex=), delete and scan_iter (mget when it has it),
+    # so a cache server can be shared by a whole cluster. Its expiry has a granularity of whole seconds.
+    def __init__(self, client, prefix=''):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        mget = getattr(self.client, 'mget', None)
+        if mget is None:
+            return super().get_many(keys)
+        return list(mget([self.prefix + key for key in keys]))
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            self.client.set(self.prefix + key, value)
+        elif ttl <= 0:
+            self.delete(key)
+        else:
+            self.client.set(self.prefix + key, value, ex=math.ceil(ttl))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
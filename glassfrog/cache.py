@@ -0,0 +1,295 @@
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager, suppress
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction is not serialised between processes
+    fcntl = None
+
+
+class ResponseCache:  # pylint: disable=too-many-instance-attributes
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=60, ttls=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})  # resource name -> seconds, 0 disables caching for that resource
+        self._clock = clock
+
+        self._entries = OrderedDict()  # key -> (expires_at, size, value), least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_ttl(self, resource):
+        return self.ttls.get(resource, self.ttl)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires_at, _, value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if expires_at <= self._clock():
+                self._discard(key)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, size=0):
+        resource = key[0]
+        ttl = self.get_ttl(resource)
+        if not ttl or (self.max_bytes is not None and size > self.max_bytes):
+            return
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (self._clock() + ttl, size, value)
+            self._bytes += size
+            self._evict()
+
+    def invalidate(self, resource=None):
+        with self._lock:
+            if resource is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                for key in [key for key in self._entries if key[0] == resource]:
+                    self._discard(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+
+class _SharedCache:
+    # Entries live in a CacheBackend shared between processes. Their keys carry a generation for everything and one
+    # per resource, which invalidate() replaces, so every process stops seeing the old entries at once without the
+    # backend having to list keys; those expire on their own.
+    def __init__(self, backend, ttl, ttls, namespace):
+        self.backend = backend
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})  # resource name -> seconds, 0 disables caching for that resource
+        self.namespace = namespace
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_ttl(self, resource):
+        return self.ttls.get(resource, self.ttl)
+
+    def _generation_key(self, resource=None):
+        if resource is None:
+            return f'{self.namespace}:generation'
+        return f'{self.namespace}:{resource}:generation'
+
+    def _entry_key(self, resource, key):
+        generations = self.backend.get_many([self._generation_key(), self._generation_key(resource)])
+        version = '.'.join((generation or b'0').decode() for generation in generations)
+        digest = hashlib.sha256(json.dumps(key, default=str).encode()).hexdigest()[:32]
+        return f'{self.namespace}:{resource}:{version}:{digest}'
+
+    def _get(self, resource, key):
+        value = None
+        if self.get_ttl(resource):
+            value = self.backend.get(self._entry_key(resource, key))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def _set(self, resource, key, value):
+        ttl = self.get_ttl(resource)
+        if ttl:
+            self.backend.set(self._entry_key(resource, key), value, ttl=ttl)
+
+    def _invalidate(self, resource):
+        self.backend.set(self._generation_key(resource), os.urandom(8).hex().encode())
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+class SharedResponseCache(_SharedCache):
+    # Drop-in for ResponseCache, with the same keys and time-to-live per resource
+    def __init__(self, backend, ttl=60, ttls=None, namespace='glassfrog'):
+        super().__init__(backend=backend, ttl=ttl, ttls=ttls, namespace=namespace)
+
+    def get(self, key, default=None):
+        value = self._get(resource=key[0], key=key)
+        if value is None:
+            return default
+        return json.loads(value)
+
+    def set(self, key, value, size=0):
+        self._set(resource=key[0], key=key, value=json.dumps(value, separators=(',', ':')).encode())
+
+    def invalidate(self, resource=None):
+        self._invalidate(resource)
+
+
+class SharedModelCache(_SharedCache):
+    # Lists of model instances by model and key (an id, a listing name, ...), stored with serialize_many
+    def __init__(self, backend, ttl=300, ttls=None, namespace='glassfrog-models'):
+        super().__init__(backend=backend, ttl=ttl, ttls=ttls, namespace=namespace)
+
+    def get(self, model_klass, key):
+        payload = self._get(resource=model_klass._RESOURCE_NAME, key=key)
+        if payload is None:
+            return None
+        return model_klass.deserialize_many(payload)
+
+    def set(self, model_klass, key, objects):
+        self._set(resource=model_klass._RESOURCE_NAME, key=key, value=model_klass.serialize_many(objects))
+
+    def invalidate(self, model_klass=None):
+        self._invalidate(None if model_klass is None else model_klass._RESOURCE_NAME)
+
+
+DiskCacheEntry = namedtuple('DiskCacheEntry', ['etag', 'last_modified', 'data', 'size'])
+
+
+class DiskCache:
+    _SUFFIX = '.entry'
+    _RESCAN_EVERY = 256  # writes between directory scans, which also count what other processes wrote
+    _LOW_WATER = 0.9  # eviction frees space down to this share of max_bytes, so it doesn't run on every write
+
+    def __init__(self, directory, max_bytes=100 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._estimated_bytes = None  # size at the last scan plus what this process wrote since, None before a scan
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest + self._SUFFIX)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as entry_file:
+                etag, last_modified, data, size = marshal.load(entry_file)
+            os.utime(path)  # keeps recently used entries away from eviction
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return DiskCacheEntry(etag=etag, last_modified=last_modified, data=data, size=size)
+
+    def set(self, key, entry):
+        content = marshal.dumps(tuple(entry))
+        if len(content) > self.max_bytes:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, self._path(key))  # atomic, readers see the old or the new entry
+        except OSError:
+            with suppress(OSError):
+                os.remove(tmp_path)
+            return
+        self._written(len(content))
+
+    def _written(self, size):
+        # Overwritten entries are counted twice, which only brings the next scan forward
+        with self._lock:
+            self._writes += 1
+            if self._estimated_bytes is not None and self._writes % self._RESCAN_EVERY:
+                self._estimated_bytes += size
+                if self._estimated_bytes <= self.max_bytes:
+                    return
+        self._evict()
+
+    def clear(self):
+        with self._locked():
+            for path in self._entry_paths():
+                with suppress(OSError):
+                    os.remove(path)
+        with self._lock:
+            self._estimated_bytes = 0
+
+    def _entry_paths(self):
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(self._SUFFIX)
+        ]
+
+    def _evict(self):
+        with self._locked():
+            entries = []
+            for path in self._entry_paths():
+                with suppress(OSError):
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                total = self._remove_oldest(entries, total, target=self.max_bytes * self._LOW_WATER)
+        with self._lock:
+            self._estimated_bytes = total
+
+    @staticmethod
+    def _remove_oldest(entries, total, target):
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            with suppress(OSError):
+                os.remove(path)
+            total -= size
+        return total
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.directory, '.lock'), 'a+b') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -1,20 +1,142 @@
 # pylint: disable=redefined-builtin
+import contextvars
+import hashlib
 import os
+import threading
+from contextlib import contextmanager
 
 import requests
-from retrying import retry
+from requests.adapters import HTTPAdapter
 
 from glassfrog import exceptions
+from glassfrog.cache import DiskCacheEntry
+from glassfrog.metrics import RequestEvent, observe
+from glassfrog.ratelimit import RateLimiter
+from glassfrog.singleflight import SingleFlight
+from glassfrog.streaming import StreamedList
 
 
-def retry_if_conn_error(exception):
-    return isinstance(exception, ConnectionError) or isinstance(exception, requests.HTTPError)
+class RequestCounter:
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def increment(self):
+        with self._lock:
+            self.count += 1
+
+
+_request_counters = contextvars.ContextVar('glassfrog_request_counters', default=())
+
+
+def _count_request():
+    for counter in _request_counters.get():
+        counter.increment()
+
+
+@contextmanager
+def count_requests():
+    counter = RequestCounter()
+    token = _request_counters.set(_request_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _request_counters.reset(token)
 
 
 class GlassFrogClient:
     _URL = 'https://api.glassfrog.com/api/v3'
     _TOKEN = os.environ.get('GLASSFROG_API_TOKEN')
 
+    _POOL_CONNECTIONS = 10  # how many hosts keep a connection pool
+    _POOL_MAXSIZE = 10  # how many connections are kept open per host
+    _POOL_BLOCK = False  # wait for a free connection instead of opening one beyond the limit
+    _KEEP_ALIVE = True
+
+    _session = None
+    _session_lock = threading.Lock()
+
+    _cache = None
+    _disk_cache = None
+    _rate_limiter = RateLimiter()
+    _single_flight = SingleFlight()
+    _observers = ()
+
+    _STREAM_CHUNK_SIZE = 64 * 1024
+
+    @classmethod
+    def configure(cls, pool_connections=None, pool_maxsize=None, pool_block=None, keep_alive=None):
+        with cls._session_lock:
+            if pool_connections is not None:
+                cls._POOL_CONNECTIONS = pool_connections
+            if pool_maxsize is not None:
+                cls._POOL_MAXSIZE = pool_maxsize
+            if pool_block is not None:
+                cls._POOL_BLOCK = pool_block
+            if keep_alive is not None:
+                cls._KEEP_ALIVE = keep_alive
+            cls._close_session()
+
+    @classmethod
+    def set_cache(cls, cache):
+        cls._cache = cache
+
+    @classmethod
+    def set_disk_cache(cls, disk_cache):
+        cls._disk_cache = disk_cache
+
+    @classmethod
+    def set_rate_limiter(cls, rate_limiter):
+        cls._rate_limiter = rate_limiter
+
+    @classmethod
+    def remaining_requests(cls):
+        return cls._rate_limiter.remaining
+
+    @classmethod
+    def add_observer(cls, observer):
+        cls._observers += (observer,)
+
+    @classmethod
+    def remove_observer(cls, observer):
+        cls._observers = tuple(registered for registered in cls._observers if registered is not observer)
+
+    @classmethod
+    def coalescing_stats(cls):
+        return cls._single_flight.stats()
+
+    @classmethod
+    def close(cls):
+        with cls._session_lock:
+            cls._close_session()
+
+    @classmethod
+    def _close_session(cls):
+        if cls._session is not None:
+            cls._session.close()
+            cls._session = None
+
+    @classmethod
+    def _get_session(cls):
+        session = cls._session
+        if session is not None:
+            return session
+
+        with cls._session_lock:
+            if cls._session is None:
+                adapter = HTTPAdapter(
+                    pool_connections=cls._POOL_CONNECTIONS,
+                    pool_maxsize=cls._POOL_MAXSIZE,
+                    pool_block=cls._POOL_BLOCK,
+                )
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                if not cls._KEEP_ALIVE:
+                    session.headers['Connection'] = 'close'
+                cls._session = session
+            return cls._session
+
     @classmethod
     def _get_headers(cls):
         if not cls._TOKEN:
@@ -26,20 +148,114 @@ class GlassFrogClient:
         }
 
     @classmethod
-    def get(cls, resource, id=None, from_resource=None):
+    def _request(cls, url, headers, stream=False, event=None):
+        def send():
+            _count_request()
+            if event is not None:
+                event.attempts += 1
+            response = cls._get_session().get(url=url, headers=headers, stream=stream)
+            if event is not None:
+                event.status = response.status_code
+            return response
+
+        return cls._rate_limiter.call(send, retry_on=(ConnectionError, requests.ConnectionError))
+
+    @classmethod
+    def _build_url(cls, resource, id=None, from_resource=None):
         if from_resource:
             if not id:
                 raise UnboundLocalError()
-            url = f'{cls._URL}/{from_resource}/{id}/{resource}'
+            return f'{cls._URL}/{from_resource}/{id}/{resource}'
         elif id:
-            url = f'{cls._URL}/{resource}/{id}'
+            return f'{cls._URL}/{resource}/{id}'
         else:
-            url = f'{cls._URL}/{resource}'
+            return f'{cls._URL}/{resource}'
+
+    @classmethod
+    def get(cls, resource, id=None, from_resource=None):
+        url = cls._build_url(resource=resource, id=id, from_resource=from_resource)
+        with observe(cls._observers, RequestEvent(resource=resource, url=url)) as event:
+            key = cls._cache_key(resource=resource, id=id, from_resource=from_resource)
+            return cls._get(url=url, key=key, event=event)
+
+    @classmethod
+    def _get(cls, url, key, event):
+        cache = cls._cache
+        if cache is not None:
+            data = cache.get(key)
+            if data is not None:
+                event.source = 'memory'
+                return data
+
+        data, size = cls._single_flight.do((cls._TOKEN, url), lambda: cls._fetch(url=url, event=event))
+        if not event.attempts:
+            event.source = 'coalesced'
+        event.size = size
+
+        if cache is not None:
+            cache.set(key, data, size=size)
+        return data
+
+    @classmethod
+    def stream(cls, resource, id=None, from_resource=None):
+        # Bypasses the response caches: the body is decoded while it downloads and never held as a whole
+        url = cls._build_url(resource=resource, id=id, from_resource=from_resource)
+        response = cls._request(url=url, headers=cls._get_headers(), stream=True)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        chunks = response.iter_content(chunk_size=cls._STREAM_CHUNK_SIZE)
+        return StreamedList(chunks=chunks, resource=resource, close=response.close)
+
+    @classmethod
+    def _fetch(cls, url, event=None):
+        headers = cls._get_headers()
+        disk_cache = cls._disk_cache
+        if disk_cache is None:
+            response = cls._request(url=url, headers=headers, event=event)
+            response.raise_for_status()
+            return response.json(), len(response.content)
+
+        disk_key = cls._disk_key(url)
+        entry = disk_cache.get(disk_key)
+        response = cls._request(url=url, headers=cls._revalidation_headers(headers, entry), event=event)
+        if entry is not None and response.status_code == 304:
+            if event is not None:
+                event.source = 'disk'
+            return entry.data, entry.size
 
-        with retry(stop_max_attempt_number=3, retry_on_exception=retry_if_conn_error):
-            response = requests.get(
-                url=url,
-                headers=cls._get_headers(),
-            )
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        cls._store_disk_entry(disk_cache, disk_key, response, data)
+        return data, len(response.content)
+
+    @classmethod
+    def _cache_key(cls, resource, id, from_resource):
+        # Responses differ per token, so a cache shared between processes mustn't hand one organization's to another
+        token_digest = hashlib.sha256((cls._TOKEN or '').encode()).hexdigest()[:16]
+        return resource, id, from_resource, token_digest
+
+    @classmethod
+    def _disk_key(cls, url):
+        return f'{cls._TOKEN} {url}'
+
+    @staticmethod
+    def _revalidation_headers(headers, entry):
+        headers = dict(headers)
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    @staticmethod
+    def _store_disk_entry(disk_cache, disk_key, response, data):
+        # Shared with the asyncio client, whose responses have the same status_code, headers and content
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            entry = DiskCacheEntry(etag=etag, last_modified=last_modified, data=data, size=len(response.content))
+            disk_cache.set(disk_key, entry)
@@ -0,0 +1,258 @@
+# pylint: disable=redefined-builtin
+import math
+import operator
+from array import array
+from datetime import date, datetime, timezone
+from itertools import compress
+
+from glassfrog import exceptions
+
+
+class Mask:
+    # One byte per row, combined with whole-buffer integer operations
+    __slots__ = ('_bytes',)
+
+    def __init__(self, values):
+        self._bytes = bytes(values)
+
+    @classmethod
+    def _combine(cls, left, right, combine):
+        size = len(left._bytes)
+        if size != len(right._bytes):
+            raise exceptions.UnexpectedDataFormat("Masks of different lengths")
+        value = combine(int.from_bytes(left._bytes, 'little'), int.from_bytes(right._bytes, 'little'))
+        return cls(value.to_bytes(size, 'little'))
+
+    def __and__(self, other):
+        return self._combine(self, other, operator.and_)
+
+    def __or__(self, other):
+        return self._combine(self, other, operator.or_)
+
+    def __invert__(self):
+        return self._combine(self, Mask(b'\x01' * len(self._bytes)), operator.xor)
+
+    def __len__(self):
+        return len(self._bytes)
+
+    def __iter__(self):
+        return iter(self._bytes)
+
+    def count(self):
+        return self._bytes.count(1)
+
+    def indexes(self):
+        return list(compress(range(len(self._bytes)), self._bytes))
+
+
+def _parse_date(value):
+    return date.fromisoformat(value).toordinal()
+
+
+def _parse_datetime(value):
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc).timestamp()
+
+
+class Column:
+    # kind -> (array typecode or None for a plain list, raw value -> stored value, stored value -> python value)
+    _KINDS = {
+        'int': ('q', int, int),
+        'link': ('q', int, int),
+        'float': ('d', float, float),
+        'bool': ('b', int, bool),
+        'date': ('l', _parse_date, date.fromordinal),
+        'datetime': ('d', _parse_datetime, lambda value: datetime.fromtimestamp(value, tz=timezone.utc)),
+        'str': (None, str, str),
+    }
+
+    def __init__(self, name, kind, values, valid):
+        self.name = name
+        self.kind = kind
+        self.values = values
+        self.valid = valid  # bytes, 1 where the value isn't null
+
+    @classmethod
+    def build(cls, name, kind, raw_values):
+        typecode, store, _ = cls._KINDS[kind]
+        valid = bytearray()
+        stored = []
+        missing = math.nan if typecode == 'd' else 0
+        for value in raw_values:
+            if value is None or (value == '' and typecode):
+                valid.append(0)
+                stored.append(missing if typecode else None)
+            else:
+                valid.append(1)
+                stored.append(store(value))
+        values = array(typecode, stored) if typecode else stored
+        return cls(name=name, kind=kind, values=values, valid=bytes(valid))
+
+    def take(self, indexes):
+        values = self.values
+        taken = [values[index] for index in indexes]
+        if isinstance(values, array):
+            taken = array(values.typecode, taken)
+        return Column(name=self.name, kind=self.kind, values=taken, valid=bytes(self.valid[index] for index in indexes))
+
+    def _operand(self, other):
+        if isinstance(other, date) and not isinstance(other, datetime) and self.kind == 'date':
+            return other.toordinal()
+        if isinstance(other, datetime) and self.kind == 'datetime':
+            return other.timestamp()
+        if hasattr(other, '_RESOURCE_NAME'):  # a model instance, compared by id
+            return other.id
+        return other
+
+    def _compare(self, compare, other):
+        if other is None:
+            return self.isnull() if compare is operator.eq else self.notnull()
+        operand = self._operand(other)
+        # null cells hold a placeholder (None in a list column) that is never compared
+        return Mask(valid and compare(value, operand) for value, valid in zip(self.values, self.valid))
+
+    def __eq__(self, other):
+        return self._compare(operator.eq, other)
+
+    def __ne__(self, other):
+        return self._compare(operator.ne, other)
+
+    def __lt__(self, other):
+        return self._compare(operator.lt, other)
+
+    def __le__(self, other):
+        return self._compare(operator.le, other)
+
+    def __gt__(self, other):
+        return self._compare(operator.gt, other)
+
+    def __ge__(self, other):
+        return self._compare(operator.ge, other)
+
+    __hash__ = None
+
+    def isin(self, others):
+        others = {self._operand(other) for other in others}
+        return Mask(valid and value in others for value, valid in zip(self.values, self.valid))
+
+    def isnull(self):
+        return ~self.notnull()
+
+    def notnull(self):
+        return Mask(self.valid)
+
+    def _present(self):
+        return compress(self.values, self.valid)
+
+    def sum(self):
+        return sum(self._present())
+
+    def mean(self):
+        present = list(self._present())
+        return sum(present) / len(present) if present else None
+
+    def min(self):
+        return self._convert(min(self._present(), default=None))
+
+    def max(self):
+        return self._convert(max(self._present(), default=None))
+
+    def count(self):
+        return self.valid.count(1)
+
+    def _convert(self, value):
+        if value is None:
+            return None
+        return self._KINDS[self.kind][2](value)
+
+    def __getitem__(self, index):
+        if not self.valid[index]:
+            return None
+        return self._convert(self.values[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self.valid)
+
+
+class ColumnarResult:
+    def __init__(self, model_klass, rows, columns, linked_data=None, objects=None):
+        self.model_klass = model_klass
+        self._rows = rows
+        self._columns = columns  # name -> Column
+        self._linked_data = linked_data
+        self._objects = objects
+
+    @classmethod
+    def from_rows(cls, model_klass, rows, linked_data=None, objects=None):
+        columns = {}
+        for name, kind in model_klass._COLUMNS:
+            if kind == 'link':
+                raw_values = [(row.get('links') or {}).get(name) for row in rows]
+            else:
+                raw_values = [row.get(name) for row in rows]
+            columns[name] = Column.build(name=name, kind=kind, raw_values=raw_values)
+        return cls(model_klass=model_klass, rows=rows, columns=columns, linked_data=linked_data, objects=objects)
+
+    @classmethod
+    def from_models(cls, model_klass, objects):
+        objects = list(objects)
+        return cls.from_rows(model_klass=model_klass, rows=[obj._data for obj in objects], objects=objects)
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._columns[key]
+        if isinstance(key, Mask):
+            return self.take(key.indexes())
+        return self.model(key)
+
+    def take(self, indexes):
+        return ColumnarResult(
+            model_klass=self.model_klass,
+            rows=[self._rows[index] for index in indexes],
+            columns={name: column.take(indexes) for name, column in self._columns.items()},
+            linked_data=self._linked_data,
+            objects=[self._objects[index] for index in indexes] if self._objects is not None else None,
+        )
+
+    def filter(self, mask=None, **values):
+        for name, value in values.items():
+            condition = self._columns[name] == value
+            mask = condition if mask is None else mask & condition
+        return self if mask is None else self[mask]
+
+    def sort_by(self, name, reverse=False):
+        column = self._columns[name]
+        values, valid = column.values, column.valid
+        present = sorted((index for index in range(len(valid)) if valid[index]), key=values.__getitem__,
+                         reverse=reverse)
+        nulls = [index for index in range(len(valid)) if not valid[index]]
+        return self.take(present + nulls)  # nulls last
+
+    def group_by(self, name):
+        column = self._columns[name]
+        groups = {}
+        for index, value in enumerate(column):
+            groups.setdefault(value, []).append(index)
+        return {value: self.take(indexes) for value, indexes in groups.items()}
+
+    def model(self, index):
+        if self._objects is not None:
+            return self._objects[index]
+        return self.model_klass(data=self._rows[index], linked_data=self._linked_data)._register()
+
+    def models(self):
+        for index in range(len(self)):
+            yield self.model(index)
+
+    def __iter__(self):
+        return self.models()
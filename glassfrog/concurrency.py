@@ -0,0 +1,41 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+_link_workers = contextvars.ContextVar('glassfrog_link_workers', default=None)
+_default_link_workers = None
+
+
+def set_link_workers(max_workers):
+    global _default_link_workers  # pylint: disable=global-statement
+    _default_link_workers = max_workers
+
+
+def get_link_workers(default=1):
+    max_workers = _link_workers.get()
+    if max_workers is None:
+        max_workers = _default_link_workers
+    if max_workers is None:
+        max_workers = default
+    return max_workers
+
+
+@contextmanager
+def link_workers(max_workers):
+    token = _link_workers.set(max_workers)
+    try:
+        yield
+    finally:
+        _link_workers.reset(token)
+
+
+def map_ordered(func, items, max_workers):
+    items = list(items)
+    max_workers = min(max_workers, len(items))
+    if max_workers <= 1:
+        return [func(item) for item in items]
+
+    # each task runs in a copy of the caller's context, so sessions and scoped settings follow it
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, func, item) for item in items]
+        return [future.result() for future in futures]
@@ -12,3 +12,7 @@ class UnexpectedDataFormat(Exception):
 
 class DoesNotExist(Exception):
     pass
+
+
+class DependencyMissingException(Exception):
+    pass
@@ -0,0 +1,126 @@
+# pylint: disable=redefined-builtin
+
+
+def _links(data):
+    return data.get('links') or {}
+
+
+class CircleTree:  # pylint: disable=too-many-instance-attributes
+    # Nested-set numbering of the circle hierarchy: a circle's subtree is the contiguous run of circles (and of
+    # their roles) between its enter and exit positions in a pre-order walk
+    def __init__(self, parents, roles):
+        self._parents = dict(parents)  # circle id -> parent circle id or None
+        self._children = {circle_id: [] for circle_id in self._parents}
+        self.roots = []
+        for circle_id, parent_id in self._parents.items():
+            if parent_id in self._children and parent_id != circle_id:
+                self._children[parent_id].append(circle_id)
+            else:
+                self._parents[circle_id] = None
+                self.roots.append(circle_id)
+
+        self._roles = {circle_id: [] for circle_id in self._parents}  # circle id -> its own role ids
+        self._role_circles = {}
+        for role_id, circle_id in roles:
+            if circle_id in self._roles:
+                self._roles[circle_id].append(role_id)
+                self._role_circles[role_id] = circle_id
+
+        self._order = []  # circle ids, pre-order
+        self._role_order = []  # role ids, grouped by circle in pre-order
+        self._enter = {}
+        self._exit = {}
+        self._role_span = {}  # circle id -> (start, end) in _role_order
+        self._depth = {}
+        self._number()
+
+    @classmethod
+    def from_data(cls, circles, roles):
+        # Raw circle and role data, as listed by the API: a circle's parent is the circle of the role it supports
+        circles = list(circles)
+        roles = list(roles)
+        role_circles = {role['id']: _links(role).get('circle') for role in roles}
+        parents = {circle['id']: role_circles.get(_links(circle).get('supported_role')) for circle in circles}
+        for role in roles:
+            supporting_circle = _links(role).get('supporting_circle')
+            if supporting_circle in parents and parents[supporting_circle] is None:
+                parents[supporting_circle] = role_circles[role['id']]
+        return cls(parents=parents, roles=role_circles.items())
+
+    @classmethod
+    def from_models(cls, circles, roles):
+        return cls.from_data(circles=[circle._data for circle in circles], roles=[role._data for role in roles])
+
+    def _number(self):
+        visited = set()
+        for root in list(self.roots):
+            self._walk(root, visited)
+        for circle_id in self._parents:
+            if circle_id not in visited:
+                # Only reachable through a cycle of parents: break it here
+                self._children[self._parents[circle_id]].remove(circle_id)
+                self._parents[circle_id] = None
+                self.roots.append(circle_id)
+                self._walk(circle_id, visited)
+
+    def _walk(self, root, visited):
+        # Iterative, so deep hierarchies don't hit the recursion limit
+        stack = [(root, 0, False)]
+        while stack:
+            circle_id, depth, leaving = stack.pop()
+            if leaving:
+                self._exit[circle_id] = len(self._order)
+                self._role_span[circle_id] = (self._role_span[circle_id][0], len(self._role_order))
+                continue
+            visited.add(circle_id)
+            self._enter[circle_id] = len(self._order)
+            self._depth[circle_id] = depth
+            self._order.append(circle_id)
+            self._role_span[circle_id] = (len(self._role_order), None)
+            self._role_order.extend(self._roles[circle_id])
+            stack.append((circle_id, depth, True))
+            stack.extend((child, depth + 1, False) for child in reversed(self._children[circle_id]))
+
+    def __contains__(self, circle_id):
+        return circle_id in self._enter
+
+    def __len__(self):
+        return len(self._order)
+
+    def parent(self, circle_id):
+        return self._parents[circle_id]
+
+    def children(self, circle_id):
+        return list(self._children[circle_id])
+
+    def depth(self, circle_id):
+        return self._depth[circle_id]
+
+    def is_descendant(self, circle_id, ancestor_id):
+        # True for the circle itself too
+        return self._enter[ancestor_id] <= self._enter[circle_id] < self._exit[ancestor_id]
+
+    def ancestors(self, circle_id):
+        # Closest first
+        chain = []
+        parent_id = self._parents[circle_id]
+        while parent_id is not None:
+            chain.append(parent_id)
+            parent_id = self._parents[parent_id]
+        return chain
+
+    def subtree(self, circle_id):
+        # The circle and every circle beneath it, pre-order
+        return self._order[self._enter[circle_id]:self._exit[circle_id]]
+
+    def roles_beneath(self, circle_id):
+        # Roles of the circle and of every circle beneath it
+        start, end = self._role_span[circle_id]
+        return self._role_order[start:end]
+
+    def circle_of(self, role_id):
+        return self._role_circles.get(role_id)
+
+    def role_is_beneath(self, role_id, circle_id):
+        role_circle = self._role_circles.get(role_id)
+        return role_circle is not None and self.is_descendant(role_circle, circle_id)
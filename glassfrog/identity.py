@@ -0,0 +1,113 @@
+# pylint: disable=redefined-builtin
+import contextvars
+import threading
+from contextlib import contextmanager
+
+from glassfrog.indexes import FieldIndexes, ReverseIndex
+
+_current_session = contextvars.ContextVar('glassfrog_session', default=None)
+
+
+class Session:
+    def __init__(self):
+        self._instances = {}
+        self._details = {}
+        self._classes = {}  # resource name -> model class, to resolve ids from the reverse index
+        self._index = ReverseIndex()
+        self._queries = {}  # resource name -> FieldIndexes over everything listed of it
+        self._lock = threading.Lock()
+
+    @classmethod
+    def current(cls):
+        return _current_session.get()
+
+    @contextmanager
+    def activate(self):
+        token = _current_session.set(self)
+        try:
+            yield self
+        finally:
+            _current_session.reset(token)
+
+    def lookup(self, model_klass, id):
+        return self._instances.get((model_klass, id))
+
+    def register(self, obj):
+        key = (type(obj), obj.id)
+        with self._lock:
+            registered = self._instances.setdefault(key, obj)
+        if registered is obj:
+            self._index_entity(obj)
+        registered._session = self  # its links keep resolving through this session
+        return registered
+
+    def replace(self, obj):
+        # Takes the place of the instance registered for the same id, whose data is out of date
+        with self._lock:
+            self._instances[(type(obj), obj.id)] = obj
+        self._index_entity(obj)
+        obj._session = self
+        return obj
+
+    def _index_entity(self, obj):
+        self._classes.setdefault(obj._RESOURCE_NAME, type(obj))
+        self._index.add(obj._RESOURCE_NAME, obj._data)
+        indexes = self._queries.get(obj._RESOURCE_NAME)
+        if indexes is not None:
+            indexes.add(obj)
+
+    @property
+    def index(self):
+        return self._index
+
+    def related_ids(self, name, key):
+        # Ids of what links to `key` (an id or a model instance) through the reverse index `name`
+        return self.index.get(name, getattr(key, 'id', key))
+
+    def related(self, name, key):
+        model_klass = self._classes.get(self.index.value_resources[name])
+        if model_klass is None:
+            return []
+        found = (self.lookup(model_klass, id) for id in self.related_ids(name, key))
+        return [obj for obj in found if obj is not None]
+
+    def query_indexes(self, model_klass):
+        # None until the model has been listed in this session
+        return self._queries.get(model_klass._RESOURCE_NAME)
+
+    def store_query_indexes(self, model_klass, objects):
+        indexes = FieldIndexes.from_models(objects)
+        with self._lock:
+            return self._queries.setdefault(model_klass._RESOURCE_NAME, indexes)
+
+    def knows_all(self, model_klass):
+        # True when a missing (model, id) can't exist, so it must not be fetched
+        return False
+
+    def instances(self, model_klass):
+        return None
+
+    def detail(self, owner, resource_class):
+        return self._details.get((type(owner), owner.id, resource_class))
+
+    def store_detail(self, owner, resource_class, items):
+        self._details[(type(owner), owner.id, resource_class)] = list(items)
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
+            self._details.clear()
+            self._queries.clear()
+        self._index.clear()
+
+    def __len__(self):
+        return len(self._instances)
+
+    def __contains__(self, obj):
+        return self._instances.get((type(obj), obj.id)) is obj
+
+
+@contextmanager
+def session():
+    with Session().activate() as current:
+        yield current
@@ -0,0 +1,249 @@
+# pylint: disable=redefined-builtin
+import bisect
+import threading
+from operator import itemgetter
+
+from glassfrog import exceptions
+
+# name, source resource, link holding the key, link holding the value (None for the source's own id), value resource
+REVERSE_LINKS = (
+    ('person_roles', 'roles', 'people', None, 'roles'),
+    ('person_assignments', 'assignments', 'person', None, 'assignments'),
+    ('role_assignments', 'assignments', 'role', None, 'assignments'),
+    ('circle_children', 'roles', 'circle', 'supporting_circle', 'circles'),
+    ('domain_roles', 'roles', 'domains', None, 'roles'),
+    ('accountability_roles', 'roles', 'accountabilities', None, 'roles'),
+)
+
+
+def _ids(value):
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return value
+    return (value,)
+
+
+class ReverseIndex:
+    # Maps ids to the ids linking to them, kept up to date one entity at a time
+    def __init__(self, links=REVERSE_LINKS):
+        self._links = {}  # source resource -> [(name, key link, value link)]
+        self.value_resources = {}  # name -> resource of the ids it holds
+        for name, resource, key_link, value_link, value_resource in links:
+            self._links.setdefault(resource, []).append((name, key_link, value_link))
+            self.value_resources[name] = value_resource
+        self._indexes = {name: {} for name in self.value_resources}  # name -> key -> {value: None}, ordered
+        self._contributions = {}  # (resource, id) -> [(name, key, value)]
+        self._lock = threading.Lock()
+
+    def add(self, resource, data):
+        links = self._links.get(resource)
+        if not links:
+            return
+        entity_links = data.get('links') or {}
+        contributions = [
+            (name, key, value)
+            for name, key_link, value_link in links
+            for key in _ids(entity_links.get(key_link))
+            for value in (_ids(entity_links.get(value_link)) if value_link else (data['id'],))
+        ]
+        with self._lock:
+            self._remove(resource, data['id'])
+            for name, key, value in contributions:
+                self._indexes[name].setdefault(key, {})[value] = None
+            self._contributions[(resource, data['id'])] = contributions
+
+    def remove(self, resource, id):
+        with self._lock:
+            self._remove(resource, id)
+
+    def _remove(self, resource, id):
+        for name, key, value in self._contributions.pop((resource, id), ()):
+            values = self._indexes[name][key]
+            values.pop(value, None)
+            if not values:
+                del self._indexes[name][key]
+
+    def get(self, name, key):
+        with self._lock:
+            return list(self._indexes[name].get(key, ()))
+
+    def clear(self):
+        with self._lock:
+            for index in self._indexes.values():
+                index.clear()
+            self._contributions.clear()
+
+    def __len__(self):
+        return len(self._contributions)
+
+
+def field_value(data, field):
+    # An attribute of the record, or else one of its links
+    if field in data:
+        return data[field]
+    return (data.get('links') or {}).get(field)
+
+
+def _items(value):
+    # list values are indexed under each of their items
+    return value if isinstance(value, list) else (value,)
+
+
+def _orderable(value):
+    # nulls and list values are left out of sorted indexes
+    return value is not None and not isinstance(value, list)
+
+
+_RANGES = {
+    'gt': lambda values, operand: slice(bisect.bisect_right(values, operand), None),
+    'gte': lambda values, operand: slice(bisect.bisect_left(values, operand), None),
+    'lt': lambda values, operand: slice(None, bisect.bisect_left(values, operand)),
+    'lte': lambda values, operand: slice(None, bisect.bisect_right(values, operand)),
+}
+
+
+class FieldIndexes:
+    # Hash and sorted indexes over the records of one resource, each built the first time a query needs it
+    def __init__(self, records=None, objects=None):
+        self._records = records if records is not None else {}  # id -> data
+        self._objects = objects  # id -> model instance, unless they are looked up in a session
+        self._hashes = {}  # field -> value -> [ids], list values indexed under each of their items
+        self._sorted = {}  # field -> ([values], [ids]) ordered by value, nulls left out
+        self._ranks = {}  # field -> id -> position of its distinct value in the sorted index
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_models(cls, objects):
+        objects = {obj.id: obj for obj in objects}
+        return cls(records={id: obj._data for id, obj in objects.items()}, objects=objects)
+
+    def add(self, obj):
+        # Indexes already built are updated in place, the entity's previous version taken out of them first
+        with self._lock:
+            previous = self._records.get(obj.id)
+            if previous is not None:
+                self._discard(obj.id, previous)
+            self._records[obj.id] = obj._data
+            if self._objects is not None:
+                self._objects[obj.id] = obj
+            for field in list(self._hashes):
+                self._insert_hashed(field, obj.id, field_value(obj._data, field))
+            for field in list(self._sorted):
+                self._insert_sorted(field, obj.id, field_value(obj._data, field))
+
+    def _discard(self, id, data):
+        for field, index in self._hashes.items():
+            for item in _items(field_value(data, field)):
+                bucket = index.get(item, [])
+                if id in bucket:
+                    bucket.remove(id)
+                    if not bucket:
+                        del index[item]
+        for field in list(self._sorted):
+            self._discard_sorted(field, id, field_value(data, field))
+        for ranks in self._ranks.values():
+            ranks.pop(id, None)
+
+    def _discard_sorted(self, field, id, value):
+        if not _orderable(value):
+            return
+        values, ids = self._sorted[field]
+        try:
+            position = ids.index(id, bisect.bisect_left(values, value), bisect.bisect_right(values, value))
+        except ValueError:
+            del self._sorted[field]  # the record changed since it was indexed: rebuilt when a query needs it
+            self._ranks.pop(field, None)
+            return
+        del values[position], ids[position]
+
+    def _insert_hashed(self, field, id, value):
+        try:
+            for item in _items(value):
+                self._hashes[field].setdefault(item, []).append(id)
+        except TypeError:
+            del self._hashes[field]  # rebuilt when a query needs it, failing there
+
+    def _insert_sorted(self, field, id, value):
+        if not _orderable(value):
+            return
+        values, ids = self._sorted[field]
+        try:
+            position = bisect.bisect_right(values, value)
+        except TypeError:
+            del self._sorted[field]  # can't be ordered with the others: rebuilt, and reported, when a query needs it
+            self._ranks.pop(field, None)
+            return
+        values.insert(position, value)
+        ids.insert(position, id)
+        ranks = self._ranks.get(field)
+        if ranks is not None:
+            if position and values[position - 1] == value:
+                ranks[id] = ranks[ids[position - 1]]
+            else:
+                del self._ranks[field]  # a new distinct value moves every greater one up a rank
+
+    def ids(self):
+        return list(self._records)
+
+    def model(self, id):
+        if self._objects is None:
+            return None
+        return self._objects.get(id)
+
+    def hash(self, field):
+        with self._lock:
+            return self._built(self._hashes, field, self._build_hash)
+
+    def sorted(self, field):
+        with self._lock:
+            return self._built(self._sorted, field, self._build_sorted)
+
+    def ranks(self, field):
+        with self._lock:
+            return self._built(self._ranks, field, self._build_ranks)
+
+    def range(self, field, lookup, operand):
+        with self._lock:  # values and ids are updated in place, one after the other
+            values, ids = self._built(self._sorted, field, self._build_sorted)
+            try:
+                return ids[_RANGES[lookup](values, operand)]
+            except TypeError as e:
+                raise exceptions.UnexpectedDataFormat(f"{field} can't be compared with {operand!r}") from e
+
+    @staticmethod
+    def _built(cache, field, build):
+        index = cache.get(field)
+        if index is None:
+            index = cache[field] = build(field)
+        return index
+
+    def _build_hash(self, field):
+        index = {}
+        for id, data in self._records.items():
+            for item in _items(field_value(data, field)):
+                index.setdefault(item, []).append(id)
+        return index
+
+    def _build_sorted(self, field):
+        pairs = (
+            (value, id)
+            for id, data in self._records.items()
+            for value in (field_value(data, field),)
+            if _orderable(value)
+        )
+        try:
+            pairs = sorted(pairs, key=itemgetter(0))
+        except TypeError as e:
+            raise exceptions.UnexpectedDataFormat(f"{field} can't be ordered") from e
+        return [value for value, _ in pairs], [id for _, id in pairs]
+
+    def _build_ranks(self, field):
+        values, ids = self._built(self._sorted, field, self._build_sorted)
+        ranks = {}
+        rank = -1
+        for position, id in enumerate(ids):
+            if not position or values[position] != values[position - 1]:
+                rank += 1
+            ranks[id] = rank
+        return ranks
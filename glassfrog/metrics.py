@@ -0,0 +1,155 @@
+import bisect
+import threading
+import time
+from collections import Counter, defaultdict, namedtuple
+from contextlib import contextmanager
+
+from requests import HTTPError
+
+# Upper bounds (in seconds) of the latency histogram buckets, the last one being +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class RequestEvent:  # pylint: disable=too-many-instance-attributes
+    # What one GlassFrogClient.get call did, as seen by observers
+    __slots__ = ('resource', 'url', 'source', 'status', 'size', 'attempts', 'duration', 'error')
+
+    def __init__(self, resource, url):
+        self.resource = resource
+        self.url = url
+        self.source = 'network'  # or 'memory', 'disk' (revalidated) or 'coalesced' (joined an in-flight request)
+        self.status = None
+        self.size = 0
+        self.attempts = 0
+        self.duration = None
+        self.error = None
+
+    @property
+    def retries(self):
+        return max(self.attempts - 1, 0)
+
+
+@contextmanager
+def observe(observers, event):
+    started = time.perf_counter()
+    try:
+        yield event
+    except HTTPError as error:
+        if error.response is not None:
+            event.status = error.response.status_code
+        event.error = error
+        raise
+    except Exception as error:
+        event.error = error
+        raise
+    finally:
+        event.duration = time.perf_counter() - started
+        for observer in observers:
+            observer(event)
+
+
+class MetricsAggregator:  # pylint: disable=too-many-instance-attributes
+    # An observer summing up every event, see GlassFrogClient.add_observer
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = Counter()  # (resource, source) -> count
+            self._errors = Counter()  # (resource, status) -> count
+            self._bytes = Counter()
+            self._retries = Counter()
+            self._latency = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+            self._latency_sum = Counter()
+
+    def __call__(self, event):
+        with self._lock:
+            self._requests[(event.resource, event.source)] += 1
+            if event.error is not None:
+                self._errors[(event.resource, event.status or 'error')] += 1
+            self._bytes[event.resource] += event.size or 0
+            self._retries[event.resource] += event.retries
+            if event.source != 'memory':
+                self._latency[event.resource][bisect.bisect_left(self.buckets, event.duration)] += 1
+                self._latency_sum[event.resource] += event.duration
+
+    def snapshot(self):
+        with self._lock:
+            return MetricsSnapshot(
+                buckets=self.buckets,
+                requests=dict(self._requests),
+                errors=dict(self._errors),
+                bytes=dict(self._bytes),
+                retries=dict(self._retries),
+                latency={resource: list(counts) for resource, counts in self._latency.items()},
+                latency_sum=dict(self._latency_sum),
+            )
+
+
+_SNAPSHOT_FIELDS = ['buckets', 'requests', 'errors', 'bytes', 'retries', 'latency', 'latency_sum']
+
+
+class MetricsSnapshot(namedtuple('MetricsSnapshot', _SNAPSHOT_FIELDS)):
+    # latency maps each resource to its count per bucket, not cumulative
+    __slots__ = ()
+
+    def resources(self):
+        return sorted({resource for resource, _ in self.requests})
+
+    def as_dict(self):
+        return {resource: self._resource_dict(resource) for resource in self.resources()}
+
+    def _resource_dict(self, resource):
+        counts = self.latency.get(resource, [0] * (len(self.buckets) + 1))
+        return {
+            'requests': {source: count for (name, source), count in self.requests.items() if name == resource},
+            'errors': {status: count for (name, status), count in self.errors.items() if name == resource},
+            'bytes': self.bytes.get(resource, 0),
+            'retries': self.retries.get(resource, 0),
+            'latency': {
+                'buckets': dict(zip(self.buckets + (float('inf'),), counts)),
+                'sum': self.latency_sum.get(resource, 0),
+                'count': sum(counts),
+            },
+        }
+
+    def to_prometheus(self, prefix='glassfrog'):
+        lines = []
+        self._prometheus_counter(lines, f'{prefix}_requests_total', 'Requests by resource and source.', {
+            (('resource', resource), ('source', source)): count for (resource, source), count in self.requests.items()
+        })
+        self._prometheus_counter(lines, f'{prefix}_request_errors_total', 'Failed requests by status code.', {
+            (('resource', resource), ('status', status)): count for (resource, status), count in self.errors.items()
+        })
+        self._prometheus_counter(lines, f'{prefix}_response_bytes_total', 'Response bytes received.', {
+            (('resource', resource),): count for resource, count in self.bytes.items()
+        })
+        self._prometheus_counter(lines, f'{prefix}_request_retries_total', 'Retried requests.', {
+            (('resource', resource),): count for resource, count in self.retries.items()
+        })
+        self._prometheus_histogram(lines, f'{prefix}_request_duration_seconds')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _labels(labels):
+        return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+    def _prometheus_counter(self, lines, name, help, samples):  # pylint: disable=redefined-builtin
+        lines.append(f'# HELP {name} {help}')
+        lines.append(f'# TYPE {name} counter')
+        for labels, value in sorted(samples.items(), key=lambda sample: str(sample[0])):
+            lines.append(f'{name}{self._labels(labels)} {value}')
+
+    def _prometheus_histogram(self, lines, name):
+        lines.append(f'# HELP {name} Request latency.')
+        lines.append(f'# TYPE {name} histogram')
+        for resource in sorted(self.latency):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), self.latency[resource]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{name}_bucket{self._labels((("resource", resource), ("le", le)))} {cumulative}')
+            lines.append(f'{name}_sum{self._labels((("resource", resource),))} {self.latency_sum[resource]}')
+            lines.append(f'{name}_count{self._labels((("resource", resource),))} {cumulative}')
@@ -1,32 +1,198 @@
-# pylint: disable=redefined-builtin
+# pylint: disable=redefined-builtin,too-many-lines
+import asyncio
+import contextvars
+import functools
+from collections import namedtuple
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 from requests import HTTPError
 
-from glassfrog import exceptions
+from glassfrog import concurrency, exceptions, serialization
+from glassfrog.aio import AsyncGlassFrogClient
 from glassfrog.client import GlassFrogClient
+from glassfrog.columnar import ColumnarResult
+from glassfrog.identity import Session
+from glassfrog.prefetch import Prefetch
+from glassfrog.query import Query
+
+# link_name is None for relationships listed from the owner's own endpoint, such as Role.assignments
+Relationship = namedtuple('Relationship', ['link_name', 'model_klass', 'many'])
+
+_describing = contextvars.ContextVar('glassfrog_describing', default=False)
+
+
+_UNPARSED = object()
+
+
+def memoized(method):
+    # Read-only property computed once per instance, kept in the `_<name>` slot its class declares
+    slot = f'_{method.__name__}'
+
+    @functools.wraps(method)
+    def getter(self):
+        value = getattr(self, slot, _UNPARSED)
+        if value is _UNPARSED:
+            value = method(self)
+            setattr(self, slot, value)
+        return value
+
+    return property(getter)
+
+
+class LinkedData(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._index = self._build_index()
+
+    def _build_index(self):
+        return {
+            (resource, item['id']): item
+            for resource, items in self.items()
+            for item in items
+        }
+
+    @classmethod
+    def from_response(cls, data):
+        return cls.coerce(data.get('linked', None))
+
+    @classmethod
+    def coerce(cls, linked_data):
+        if linked_data is None or isinstance(linked_data, cls):
+            return linked_data
+        return cls(linked_data)
+
+    def find(self, resource, id):
+        return self._index.get((resource, id))
+
+    def loaded(self):
+        return self
+
+
+class StreamedLinkedData(LinkedData):
+    # The `linked` member of a streamed response, read from the stream the first time a link needs it
+    def __init__(self, stream):
+        self._stream = None
+        super().__init__()
+        self._stream = stream
+
+    def _load(self):
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            self.update(stream.member('linked') or {})
+            self._index = self._build_index()
+
+    def loaded(self):
+        # json and other C-level readers see the dict's own storage, so read the stream before handing it over
+        self._load()
+        return self
+
+    def __bool__(self):
+        self._load()
+        return super().__len__() > 0
+
+    def __len__(self):
+        self._load()
+        return super().__len__()
+
+    def __iter__(self):
+        self._load()
+        return super().__iter__()
+
+    def __contains__(self, key):
+        self._load()
+        return super().__contains__(key)
+
+    def __getitem__(self, key):
+        self._load()
+        return super().__getitem__(key)
+
+    def __eq__(self, other):
+        self._load()
+        return super().__eq__(other)
+
+    def get(self, key, default=None):
+        self._load()
+        return super().get(key, default)
+
+    def keys(self):
+        self._load()
+        return super().keys()
+
+    def values(self):
+        self._load()
+        return super().values()
+
+    def items(self):
+        self._load()
+        return super().items()
+
+    def find(self, resource, id):
+        self._load()
+        return super().find(resource, id)
+
+
+class LinkedItems:
+    # Iterable both with `for` and `async for`, and usable with next() like the generators links used to return
+    def __init__(self, resolve, aresolve, **kwargs):
+        self._resolve = resolve
+        self._aresolve = aresolve
+        self._kwargs = kwargs
+        self._iterator = None  # started by next(), later iterations carry on from it
+
+    def __iter__(self):
+        if self._iterator is not None:
+            return self._iterator
+        return iter(self._resolve(**self._kwargs))
+
+    def __next__(self):
+        if self._iterator is None:
+            self._iterator = iter(self._resolve(**self._kwargs))
+        return next(self._iterator)
+
+    def __aiter__(self):
+        return self._aresolve(**self._kwargs).__aiter__()
 
 
 class BaseModel:
+    __slots__ = ('_data', '_linked_data', '_session')
+
     _RESOURCE_NAME = None
+    _COLUMNS = (('id', 'int'),)
+    _BATCH_SIZE = 50  # ids per comma-separated request
+    _MAX_WORKERS = 4  # concurrent single-id requests for ids a batch couldn't resolve, unless link workers are set
 
     def __init__(self, data, linked_data=None):
         if not isinstance(data, dict):
             raise exceptions.UnexpectedDataFormat()
 
         self._data = data
-        self._linked_data = linked_data
+        self._linked_data = LinkedData.coerce(linked_data)
+        self._session = None
 
     def serialize(self):
+        linked_data = self._linked_data
         return {
             'data': self._data,
-            'linked_data': self._linked_data,
+            'linked_data': None if linked_data is None else linked_data.loaded(),
         }
 
     @classmethod
     def deserialize(cls, data, linked_data):
         return cls(data=data, linked_data=linked_data)
 
+    @classmethod
+    def serialize_many(cls, objects):
+        items = [(obj._data, obj._linked_data) for obj in objects]
+        return serialization.encode(resource=cls._RESOURCE_NAME, items=items)
+
+    @classmethod
+    def deserialize_many(cls, payload):
+        resource, items = serialization.decode(payload, linked_factory=LinkedData)
+        if resource != cls._RESOURCE_NAME:
+            raise exceptions.UnexpectedDataFormat(f"Serialised {resource}, not {cls._RESOURCE_NAME}")
+        return [cls(data=data, linked_data=linked_data) for data, linked_data in items]
+
     @property
     def id(self):
         return self._get('id')
@@ -41,78 +207,422 @@ class BaseModel:
                 return None
             raise exceptions.UnexpectedDataFormat() from e
 
+    @classmethod
+    def _lookup(cls, id):
+        session = Session.current()
+        if session is None:
+            return None
+
+        cached = session.lookup(cls, id)
+        if cached is None and session.knows_all(cls):
+            raise exceptions.DoesNotExist()
+        return cached
+
+    def _register(self, replace=False):
+        session = Session.current()
+        if session is None:
+            return self
+        return session.replace(self) if replace else session.register(self)
+
+    @contextmanager
+    def _in_session(self):
+        if self._session is None or self._session is Session.current():
+            yield
+        else:
+            with self._session.activate():
+                yield
+
+    @classmethod
+    def _relationship(cls, name):
+        # Relationship properties describe themselves instead of resolving while describing
+        token = _describing.set(True)
+        try:
+            relationship = getattr(cls(data={}), name)
+        except exceptions.UnexpectedDataFormat:
+            relationship = None
+        finally:
+            _describing.reset(token)
+
+        if not isinstance(relationship, Relationship):
+            raise AttributeError(f"{cls.__name__}.{name} is not a relationship")
+        return relationship
+
     def _build_item_from_link(self, link_name, model_klass):
+        if _describing.get():
+            return Relationship(link_name=link_name, model_klass=model_klass, many=False)
+
         links = self._get('links')
         item_id = links[link_name]
         if item_id:
-            try:
-                return model_klass.get(id=item_id)
-            except (exceptions.UnsupportedModelException, exceptions.DoesNotExist):
-                return model_klass.build(id=item_id, linked_data=self._linked_data)
+            with self._in_session():
+                try:
+                    return model_klass.get(id=item_id)
+                except (exceptions.UnsupportedModelException, exceptions.DoesNotExist):
+                    return model_klass.build(id=item_id, linked_data=self._linked_data)
         else:
             return None
 
+    def _linked_items(self, link_name, model_klass):
+        if _describing.get():
+            return Relationship(link_name=link_name, model_klass=model_klass, many=True)
+
+        return LinkedItems(
+            self._build_items_from_link,
+            self._abuild_items_from_link,
+            link_name=link_name,
+            model_klass=model_klass,
+        )
+
     def _build_items_from_link(self, link_name, model_klass):
         links = self._get('links')
-        for item_id in links[link_name]:
+        item_ids = links[link_name]
+        with self._in_session():
+            try:
+                found = model_klass._fetch_many(ids=item_ids)
+            except exceptions.UnsupportedModelException:
+                found = {}
+            items = list(self._build_found_items(item_ids=item_ids, found=found, model_klass=model_klass))
+
+        yield from items
+
+    async def _abuild_items_from_link(self, link_name, model_klass):
+        links = self._get('links')
+        item_ids = links[link_name]
+        with self._in_session():
+            try:
+                found = await model_klass._afetch_many(ids=item_ids)
+            except exceptions.UnsupportedModelException:
+                found = {}
+            items = list(self._build_found_items(item_ids=item_ids, found=found, model_klass=model_klass))
+
+        for item in items:
+            yield item
+
+    def _build_found_items(self, item_ids, found, model_klass):
+        for item_id in item_ids:
             try:
-                yield model_klass.get(id=item_id)
-            except (exceptions.UnsupportedModelException, exceptions.DoesNotExist):
+                yield found[item_id]
+            except KeyError:
                 yield model_klass.build(id=item_id, linked_data=self._linked_data)
 
+    @classmethod
+    def _build_cached(cls, id):
+        try:
+            return cls._lookup(id)
+        except exceptions.DoesNotExist:
+            return None
+
     @classmethod
     def build(cls, id, linked_data):
+        cached = cls._build_cached(id)
+        if cached is not None:
+            return cached
+
         if linked_data:
-            for data in linked_data[cls._RESOURCE_NAME]:
-                if data['id'] == id:
-                    return cls(data=data, linked_data=None)
+            data = LinkedData.coerce(linked_data).find(cls._RESOURCE_NAME, id)
+            if data is not None:
+                return cls._build_linked(data=data)
         return cls(data={'id': id})
 
     @classmethod
-    def get(cls, id):
+    def _build_linked(cls, data):
+        # Not registered: a linked payload mustn't shadow the resource fetched on its own
+        return cls(data=data, linked_data=None)
+
+    @classmethod
+    def get(cls, id, prefetch=None):
+        obj = cls._lookup(id)
+        if obj is None:
+            try:
+                data = GlassFrogClient.get(resource=cls._RESOURCE_NAME, id=id)
+            except HTTPError as e:
+                if e.response.status_code == 404:
+                    raise exceptions.DoesNotExist()
+                raise
+            obj = cls._build_first(data=data)
+
+        if prefetch:
+            [obj] = Prefetch.coerce(prefetch).run(objects=[obj])
+        return obj
+
+    @classmethod
+    async def aget(cls, id):
+        cached = cls._lookup(id)
+        if cached is not None:
+            return cached
+
         try:
-            data = GlassFrogClient.get(resource=cls._RESOURCE_NAME, id=id)
+            data = await AsyncGlassFrogClient.get(resource=cls._RESOURCE_NAME, id=id)
         except HTTPError as e:
             if e.response.status_code == 404:
                 raise exceptions.DoesNotExist()
             raise
 
-        linked_data = data.get('linked', None)
-        return cls(data=data[cls._RESOURCE_NAME][0], linked_data=linked_data)
+        return cls._build_first(data=data)
+
+    @classmethod
+    def _build_first(cls, data):
+        linked_data = LinkedData.from_response(data)
+        return cls(data=data[cls._RESOURCE_NAME][0], linked_data=linked_data)._register()
+
+    @classmethod
+    def get_many(cls, ids):
+        found = cls._fetch_many(ids=ids)
+        return [found[id] for id in ids if id in found]
 
     @classmethod
-    def list(cls):
-        data = GlassFrogClient.get(resource=cls._RESOURCE_NAME)
-        linked_data = data.get('linked', None)
+    async def aget_many(cls, ids):
+        found = await cls._afetch_many(ids=ids)
+        return [found[id] for id in ids if id in found]
+
+    @classmethod
+    def _fetch_many(cls, ids):
+        found, pending = cls._split_cached(ids=ids)
+
+        batches = concurrency.map_ordered(
+            cls._fetch_one,
+            cls._batch_ids(ids=pending),
+            max_workers=concurrency.get_link_workers(),
+        )
+        for data in batches:
+            if data:
+                found.update(cls._build_from_response(data=data))
+
+        missing = [id for id in pending if id not in found]
+        fallbacks = concurrency.map_ordered(
+            cls._fetch_one,
+            missing,
+            max_workers=concurrency.get_link_workers(default=cls._MAX_WORKERS),
+        )
+        for data in fallbacks:
+            if data:
+                found.update(cls._build_from_response(data=data))
+        return found
+
+    @classmethod
+    async def _afetch_many(cls, ids):
+        found, pending = cls._split_cached(ids=ids)
+
+        batches = [cls._afetch_one(id=batch_id) for batch_id in cls._batch_ids(ids=pending)]
+        for data in await asyncio.gather(*batches):
+            if data:
+                found.update(cls._build_from_response(data=data))
+
+        missing = [id for id in pending if id not in found]
+        for data in await asyncio.gather(*[cls._afetch_one(id=id) for id in missing]):
+            if data:
+                found.update(cls._build_from_response(data=data))
+        return found
+
+    @classmethod
+    def _split_cached(cls, ids):
+        found = {}
+        pending = []
+        for id in dict.fromkeys(ids):
+            try:
+                cached = cls._lookup(id)
+            except exceptions.DoesNotExist:
+                continue
+            if cached is None:
+                pending.append(id)
+            else:
+                found[id] = cached
+        return found, pending
+
+    @classmethod
+    def _batch_ids(cls, ids):
+        for start in range(0, len(ids), cls._BATCH_SIZE):
+            batch = ids[start:start + cls._BATCH_SIZE]
+            if len(batch) == 1:
+                yield batch[0]
+            else:
+                yield ','.join(str(item_id) for item_id in batch)
+
+    @classmethod
+    def _fetch_one(cls, id):
+        try:
+            return GlassFrogClient.get(resource=cls._RESOURCE_NAME, id=id)
+        except HTTPError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    @classmethod
+    async def _afetch_one(cls, id):
+        try:
+            return await AsyncGlassFrogClient.get(resource=cls._RESOURCE_NAME, id=id)
+        except HTTPError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    @classmethod
+    def _build_from_response(cls, data):
+        linked_data = LinkedData.from_response(data)
+        return {
+            item['id']: cls(data=item, linked_data=linked_data)._register()
+            for item in data[cls._RESOURCE_NAME]
+        }
+
+    @classmethod
+    def list(cls, prefetch=None, columnar=False, stream=False):
+        if columnar:
+            return cls._list_columnar(prefetch=prefetch, stream=stream)
+        return cls._list(prefetch=prefetch, stream=stream)
+
+    @classmethod
+    def _list(cls, prefetch=None, stream=False):
+        items = cls._session_instances()
+        if items is None:
+            if stream:
+                items = cls._build_streamed(GlassFrogClient.stream(resource=cls._RESOURCE_NAME))
+            else:
+                items = cls._build_all(data=GlassFrogClient.get(resource=cls._RESOURCE_NAME))
+        if prefetch:
+            items = Prefetch.coerce(prefetch).run(objects=items)
+        yield from items
+
+    @classmethod
+    def _list_columnar(cls, prefetch=None, stream=False):
+        items = cls._session_instances()
+        if items is None and not prefetch and not stream:
+            data = GlassFrogClient.get(resource=cls._RESOURCE_NAME)
+            return ColumnarResult.from_rows(
+                model_klass=cls,
+                rows=data[cls._RESOURCE_NAME],
+                linked_data=LinkedData.from_response(data),
+            )
+        return ColumnarResult.from_models(model_klass=cls, objects=cls._list(prefetch=prefetch, stream=stream))
+
+    @classmethod
+    def query(cls):
+        return Query(cls)
+
+    @classmethod
+    async def alist(cls):
+        items = cls._session_instances()
+        if items is None:
+            data = await AsyncGlassFrogClient.get(resource=cls._RESOURCE_NAME)
+            items = cls._build_all(data=data)
+        for item in items:
+            yield item
+
+    @classmethod
+    def _session_instances(cls):
+        session = Session.current()
+        if session is None:
+            return None
+        return session.instances(cls)
+
+    @classmethod
+    def _build_all(cls, data):
+        linked_data = LinkedData.from_response(data)
         for item in data[cls._RESOURCE_NAME]:
-            yield cls(data=item, linked_data=linked_data)
+            yield cls(data=item, linked_data=linked_data)._register()
+
+    @classmethod
+    def _build_streamed(cls, stream):
+        linked_data = StreamedLinkedData(stream)
+        try:
+            for item in stream:
+                yield cls(data=item, linked_data=linked_data)._register()
+        except GeneratorExit:
+            # Stopped early: the models already handed out still need the linked data, read it before letting go
+            stream.member('linked', keep_items=False)
+            raise
+        finally:
+            stream.close()
+
+    def _detail_items(self, resource_class):
+        if _describing.get():
+            return Relationship(link_name=None, model_klass=resource_class, many=True)
+
+        return LinkedItems(self._detail, self._adetail, resource_class=resource_class)
 
     def _detail(self, resource_class):
-        data = GlassFrogClient.get(
-            resource=resource_class._RESOURCE_NAME,
-            id=self.id,
-            from_resource=self._RESOURCE_NAME,
-        )
-        linked_data = data.get('linked', None)
-        for item in data[resource_class._RESOURCE_NAME]:
-            yield resource_class(data=item, linked_data=linked_data)
+        with self._in_session():
+            items = self._session_detail(resource_class=resource_class)
+            if items is None:
+                data = GlassFrogClient.get(
+                    resource=resource_class._RESOURCE_NAME,
+                    id=self.id,
+                    from_resource=self._RESOURCE_NAME,
+                )
+                items = list(resource_class._build_all(data=data))
+        yield from items
+
+    async def _adetail(self, resource_class):
+        with self._in_session():
+            items = self._session_detail(resource_class=resource_class)
+            if items is None:
+                data = await AsyncGlassFrogClient.get(
+                    resource=resource_class._RESOURCE_NAME,
+                    id=self.id,
+                    from_resource=self._RESOURCE_NAME,
+                )
+                items = list(resource_class._build_all(data=data))
+        for item in items:
+            yield item
+
+    def _session_detail(self, resource_class):
+        session = Session.current()
+        if session is None:
+            return None
+        return session.detail(owner=self, resource_class=resource_class)
 
 
 class UnsupportedModelMixin:
+    __slots__ = ()
+
+    @classmethod
+    def get(cls, id, prefetch=None):
+        raise exceptions.UnsupportedModelException()
+
+    @classmethod
+    async def aget(cls, id):
+        raise exceptions.UnsupportedModelException()
+
+    @classmethod
+    def get_many(cls, ids):
+        raise exceptions.UnsupportedModelException()
+
     @classmethod
-    def get(cls, id):
+    async def aget_many(cls, ids):
         raise exceptions.UnsupportedModelException()
 
     @classmethod
-    def list(cls):
+    def _fetch_many(cls, ids):
+        raise exceptions.UnsupportedModelException()
+
+    @classmethod
+    def _build_linked(cls, data):
+        # Only ever known from linked payloads, so the first one read is the entity's instance in a session
+        return cls(data=data, linked_data=None)._register()
+
+    @classmethod
+    async def _afetch_many(cls, ids):
+        raise exceptions.UnsupportedModelException()
+
+    @classmethod
+    def list(cls, prefetch=None, columnar=False, stream=False):
+        raise exceptions.UnsupportedModelException()
+
+    @classmethod
+    def alist(cls):
         raise exceptions.UnsupportedModelException()
 
     def _detail(self, resource_class):
         raise exceptions.UnsupportedModelException()
 
+    def _adetail(self, resource_class):
+        raise exceptions.UnsupportedModelException()
+
 
 class Circle(BaseModel):
+    __slots__ = ()
+
     _RESOURCE_NAME = 'circles'
+    _COLUMNS = (('id', 'int'), ('name', 'str'), ('short_name', 'str'), ('supported_role', 'link'))
 
     @property
     def name(self):
@@ -129,25 +639,26 @@ class Circle(BaseModel):
     @property
     def organization(self):
         organization_id = self._get('organization_id')
-        return Organization.build(id=organization_id, linked_data=self._linked_data)
+        with self._in_session():
+            return Organization.build(id=organization_id, linked_data=self._linked_data)
 
     @property
     def roles(self):
-        yield from self._build_items_from_link(
+        return self._linked_items(
             link_name='roles',
             model_klass=Role,
         )
 
     @property
     def policies(self):
-        yield from self._build_items_from_link(
+        return self._linked_items(
             link_name='policies',
             model_klass=Policy,
         )
 
     @property
     def domains(self):
-        yield from self._build_items_from_link(
+        return self._linked_items(
             link_name='domain',
             model_klass=Domain,
         )
@@ -161,11 +672,14 @@ class Circle(BaseModel):
 
     @property
     def projects(self):
-        yield from self._detail(resource_class=Project)
+        return self._detail_items(resource_class=Project)
 
 
 class Person(BaseModel):
+    __slots__ = ()
+
     _RESOURCE_NAME = 'people'
+    _COLUMNS = (('id', 'int'), ('name', 'str'), ('email', 'str'))
 
     @property
     def name(self):
@@ -177,25 +691,36 @@ class Person(BaseModel):
 
     @property
     def organizations(self):
-        yield from self._build_items_from_link(
+        return self._linked_items(
             link_name='organization_ids',
             model_klass=Organization,
         )
 
     @property
     def circles(self):
-        yield from self._build_items_from_link(
+        return self._linked_items(
             link_name='circles',
             model_klass=Circle,
         )
 
     @property
     def assignments(self):
-        yield from self._detail(resource_class=Assignment)
+        return self._detail_items(resource_class=Assignment)
 
 
 class Role(BaseModel):
+    __slots__ = ('_elected_until',)
+
     _RESOURCE_NAME = 'roles'
+    _COLUMNS = (
+        ('id', 'int'),
+        ('name', 'str'),
+        ('short_name', 'str'),
+        ('is_core', 'bool'),
+        ('elected_until', 'date'),
+        ('circle', 'link'),
+        ('supporting_circle', 'link'),
+    )
 
     @property
     def name(self):
@@ -208,7 +733,8 @@ class Role(BaseModel):
     @property
     def organization(self):
         organization_id = self._get('organization_id')
-        return Organization.build(id=organization_id, linked_data=self._linked_data)
+        with self._in_session():
+            return Organization.build(id=organization_id, linked_data=self._linked_data)
 
     @property
     def is_core(self):
@@ -234,46 +760,56 @@ class Role(BaseModel):
 
     @property
     def domains(self):
-        yield from self._build_items_from_link(
+        return self._linked_items(
             link_name='domains',
             model_klass=Domain,
         )
 
     @property
     def accountabilities(self):
-        yield from self._build_items_from_link(
+        return self._linked_items(
             link_name='accountabilities',
             model_klass=Accountability,
         )
 
     @property
     def people(self):
-        yield from self._build_items_from_link(
+        return self._linked_items(
             link_name='people',
             model_klass=Person,
         )
 
-    @property
+    @memoized
     def elected_until(self):
         try:
             date_str = self._get('elected_until')
             return datetime.strptime(date_str, '%Y-%m-%d').date()
-        except exceptions.UnexpectedDataFormat:
+        except (exceptions.UnexpectedDataFormat, TypeError):
             return None
 
     @property
     def assignments(self):
-        yield from self._detail(resource_class=Assignment)
+        return self._detail_items(resource_class=Assignment)
 
 
 class Assignment(BaseModel):
+    __slots__ = ('_election',)
+
     _RESOURCE_NAME = 'assignments'
+    _COLUMNS = (
+        ('id', 'int'),
+        ('focus', 'str'),
+        ('election', 'date'),
+        ('exclude_from_meetings', 'bool'),
+        ('person', 'link'),
+        ('role', 'link'),
+    )
 
     @property
     def focus(self):
         return self._get('focus')
 
-    @property
+    @memoized
     def election(self):
         try:
             date_str = self._get('election')
@@ -301,10 +837,14 @@ class Assignment(BaseModel):
 
 
 class Organization(UnsupportedModelMixin, BaseModel):
+    __slots__ = ()
+
     _RESOURCE_NAME = 'organizations'
 
 
 class Domain(UnsupportedModelMixin, BaseModel):
+    __slots__ = ()
+
     _RESOURCE_NAME = 'domains'
 
     @property
@@ -313,6 +853,8 @@ class Domain(UnsupportedModelMixin, BaseModel):
 
 
 class Policy(UnsupportedModelMixin, BaseModel):
+    __slots__ = ()
+
     _RESOURCE_NAME = 'policies'
 
     @property
@@ -325,6 +867,8 @@ class Policy(UnsupportedModelMixin, BaseModel):
 
 
 class Accountability(UnsupportedModelMixin, BaseModel):
+    __slots__ = ()
+
     _RESOURCE_NAME = 'accountabilities'
 
     @property
@@ -333,7 +877,23 @@ class Accountability(UnsupportedModelMixin, BaseModel):
 
 
 class Project(UnsupportedModelMixin, BaseModel):
+    __slots__ = ('_created_at', '_archived_at')
+
     _RESOURCE_NAME = 'projects'
+    _COLUMNS = (
+        ('id', 'int'),
+        ('description', 'str'),
+        ('status', 'str'),
+        ('value', 'float'),
+        ('effort', 'float'),
+        ('roi', 'float'),
+        ('private_to_circle', 'bool'),
+        ('created_at', 'datetime'),
+        ('archived_at', 'datetime'),
+        ('person', 'link'),
+        ('role', 'link'),
+        ('circle', 'link'),
+    )
 
     @property
     def person(self):
@@ -356,13 +916,13 @@ class Project(UnsupportedModelMixin, BaseModel):
             model_klass=Circle,
         )
 
-    @property
+    @memoized
     def created_at(self):
         date_str = self._get('created_at')
         dt = datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%SZ')
         return dt.replace(tzinfo=timezone.utc)
 
-    @property
+    @memoized
     def archived_at(self):
         date_str = self._get('archived_at')
         if date_str:
@@ -0,0 +1,88 @@
+from glassfrog import concurrency, exceptions
+from glassfrog.client import count_requests
+from glassfrog.identity import Session
+
+
+class Prefetch:
+    def __init__(self, *paths):
+        self.paths = paths
+        self.request_count = 0
+
+    @classmethod
+    def coerce(cls, prefetch):
+        if isinstance(prefetch, cls):
+            return prefetch
+        if isinstance(prefetch, str):
+            return cls(prefetch)
+        return cls(*prefetch)
+
+    def _tree(self):
+        tree = {}
+        for path in self.paths:
+            node = tree
+            for name in path.split('.'):
+                node = node.setdefault(name, {})
+        return tree
+
+    def run(self, objects):
+        # Prefetched objects are registered in the objects' session, where their links look them up
+        session = Session.current()
+        if session is None:
+            session = Session()
+        objects = [session.register(obj) for obj in objects]
+        with session.activate(), count_requests() as counter:
+            self._prefetch(objects=objects, tree=self._tree(), session=session)
+        self.request_count += counter.count
+        return objects
+
+    def _prefetch(self, objects, tree, session):
+        # Ids wanted by every link at this level are fetched together, one batch per model
+        plans = []
+        wanted = {}
+        for name, subtree in tree.items():
+            for model_klass in dict.fromkeys(type(obj) for obj in objects):
+                owners = [obj for obj in objects if type(obj) is model_klass]  # pylint: disable=unidiomatic-typecheck
+                relationship = model_klass._relationship(name)
+                if relationship.link_name is None:
+                    related = self._prefetch_detail(owners=owners, relationship=relationship, session=session)
+                    plans.append((subtree, related, None, None))
+                else:
+                    ids = self._link_ids(owners=owners, relationship=relationship)
+                    wanted.setdefault(relationship.model_klass, []).extend(ids)
+                    plans.append((subtree, None, relationship.model_klass, ids))
+
+        found = {model_klass: self._fetch(model_klass=model_klass, ids=ids) for model_klass, ids in wanted.items()}
+
+        for subtree, related, model_klass, ids in plans:
+            if related is None:
+                related = [found[model_klass][id] for id in dict.fromkeys(ids) if id in found[model_klass]]
+            if subtree and related:
+                self._prefetch(objects=list({id(obj): obj for obj in related}.values()), tree=subtree, session=session)
+
+    def _link_ids(self, owners, relationship):
+        ids = []
+        for owner in owners:
+            item_ids = owner._get('links').get(relationship.link_name)
+            if relationship.many:
+                ids += item_ids or []
+            elif item_ids:
+                ids.append(item_ids)
+        return ids
+
+    def _fetch(self, model_klass, ids):
+        try:
+            return model_klass._fetch_many(ids=ids)
+        except exceptions.UnsupportedModelException:  # built from linked data on access
+            return {}
+
+    def _prefetch_detail(self, owners, relationship, session):
+        details = concurrency.map_ordered(
+            lambda owner: list(owner._detail(resource_class=relationship.model_klass)),
+            owners,
+            max_workers=concurrency.get_link_workers(),
+        )
+        related = []
+        for owner, items in zip(owners, details):
+            session.store_detail(owner=owner, resource_class=relationship.model_klass, items=items)
+            related += items
+        return related
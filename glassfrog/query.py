@@ -0,0 +1,119 @@
+# pylint: disable=redefined-builtin
+from datetime import date, datetime, timezone
+
+from glassfrog.identity import Session
+from glassfrog.indexes import FieldIndexes
+
+_LOOKUPS = ('eq', 'in', 'gt', 'gte', 'lt', 'lte')
+
+
+def _operand(value):
+    # Query values compared the way the API encodes them
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, '_RESOURCE_NAME'):  # a model instance, matched by id
+        return value.id
+    return value
+
+
+def _condition(key, value):
+    field, _, lookup = key.partition('__')
+    lookup = lookup or 'eq'
+    if lookup not in _LOOKUPS:
+        raise ValueError(f"Unknown lookup {lookup!r} in {key!r}")
+    if lookup == 'in':
+        return field, lookup, tuple(_operand(item) for item in value)
+    return field, lookup, _operand(value)
+
+
+def _ordering(field):
+    if field.startswith('-'):
+        return field[1:], True
+    return field, False
+
+
+def _sort_key(ordering, id):
+    key = []
+    for ranks, descending in ordering:
+        rank = ranks.get(id)
+        if rank is None:
+            key.append((1, 0))  # nulls last, whichever the direction
+        else:
+            key.append((0, -rank if descending else rank))
+    return key
+
+
+class Query:
+    # Filters and orders a listed model through field indexes kept by the session, never resolving links
+    def __init__(self, model_klass, conditions=(), ordering=(), listing=None):
+        self._model_klass = model_klass
+        self._conditions = conditions  # ((field, lookup, operand), ...)
+        self._ordering = ordering  # ((field, descending), ...)
+        # Outside a session: {'indexes': FieldIndexes} of the one listing shared by this query and those derived from it
+        self._listing = listing if listing is not None else {}
+
+    def where(self, **conditions):
+        added = tuple(_condition(key, value) for key, value in conditions.items())
+        return Query(self._model_klass, self._conditions + added, self._ordering, listing=self._listing)
+
+    def order_by(self, *fields):
+        return Query(self._model_klass, self._conditions, tuple(map(_ordering, fields)), listing=self._listing)
+
+    def ids(self):
+        indexes = self._field_indexes()
+        ids = self._filter(indexes)
+        if self._ordering:
+            ordering = [(indexes.ranks(field), descending) for field, descending in self._ordering]
+            ids.sort(key=lambda id: _sort_key(ordering, id))
+        return ids
+
+    def all(self):
+        return list(self)
+
+    def first(self):
+        return next(iter(self), None)
+
+    def count(self):
+        return len(self.ids())
+
+    def __iter__(self):
+        indexes = self._field_indexes()
+        session = Session.current()
+        for id in self.ids():
+            obj = indexes.model(id)
+            if obj is None and session is not None:
+                obj = session.lookup(self._model_klass, id)
+            yield obj
+
+    def _field_indexes(self):
+        session = Session.current()
+        if session is None:
+            indexes = self._listing.get('indexes')
+            if indexes is None:
+                indexes = self._listing['indexes'] = FieldIndexes.from_models(self._model_klass.list())
+            return indexes
+
+        indexes = session.query_indexes(self._model_klass)
+        if indexes is None:
+            indexes = session.store_query_indexes(self._model_klass, self._model_klass.list())
+        return indexes
+
+    def _filter(self, indexes):
+        if not self._conditions:
+            return indexes.ids()
+        matches = sorted((set(self._match(indexes, *condition)) for condition in self._conditions), key=len)
+        selected = matches[0].intersection(*matches[1:])
+        return [id for id in indexes.ids() if id in selected]  # in listing order
+
+    @staticmethod
+    def _match(indexes, field, lookup, operand):
+        if lookup == 'eq':
+            return indexes.hash(field).get(operand, ())
+        if lookup == 'in':
+            index = indexes.hash(field)
+            return [id for value in operand for id in index.get(value, ())]
+        return indexes.range(field, lookup, operand)
@@ -0,0 +1,188 @@
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+RETRYABLE_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+_LIMIT_HEADERS = ('X-RateLimit-Limit', 'RateLimit-Limit')
+_REMAINING_HEADERS = ('X-RateLimit-Remaining', 'RateLimit-Remaining')
+_RESET_HEADERS = ('X-RateLimit-Reset', 'RateLimit-Reset')
+_EPOCH_THRESHOLD = 10 ** 9  # reset values above this are unix timestamps rather than seconds from now
+
+
+def _header(headers, names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def parse_retry_after(value, now=None):
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = now or datetime.now(timezone.utc)
+    return max((moment - now).total_seconds(), 0)
+
+
+class RateLimiter:  # pylint: disable=too-many-instance-attributes
+    # Token bucket shared by every request, kept within the budget the API reports in its rate limit headers
+    def __init__(self, rate=None, burst=None, *, max_retries=2, backoff=0.5, max_backoff=30,
+                 clock=time.monotonic, sleep=time.sleep, jitter=random.random):
+        self.rate = rate  # requests per second, None to rely on the API's headers only
+        self.burst = burst if burst is not None else max(rate or 1, 1)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limit = None
+
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._refilled_at = clock()
+        self._blocked_until = 0
+        self._server_remaining = None
+        self._server_reset_at = None
+
+    def _refill(self, now):
+        if self.rate is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        if self._server_reset_at is not None and now >= self._server_reset_at:
+            self._server_remaining = self._server_reset_at = None
+
+    def _delay(self, now):
+        delay = max(self._blocked_until - now, 0)
+        if self._server_remaining is not None and self._server_remaining < 1 and self._server_reset_at is not None:
+            delay = max(delay, self._server_reset_at - now)
+        if self.rate is not None and self._tokens < 1:
+            delay = max(delay, (1 - self._tokens) / self.rate)
+        return delay
+
+    def reserve(self):
+        # Takes a request slot and returns 0, or returns how long to wait before asking again
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            delay = self._delay(now)
+            if delay > 0:
+                return delay
+            if self.rate is not None:
+                self._tokens -= 1
+            if self._server_remaining is not None:
+                self._server_remaining -= 1
+            return 0
+
+    def acquire(self):
+        delay = self.reserve()
+        while delay > 0:
+            self._sleep(delay)
+            delay = self.reserve()
+
+    async def aacquire(self):
+        delay = self.reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.reserve()
+
+    @property
+    def remaining(self):
+        # Requests that can be made right now without waiting, None when nothing limits them
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if now < self._blocked_until:
+                return 0
+            budgets = [int(self._tokens)] if self.rate is not None else []
+            if self._server_remaining is not None:
+                budgets.append(max(int(self._server_remaining), 0))
+            return min(budgets) if budgets else None
+
+    def update(self, headers):
+        limit = _header(headers, _LIMIT_HEADERS)
+        remaining = _header(headers, _REMAINING_HEADERS)
+        reset = _header(headers, _RESET_HEADERS)
+        with self._lock:
+            now = self._clock()
+            if limit is not None:
+                self.limit = int(limit)
+            if remaining is not None:
+                self._server_remaining = remaining
+            if reset is not None:
+                if reset > _EPOCH_THRESHOLD:
+                    reset -= time.time()
+                self._server_reset_at = now + max(reset, 0)
+
+    def defer(self, seconds):
+        # Holds back every caller, as asked by a Retry-After
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    def backoff_delay(self, attempt):
+        # Exponential backoff with full jitter
+        return self._jitter() * min(self.max_backoff, self.backoff * 2 ** attempt)
+
+    def retry_delay(self, response, attempt):
+        # None when the response is final, otherwise how long this caller waits before retrying
+        self.update(response.headers)
+        if response.status_code not in RETRYABLE_STATUSES or attempt >= self.max_retries:
+            return None
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        if retry_after is not None:
+            self.defer(retry_after)
+            return 0
+        return self.backoff_delay(attempt)
+
+    def call(self, send, retry_on=()):
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                response = send()
+            except retry_on:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+            else:
+                delay = self.retry_delay(response, attempt)
+                if delay is None:
+                    return response
+                response.close()
+            if delay:
+                self._sleep(delay)
+            attempt += 1
+
+    async def acall(self, send, retry_on=()):
+        attempt = 0
+        while True:
+            await self.aacquire()
+            try:
+                response = await send()
+            except retry_on:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+            else:
+                delay = self.retry_delay(response, attempt)
+                if delay is None:
+                    return response
+                response.close()
+            if delay:
+                await asyncio.sleep(delay)
+            attempt += 1
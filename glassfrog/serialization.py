@@ -0,0 +1,85 @@
+# pylint: disable=redefined-builtin
+import json
+
+from glassfrog import exceptions
+
+VERSION = 2
+
+
+def _canonical(data):
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+class _LinkedTable:
+    # Every linked entity once per distinct content, and the entities of each distinct linked data
+    def __init__(self):
+        self._sets = []  # {resource: [(id, content)]} of each distinct linked data, in order of first use
+        self._positions = {}  # id() of a linked data, or its entities encoded, -> position in _sets
+        self._entities = {}  # resource -> (id, content) -> data, so differing versions of an id are all kept
+
+    def ref(self, linked_data):
+        if linked_data is None:
+            return None
+        position = self._positions.get(id(linked_data))
+        if position is None:
+            position = self._positions[id(linked_data)] = self._add(linked_data)
+        return position
+
+    def _add(self, linked_data):
+        keys = {resource: [(item['id'], _canonical(item)) for item in items] for resource, items in linked_data.items()}
+        encoded = json.dumps(keys, sort_keys=True)
+        position = self._positions.get(encoded)
+        if position is None:
+            position = self._positions[encoded] = len(self._sets)
+            self._sets.append(keys)
+            for resource, items in linked_data.items():
+                self._entities.setdefault(resource, {}).update(zip(keys[resource], items))
+        return position
+
+    def tables(self):
+        # Entities ordered by id then content, and sets referring to them by position
+        order = {resource: sorted(entities) for resource, entities in self._entities.items()}
+        positions = {resource: {key: position for position, key in enumerate(keys)} for resource, keys in order.items()}
+        linked = {resource: [self._entities[resource][key] for key in keys] for resource, keys in order.items()}
+        sets = [
+            {resource: [positions[resource][key] for key in keys] for resource, keys in linked_keys.items()}
+            for linked_keys in self._sets
+        ]
+        return linked, sets
+
+
+def encode(resource, items):
+    # items are (data, linked data or None) pairs; the same items always encode to the same bytes
+    table = _LinkedTable()
+    refs = [table.ref(linked_data) for _, linked_data in items]
+    linked, sets = table.tables()
+    payload = {
+        'version': VERSION,
+        'resource': resource,
+        'items': [data for data, _ in items],
+        'refs': refs,
+        'sets': sets,
+        'linked': linked,
+    }
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def decode(payload, linked_factory=dict):
+    # Items sharing linked data when encoded share one linked_factory() instance again
+    try:
+        decoded = json.loads(payload)
+    except ValueError as e:
+        raise exceptions.UnexpectedDataFormat("Invalid serialised payload") from e
+    if not isinstance(decoded, dict) or decoded.get('version') != VERSION:
+        raise exceptions.UnexpectedDataFormat("Unsupported serialised payload version")
+
+    linked = decoded['linked']
+    sets = [
+        linked_factory({
+            resource: [linked[resource][position] for position in positions]
+            for resource, positions in linked_positions.items()
+        })
+        for linked_positions in decoded['sets']
+    ]
+    items = [(data, None if ref is None else sets[ref]) for data, ref in zip(decoded['items'], decoded['refs'])]
+    return decoded['resource'], items
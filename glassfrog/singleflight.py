@@ -0,0 +1,78 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    # Concurrent calls for the same key share the one already in flight instead of repeating it
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def _join(self, key):
+        # Returns the call to wait for, and whether this caller has to make it
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self._executed += 1
+            return call, True
+
+    def do(self, key, func):
+        call, leader = self._join(key)
+        if leader:
+            return self._run(key, call, func)
+
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _run(self, key, call, func):
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {'executed': self._executed, 'coalesced': self._coalesced, 'in_flight': len(self._calls)}
+
+
+class AsyncSingleFlight:
+    # Same as SingleFlight for coroutines, per event loop
+    def __init__(self):
+        self._tasks = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    async def do(self, key, factory):
+        key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(key)
+        if task is not None:
+            self._coalesced += 1
+        else:
+            task = self._tasks[key] = asyncio.ensure_future(factory())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self._executed += 1
+        # A cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {'executed': self._executed, 'coalesced': self._coalesced, 'in_flight': len(self._tasks)}
@@ -0,0 +1,152 @@
+# pylint: disable=redefined-builtin
+from glassfrog import storage
+from glassfrog.client import GlassFrogClient
+from glassfrog.hierarchy import CircleTree
+from glassfrog.identity import Session
+from glassfrog.indexes import FieldIndexes
+from glassfrog.models import Assignment, Circle, Person, Role
+
+
+class OrganizationSnapshot(Session):
+    _MODELS = (Circle, Role, Person, Assignment)
+    _DETAILS = {
+        # (owner resource, detail resource) -> reverse index from the owner to its details
+        ('roles', 'assignments'): 'role_assignments',
+        ('people', 'assignments'): 'person_assignments',
+    }
+
+    def __init__(self, records, linked=None, storage_file=None):
+        super().__init__()
+        self._records = records  # listed resource name -> {id: data}
+        self._linked = linked or {}  # linked resource name -> {id: data}, possibly partial
+        self._storage_file = storage_file
+        self._classes = {model_klass._RESOURCE_NAME: model_klass for model_klass in self._MODELS}
+        self._index_built = False
+        self._circle_tree = None
+
+    @classmethod
+    def load(cls):
+        records = {}
+        linked = {}
+        for model_klass in cls._MODELS:
+            resource = model_klass._RESOURCE_NAME
+            data = GlassFrogClient.get(resource=resource)
+            records[resource] = {item['id']: item for item in data[resource]}
+            for linked_resource, items in (data.get('linked') or {}).items():
+                linked.setdefault(linked_resource, {}).update((item['id'], item) for item in items)
+        return cls(records=records, linked=linked)
+
+    def save(self, path):
+        sections = [(storage.LISTED, resource, records) for resource, records in self._records.items()]
+        sections += [(storage.LINKED, resource, records) for resource, records in self._linked.items()]
+        storage.write(path, sections)
+
+    @classmethod
+    def open(cls, path, verify=True):
+        storage_file = storage.MappedSnapshot(path, verify=verify)
+        records = {}
+        linked = {}
+        for kind, resource, section in storage_file.sections:
+            if kind == storage.LISTED:
+                records[resource] = section
+            else:
+                linked[resource] = section
+        return cls(records=records, linked=linked, storage_file=storage_file)
+
+    def close(self):
+        if self._storage_file is not None:
+            self._storage_file.close()
+            self._storage_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def lookup(self, model_klass, id):
+        obj = super().lookup(model_klass, id)
+        if obj is not None:
+            return obj
+
+        data = self._find(resource=model_klass._RESOURCE_NAME, id=id)
+        if data is None:
+            return None
+        return self.register(model_klass(data=data))
+
+    def _find(self, resource, id):
+        for records in (self._records, self._linked):
+            try:
+                return records[resource][id]
+            except KeyError:
+                pass
+        return None
+
+    def knows_all(self, model_klass):
+        return model_klass._RESOURCE_NAME in self._records
+
+    def instances(self, model_klass):
+        records = self._records.get(model_klass._RESOURCE_NAME)
+        if records is None:
+            return None
+        return [self.lookup(model_klass, id) for id in records]
+
+    def query_indexes(self, model_klass):
+        resource = model_klass._RESOURCE_NAME
+        records = self._records.get(resource)
+        if records is None:
+            return super().query_indexes(model_klass)
+        with self._lock:
+            indexes = self._queries.get(resource)
+            if indexes is None:
+                indexes = self._queries[resource] = FieldIndexes(records=records)
+        return indexes
+
+    def detail(self, owner, resource_class):
+        index_name = self._DETAILS.get((owner._RESOURCE_NAME, resource_class._RESOURCE_NAME))
+        if index_name is None or not self.knows_all(resource_class):
+            return super().detail(owner=owner, resource_class=resource_class)
+        return self.related(index_name, owner)
+
+    def clear(self):
+        super().clear()
+        self._index_built = False
+
+    def _index_entity(self, obj):
+        pass  # every record is indexed at once, the first time the index is needed
+
+    @property
+    def index(self):
+        if not self._index_built:
+            with self._lock:
+                if not self._index_built:
+                    for resource, records in self._records.items():
+                        for data in records.values():
+                            self._index.add(resource, data)
+                    self._index_built = True
+        return self._index
+
+    @property
+    def circle_tree(self):
+        if self._circle_tree is None:
+            self._circle_tree = CircleTree.from_data(
+                circles=self._records.get('circles', {}).values(),
+                roles=self._records.get('roles', {}).values(),
+            )
+        return self._circle_tree
+
+    @property
+    def circles(self):
+        return self.instances(Circle)
+
+    @property
+    def roles(self):
+        return self.instances(Role)
+
+    @property
+    def people(self):
+        return self.instances(Person)
+
+    @property
+    def assignments(self):
+        return self.instances(Assignment)
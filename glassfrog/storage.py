@@ -0,0 +1,247 @@
+# pylint: disable=redefined-builtin
+# Snapshot file layout (all integers little-endian):
+#
+#   header     magic, version, section count, crc32 of everything after the header,
+#              string table offset, directory offset
+#   records    u32 length + encoded value, one per entity
+#   strings    u32 count, (count + 1) u32 offsets into the blob, utf-8 blob
+#   directory  per section: u8 kind, u32 name (string index), u32 count, u64 index offset
+#   indexes    per section: count (i64 id, u64 record offset) pairs sorted by id
+#
+# Values are tagged: None/True/False, i64, f64, string (u32 index into the string table),
+# list (u32 count + values) and dict (u32 count + (u32 key index, value) pairs).
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from collections.abc import Mapping
+
+from glassfrog import exceptions
+
+MAGIC = b'GFOS'
+VERSION = 1
+
+LISTED = 0
+LINKED = 1
+
+_HEADER = struct.Struct('<4sHHIQQ')
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+_SECTION = struct.Struct('<BIIQ')
+_INDEX_ENTRY = struct.Struct('<qQ')
+
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _LIST, _DICT = b'NTFidslm'
+_CONSTANTS = {_NONE: None, _TRUE: True, _FALSE: False}
+
+
+class _StringTable:
+    def __init__(self):
+        self._indexes = {}
+
+    def __call__(self, value):
+        try:
+            return self._indexes[value]
+        except KeyError:
+            index = self._indexes[value] = len(self._indexes)
+            return index
+
+    def dump(self):
+        blobs = [value.encode('utf-8') for value in self._indexes]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        header = _U32.pack(len(blobs)) + struct.pack(f'<{len(offsets)}I', *offsets)
+        return header + b''.join(blobs)
+
+
+def _encode(value, strings, out):
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        out += _I64.pack(value)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        out.append(_STR)
+        out += _U32.pack(strings(value))
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        out += _U32.pack(len(value))
+        for item in value:
+            _encode(item, strings, out)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        out += _U32.pack(len(value))
+        for key, item in value.items():
+            out += _U32.pack(strings(str(key)))
+            _encode(item, strings, out)
+    else:
+        raise exceptions.UnexpectedDataFormat(f"Can't store {type(value).__name__} in a snapshot")
+
+
+def write(path, sections):
+    # sections: iterable of (kind, resource name, {id: data})
+    strings = _StringTable()
+    body = bytearray()
+    directory = []
+    for kind, name, records in sections:
+        index = []
+        for id, data in records.items():
+            encoded = bytearray()
+            _encode(data, strings, encoded)
+            index.append((id, _HEADER.size + len(body)))
+            body += _U32.pack(len(encoded))
+            body += encoded
+        directory.append((kind, strings(name), sorted(index)))
+
+    strings_offset = _HEADER.size + len(body)
+    body += strings.dump()
+
+    directory_offset = _HEADER.size + len(body)
+    index_offset = directory_offset + _SECTION.size * len(directory)
+    for kind, name, index in directory:
+        body += _SECTION.pack(kind, name, len(index), index_offset)
+        index_offset += _INDEX_ENTRY.size * len(index)
+    for _, _, index in directory:
+        for id, offset in index:
+            body += _INDEX_ENTRY.pack(id, offset)
+
+    header = _HEADER.pack(MAGIC, VERSION, len(directory), zlib.crc32(body), strings_offset, directory_offset)
+
+    directory_name = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory_name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(header)
+            tmp_file.write(body)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class MappedSnapshot:
+    def __init__(self, path, verify=True):
+        with open(path, 'rb') as snapshot_file:
+            try:
+                self._mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise exceptions.UnexpectedDataFormat("Truncated snapshot") from e
+
+        try:
+            self._read_header(verify=verify)
+        except (struct.error, exceptions.UnexpectedDataFormat):
+            self.close()
+            raise
+
+    def _read_header(self, verify):
+        buffer = self._mmap
+        if len(buffer) < _HEADER.size:
+            raise exceptions.UnexpectedDataFormat("Truncated snapshot")
+
+        magic, version, section_count, crc, strings_offset, directory_offset = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise exceptions.UnexpectedDataFormat("Not a GlassFrog snapshot")
+        if version != VERSION:
+            raise exceptions.UnexpectedDataFormat(f"Unsupported snapshot version {version}")
+        if verify and zlib.crc32(memoryview(buffer)[_HEADER.size:]) != crc:
+            raise exceptions.UnexpectedDataFormat("Corrupted snapshot")
+
+        [self._string_count] = _U32.unpack_from(buffer, strings_offset)
+        self._string_offsets = strings_offset + _U32.size
+        self._string_blob = self._string_offsets + _U32.size * (self._string_count + 1)
+        self._strings = {}
+
+        self.sections = []
+        for position in range(section_count):
+            kind, name, count, index_offset = _SECTION.unpack_from(buffer, directory_offset + position * _SECTION.size)
+            self.sections.append((kind, self._string(name), MappedRecords(self, count, index_offset)))
+
+    def close(self):
+        self._mmap.close()
+
+    def _string(self, index):
+        try:
+            return self._strings[index]
+        except KeyError:
+            start, end = struct.unpack_from('<2I', self._mmap, self._string_offsets + index * _U32.size)
+            value = self._strings[index] = str(self._mmap[self._string_blob + start:self._string_blob + end], 'utf-8')
+            return value
+
+    def _decode_record(self, offset):
+        value, _ = self._decode(offset + _U32.size)
+        return value
+
+    def _decode(self, position):
+        buffer = self._mmap
+        tag = buffer[position]
+        position += 1
+        if tag == _STR:
+            [index] = _U32.unpack_from(buffer, position)
+            return self._string(index), position + _U32.size
+        if tag == _INT:
+            return _I64.unpack_from(buffer, position)[0], position + _I64.size
+        if tag == _DICT:
+            [count] = _U32.unpack_from(buffer, position)
+            position += _U32.size
+            value = {}
+            for _ in range(count):
+                [key] = _U32.unpack_from(buffer, position)
+                value[self._string(key)], position = self._decode(position + _U32.size)
+            return value, position
+        if tag == _LIST:
+            [count] = _U32.unpack_from(buffer, position)
+            position += _U32.size
+            value = []
+            for _ in range(count):
+                item, position = self._decode(position)
+                value.append(item)
+            return value, position
+        if tag == _FLOAT:
+            return _F64.unpack_from(buffer, position)[0], position + _F64.size
+        if tag not in _CONSTANTS:
+            raise exceptions.UnexpectedDataFormat(f"Unknown value tag {tag!r}")
+        return _CONSTANTS[tag], position
+
+
+class MappedRecords(Mapping):
+    # id -> data of one section, decoded from the mapped file on access
+    def __init__(self, snapshot, count, index_offset):
+        self._snapshot = snapshot
+        self._count = count
+        self._index_offset = index_offset
+
+    def _entry(self, position):
+        return _INDEX_ENTRY.unpack_from(self._snapshot._mmap, self._index_offset + position * _INDEX_ENTRY.size)
+
+    def __getitem__(self, id):
+        if not isinstance(id, int):
+            raise KeyError(id)
+
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry_id, offset = self._entry(middle)
+            if entry_id == id:
+                return self._snapshot._decode_record(offset)
+            if entry_id < id:
+                low = middle + 1
+            else:
+                high = middle
+        raise KeyError(id)
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self._entry(position)[0]
+
+    def __len__(self):
+        return self._count
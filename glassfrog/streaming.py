@@ -0,0 +1,144 @@
+import codecs
+import json
+import re
+from collections import deque
+
+from glassfrog import exceptions
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_END = object()
+
+
+class JSONStream:
+    # Incrementally decodes a top level JSON object from chunks of bytes, one member (or array item) at a time
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._json = json.JSONDecoder()
+
+    def _read(self):
+        if self._eof:
+            return False
+        chunk = next(self._chunks, _END)
+        if chunk is _END:
+            self._eof = True
+            text = self._decoder.decode(b'', final=True)
+        else:
+            text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                raise exceptions.UnexpectedDataFormat("Unexpected end of JSON stream")
+
+    def _expect(self, chars):
+        char = self._peek()
+        if char not in chars:
+            raise exceptions.UnexpectedDataFormat(f"Expected one of {chars!r} in JSON stream, got {char!r}")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                end = None
+            # A value reaching the end of the buffer may continue in the next chunk (e.g. a number)
+            if end is not None and (end < len(self._buffer) or self._eof):
+                self._pos = end
+                return value
+            self._read_more(len(self._buffer) - self._pos)
+
+    def _read_more(self, pending):
+        # Wait for twice the undecodable text before decoding again, so large values are decoded O(log n) times
+        target = max(pending * 2, 1)
+        while len(self._buffer) - self._pos < target:
+            if not self._read():
+                if pending == len(self._buffer) - self._pos:
+                    raise exceptions.UnexpectedDataFormat("Truncated JSON stream")
+                return
+
+    def events(self, array_key):
+        # Yields ('item', value) for each item of the top level `array_key` array and ('member', key, value)
+        # for every other top level member
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key == array_key and self._peek() == '[':
+                yield from self._items()
+            else:
+                yield 'member', key, self._value()
+            if self._expect(',}') == '}':
+                return
+
+    def _items(self):
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield 'item', self._value()
+            if self._expect(',]') == ']':
+                return
+
+
+class StreamedList:
+    def __init__(self, chunks, resource, close=None):
+        self.resource = resource
+        self.members = {}
+        self._events = JSONStream(chunks).events(array_key=resource)
+        self._pending = deque()  # items decoded while looking ahead for a member
+        self._close = close
+        self._done = False
+
+    def _next_event(self):
+        event = next(self._events, None)
+        if event is None:
+            self.close()
+        return event
+
+    def member(self, key, keep_items=True):
+        # Reads ahead (keeping the items it passes, unless told not to) until the member is found or the response ends
+        while key not in self.members and not self._done:
+            event = self._next_event()
+            if event is None:
+                break
+            if event[0] == 'item':
+                if keep_items:
+                    self._pending.append(event[1])
+            else:
+                self.members[event[1]] = event[2]
+        return self.members.get(key)
+
+    def __iter__(self):
+        while True:
+            if self._pending:
+                yield self._pending.popleft()
+                continue
+            event = self._next_event() if not self._done else None
+            if event is None:
+                return
+            if event[0] == 'item':
+                yield event[1]
+            else:
+                self.members[event[1]] = event[2]
+
+    def close(self):
+        if not self._done:
+            self._done = True
+            if self._close is not None:
+                self._close()
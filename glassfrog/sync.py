@@ -0,0 +1,141 @@
+# pylint: disable=redefined-builtin
+import hashlib
+import json
+import os
+import tempfile
+from collections import namedtuple
+
+from glassfrog import exceptions
+from glassfrog.client import GlassFrogClient, count_requests
+from glassfrog.models import Assignment, Circle, LinkedData, Person, Role
+from glassfrog.prefetch import Prefetch
+
+# added and modified map ids to fresh model instances, removed is a set of ids
+Changes = namedtuple('Changes', ['added', 'modified', 'removed'])
+
+
+def content_hash(data):
+    encoded = json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class ChangeSet(dict):
+    # model class -> Changes, for every synced model
+    request_count = 0
+
+    def __bool__(self):
+        return any(changes.added or changes.modified or changes.removed for changes in self.values())
+
+    def summary(self):
+        return {
+            model_klass._RESOURCE_NAME: {
+                'added': sorted(changes.added),
+                'modified': sorted(changes.modified),
+                'removed': sorted(changes.removed),
+            }
+            for model_klass, changes in self.items()
+        }
+
+
+class SyncState:
+    # Content hashes of every entity seen by the last sync, and of each listing as a whole
+    VERSION = 1
+
+    def __init__(self, listings=None, entities=None):
+        self.listings = listings or {}  # resource -> hash of the whole listing
+        self.entities = entities or {}  # resource -> {id: hash}
+
+    def to_dict(self):
+        return {
+            'version': self.VERSION,
+            'listings': self.listings,
+            'entities': {
+                resource: {str(id): digest for id, digest in hashes.items()}
+                for resource, hashes in self.entities.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != cls.VERSION:
+            raise exceptions.UnexpectedDataFormat(f"Unsupported sync state version {data.get('version')!r}")
+        return cls(
+            listings=dict(data['listings']),
+            entities={
+                resource: {int(id): digest for id, digest in hashes.items()}
+                for resource, hashes in data['entities'].items()
+            },
+        )
+
+    def save(self, path):
+        directory_name = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory_name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(self.to_dict(), tmp_file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as state_file:
+            return cls.from_dict(json.load(state_file))
+
+
+class Synchronizer:
+    _MODELS = (Circle, Role, Person, Assignment)
+
+    def __init__(self, state=None, models=None, prefetch=None):
+        self.state = state if state is not None else SyncState()
+        self.models = tuple(models) if models is not None else self._MODELS
+        self.prefetch = prefetch or {}  # model class -> relationship paths refreshed for its changed entities
+
+    def sync(self):
+        # One listing per model; entities are only hashed when their listing changed, and only
+        # added or modified ones are built and have their relationships prefetched
+        changes = ChangeSet()
+        listings, entities = {}, {}
+        with count_requests() as counter:
+            for model_klass in self.models:
+                resource = model_klass._RESOURCE_NAME
+                changes[model_klass], listings[resource], entities[resource] = self._sync_model(model_klass)
+        # The state only moves forward once every change has been collected
+        self.state.listings.update(listings)
+        self.state.entities.update(entities)
+        changes.request_count = counter.count
+        return changes
+
+    def _sync_model(self, model_klass):
+        resource = model_klass._RESOURCE_NAME
+        data = GlassFrogClient.get(resource=resource)
+        listing_hash = content_hash(data)
+        previous = self.state.entities.get(resource, {})
+        if self.state.listings.get(resource) == listing_hash:
+            return Changes(added={}, modified={}, removed=set()), listing_hash, previous
+
+        current = {item['id']: content_hash(item) for item in data[resource]}
+        added = [id for id in current if id not in previous]
+        modified = [id for id, digest in current.items() if id in previous and previous[id] != digest]
+        removed = set(previous).difference(current)
+
+        built = self._build(model_klass=model_klass, data=data, ids=set(added).union(modified))
+        changes = Changes(
+            added={id: built[id] for id in added},
+            modified={id: built[id] for id in modified},
+            removed=removed,
+        )
+        return changes, listing_hash, current
+
+    def _build(self, model_klass, data, ids):
+        linked_data = LinkedData.from_response(data)
+        objects = [
+            model_klass(data=item, linked_data=linked_data)._register(replace=True)  # fresher than the session's
+            for item in data[model_klass._RESOURCE_NAME]
+            if item['id'] in ids
+        ]
+        paths = self.prefetch.get(model_klass)
+        if paths and objects:
+            objects = Prefetch.coerce(paths).run(objects=objects)
+        return {obj.id: obj for obj in objects}
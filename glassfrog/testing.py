@@ -0,0 +1,353 @@
+# A local stand-in for the GlassFrog v3 API, serving seeded synthetic organisations.
+#
+#   python -m glassfrog.testing [--port 8000] [--circles 5] [--roles 40] [--people 30] [--assignments 80] [--seed 0]
+import argparse
+import fnmatch
+import json
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from glassfrog.client import GlassFrogClient
+
+ORGANIZATION_ID = 1
+
+# Owner link of the items listed under /{resource}/{id}/{sub}
+NESTED_LINKS = {'circles': 'circle', 'roles': 'role', 'people': 'person'}
+
+# Resources sent along in `linked`, by the link that refers to them
+LINKED_RESOURCES = {
+    'circles': {'policies': 'policies', 'domain': 'domains'},
+    'roles': {'domains': 'domains', 'accountabilities': 'accountabilities'},
+}
+
+
+def generate_org(*, circles=5, roles=40, people=30, assignments=80, projects=0, seed=0):
+    # Deterministic for a given seed: every circle but the first is a sub-circle supporting a role of an earlier one
+    rng = random.Random(seed)
+    org = {
+        resource: {}
+        for resource in ('circles', 'roles', 'people', 'assignments', 'projects', 'domains', 'accountabilities',
+                         'policies')
+    }
+    _generate_circles(org, rng, circles)
+    _generate_roles(org, rng, roles)
+    _generate_people(org, people)
+    _generate_assignments(org, rng, assignments)
+    _generate_projects(org, rng, projects)
+    return org
+
+
+def _add(org, resource, item):
+    org[resource][item['id']] = item
+    return item
+
+
+def _generate_circles(org, rng, count):
+    for pk in range(1, count + 1):
+        policies = [
+            _add(org, 'policies', {'id': pk * 100 + n, 'title': f'Policy {pk}.{n}', 'body': 'Be excellent'})['id']
+            for n in range(rng.randint(0, 2))
+        ]
+        domains = [_add(org, 'domains', {'id': pk * 100 + n, 'description': f'Domain {pk}.{n}'})['id']
+                   for n in range(rng.randint(0, 2))]
+        _add(org, 'circles', {
+            'id': pk,
+            'name': f'Circle {pk}',
+            'short_name': f'C{pk}',
+            'strategy': None,
+            'organization_id': ORGANIZATION_ID,
+            'links': {'roles': [], 'policies': policies, 'domain': domains, 'supported_role': None},
+        })
+
+
+def _generate_roles(org, rng, count):
+    circle_ids = list(org['circles'])
+    for pk in range(1001, 1001 + count):
+        circle_id = rng.choice(circle_ids) if circle_ids else None
+        is_core = rng.random() < 0.25
+        accountabilities = [
+            _add(org, 'accountabilities', {'id': pk * 10 + n, 'description': f'Accountability {pk}.{n}'})['id']
+            for n in range(rng.randint(1, 3))
+        ]
+        _add(org, 'roles', {
+            'id': pk,
+            'name': f'Role {pk}',
+            'short_name': f'R{pk}',
+            'purpose': f'Purpose of role {pk}',
+            'is_core': is_core,
+            'elected_until': f'{rng.randint(2020, 2025)}-{rng.randint(1, 12):02}-01' if is_core else None,
+            'organization_id': ORGANIZATION_ID,
+            'links': {
+                'circle': circle_id,
+                'supporting_circle': None,
+                'domains': [],
+                'accountabilities': accountabilities,
+                'people': [],
+            },
+        })
+        if circle_id is not None:
+            org['circles'][circle_id]['links']['roles'].append(pk)
+    _link_sub_circles(org, rng)
+
+
+def _link_sub_circles(org, rng):
+    for circle_id in list(org['circles'])[1:]:
+        candidates = [role for role in org['roles'].values()
+                      if role['links']['circle'] < circle_id and role['links']['supporting_circle'] is None]
+        if candidates:
+            role = rng.choice(candidates)
+            role['links']['supporting_circle'] = circle_id
+            org['circles'][circle_id]['links']['supported_role'] = role['id']
+
+
+def _generate_people(org, count):
+    for pk in range(1, count + 1):
+        _add(org, 'people', {
+            'id': pk,
+            'name': f'Person {pk}',
+            'email': f'person{pk}@example.com',
+            'links': {'circles': [], 'organization_ids': [ORGANIZATION_ID]},
+        })
+
+
+def _generate_assignments(org, rng, count):
+    pairs = sorted({(person_id, role_id) for person_id in org['people'] for role_id in org['roles']})
+    for pk, (person_id, role_id) in enumerate(sorted(rng.sample(pairs, min(count, len(pairs)))), start=1):
+        _add(org, 'assignments', {
+            'id': pk,
+            'focus': None,
+            'election': f'{rng.randint(2015, 2020)}-01-01' if org['roles'][role_id]['is_core'] else None,
+            'exclude_from_meetings': rng.random() < 0.1,
+            'links': {'person': person_id, 'role': role_id},
+        })
+        role_links, person_links = org['roles'][role_id]['links'], org['people'][person_id]['links']
+        role_links['people'].append(person_id)
+        if role_links['circle'] is not None and role_links['circle'] not in person_links['circles']:
+            person_links['circles'].append(role_links['circle'])
+
+
+def _generate_projects(org, rng, count):
+    roles = list(org['roles'].values())
+    for pk in range(1, count + 1 if roles else 1):
+        role = rng.choice(roles)
+        value, effort = rng.randint(1, 10), rng.randint(1, 10)
+        _add(org, 'projects', {
+            'id': pk,
+            'description': f'Project {pk}',
+            'status': rng.choice(['Current', 'Waiting', 'Done']),
+            'value': value,
+            'effort': effort,
+            'roi': round(value / effort, 2),
+            'private_to_circle': False,
+            'created_at': f'2019-{rng.randint(1, 12):02}-01T12:00:00Z',
+            'archived_at': None,
+            'waiting_on_who': None,
+            'waiting_on_what': None,
+            'links': {'role': role['id'], 'circle': role['links']['circle'], 'person': None},
+        })
+
+
+def respond(org, path):
+    # The payload for a GET of `path`, None when it doesn't exist
+    match = re.match(r'^/(\w+)(?:/([\d,]+)(?:/(\w+))?)?$', path.split('?')[0])
+    if match is None or match.group(1) not in org:
+        return None
+    resource, ids, sub = match.groups()
+    items = org[resource]
+    if ids is None:
+        return _payload(org, resource, list(items.values()))
+    pks = [int(pk) for pk in ids.split(',') if pk.isdigit()]
+    if len(pks) != ids.count(',') + 1 or (sub is not None and len(pks) != 1):
+        return None  # empty ids, or several owners for a nested route
+    if sub is not None:
+        link = NESTED_LINKS.get(resource)
+        return _payload(org, sub, [item for item in org.get(sub, {}).values() if item['links'].get(link) == pks[0]])
+    found = [items[pk] for pk in pks if pk in items]
+    return _payload(org, resource, found) if found else None
+
+
+def _payload(org, resource, items):
+    payload = {resource: items}
+    linked = {}
+    for link_name, linked_resource in LINKED_RESOURCES.get(resource, {}).items():
+        ids = {pk for item in items for pk in item['links'].get(link_name) or ()}
+        if ids:
+            linked[linked_resource] = [org[linked_resource][pk] for pk in sorted(ids)]
+    if linked:
+        payload['linked'] = linked
+    return payload
+
+
+class FakeGlassFrogServer:  # pylint: disable=too-many-instance-attributes
+    # Serves `org` over HTTP/1.1 keep-alive; latency and error rates make it misbehave like a loaded API
+    def __init__(self, org, *, host='127.0.0.1', port=0, token=None, latency=0, throttle_rate=0, error_rate=0,
+                 retry_after=1, seed=0):
+        self.org = org
+        self.token = token  # if set, requests with another X-Auth-Token are rejected with 401
+        self.latency = latency  # seconds added to every response
+        self.throttle_rate = throttle_rate  # share of requests answered with 429 and a Retry-After
+        self.error_rate = error_rate  # share of requests answered with a 5xx
+        self.retry_after = retry_after
+        self.requested_paths = []
+        self.connections = 0
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+
+            def do_GET(self):
+                status, headers, payload = fake.handle(self.path, self.headers)
+                body = json.dumps(payload).encode() if payload is not None else b''
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        return Handler
+
+    def handle(self, path, headers):
+        # Returns the status, extra headers and JSON payload of a GET
+        with self._lock:
+            self.requested_paths.append(path)
+            roll = self._rng.random()
+        if self.latency:
+            time.sleep(self.latency)
+        if self.token is not None and headers.get('X-Auth-Token') != self.token:
+            return 401, {}, {'message': 'Invalid token'}
+        if roll < self.throttle_rate:
+            return 429, {'Retry-After': str(self.retry_after)}, {'message': 'Too many requests'}
+        if roll < self.throttle_rate + self.error_rate:
+            return 503, {}, {'message': 'Service unavailable'}
+        payload = respond(self.org, path)
+        return (200, {}, payload) if payload is not None else (404, {}, {'message': 'Not found'})
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @contextmanager
+    def client(self, token='fake-token'):
+        # Points GlassFrogClient at this server for the duration of the block
+        previous = GlassFrogClient._URL, GlassFrogClient._TOKEN
+        GlassFrogClient.close()
+        GlassFrogClient._URL, GlassFrogClient._TOKEN = self.url, self.token or token
+        try:
+            yield self
+        finally:
+            GlassFrogClient.close()
+            GlassFrogClient._URL, GlassFrogClient._TOKEN = previous
+
+
+class FakeKeyValueStore:
+    # A local stand-in for a redis-style server, for KeyValueBackend: bytes values with an optional expiry in seconds
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._values = {}  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        entry = self._values.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= self._clock():
+            del self._values[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+        return None if entry is None else entry[1]
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        if isinstance(value, str):
+            value = value.encode()
+        with self._lock:
+            self._values[key] = (None if ex is None else self._clock() + ex, bytes(value))
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._values.pop(key, None) is not None for key in keys)
+
+    def scan_iter(self, match='*'):
+        with self._lock:
+            keys = [key for key in list(self._values) if self._live(key) is not None]
+        return iter([key for key in keys if fnmatch.fnmatchcase(key, match)])
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m glassfrog.testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    for resource, default in (('circles', 5), ('roles', 40), ('people', 30), ('assignments', 80), ('projects', 0)):
+        parser.add_argument(f'--{resource}', type=int, default=default)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0, help='seconds added to every response')
+    parser.add_argument('--throttle-rate', type=float, default=0, help='share of requests answered with 429')
+    parser.add_argument('--error-rate', type=float, default=0, help='share of requests answered with 503')
+    args = parser.parse_args(argv)
+
+    org = generate_org(
+        circles=args.circles, roles=args.roles, people=args.people, assignments=args.assignments,
+        projects=args.projects, seed=args.seed,
+    )
+    server = FakeGlassFrogServer(
+        org, host=args.host, port=args.port, latency=args.latency, throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate, seed=args.seed,
+    )
+    print(f'Serving a fake GlassFrog API on {server.url}')
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
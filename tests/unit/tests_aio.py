@@ -0,0 +1,184 @@
+import asyncio
+import gc
+import tempfile
+import threading
+import unittest
+import warnings
+from unittest.mock import patch
+
+import glassfrog
+from glassfrog import aio, cache, client, exceptions, models
+from tests.unit.tests_client import LocalServerTestMixin
+
+
+@unittest.skipIf(aio.aiohttp is None, "aiohttp is not installed")
+class TestAsyncModels(LocalServerTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        token_patcher = patch('glassfrog.client.GlassFrogClient._TOKEN', '42')
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
+
+        self.routes.update({
+            '/circles': {'circles': [
+                {'id': 1, 'name': 'Circle 1', 'links': {'roles': [10, 20, 30]}},
+                {'id': 2, 'name': 'Circle 2', 'links': {'roles': []}},
+            ]},
+            '/roles/10,20,30': {'roles': [
+                {'id': 10, 'name': 'Role 10', 'links': {'circle': 1}},
+                {'id': 20, 'name': 'Role 20', 'links': {'circle': 1}},
+            ]},
+            '/roles/30': {'roles': [{'id': 30, 'name': 'Role 30', 'links': {'circle': 1}}]},
+            '/roles/10': {'roles': [{'id': 10, 'name': 'Role 10', 'links': {'circle': 1}}]},
+            '/roles/666': None,
+            '/roles/10/assignments': {'assignments': [{'id': 100, 'links': {'person': 1000, 'role': 10}}]},
+        })
+
+    def run_async(self, coroutine):
+        async def run():
+            try:
+                return await coroutine
+            finally:
+                await aio.AsyncGlassFrogClient.close()
+
+        return asyncio.run(run())
+
+    def test_aget(self):
+        role = self.run_async(models.Role.aget(id=10))
+
+        self.assertEqual('Role 10', role.name)
+        self.assertEqual(['/roles/10'], self.requested_paths)
+
+    def test_aget_throttled(self):
+        self.failures['/roles/10'] = [429, 503]
+
+        role = self.run_async(models.Role.aget(id=10))
+
+        self.assertEqual('Role 10', role.name)
+        self.assertEqual(['/roles/10'] * 3, self.requested_paths)
+
+    def test_aget_disk_cache(self):
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        client.GlassFrogClient.set_disk_cache(cache.DiskCache(directory=tmp_dir.name))
+        self.addCleanup(client.GlassFrogClient.set_disk_cache, None)
+        self.etags['/roles/10'] = '"v1"'
+
+        first = self.run_async(models.Role.aget(id=10))
+        self.routes['/roles/10'] = {'roles': [{'id': 10, 'name': 'Changed without a new ETag'}]}
+        second = self.run_async(models.Role.aget(id=10))
+
+        self.assertEqual('Role 10', first.name)
+        self.assertEqual('Role 10', second.name)  # revalidated with If-None-Match, answered 304
+        self.assertEqual(['/roles/10'] * 2, self.requested_paths)
+
+    def test_aget_disk_cache_off_loop(self):
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        disk_cache = cache.DiskCache(directory=tmp_dir.name)
+        client.GlassFrogClient.set_disk_cache(disk_cache)
+        self.addCleanup(client.GlassFrogClient.set_disk_cache, None)
+        self.etags['/roles/10'] = '"v1"'
+        threads = []
+
+        def record(method):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.get_ident())
+                return method(*args, **kwargs)
+            return wrapper
+
+        with patch.object(disk_cache, 'get', record(disk_cache.get)), \
+                patch.object(disk_cache, 'set', record(disk_cache.set)):
+            self.run_async(models.Role.aget(id=10))
+
+        self.assertEqual(2, len(threads))
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_aget_not_found(self):
+        with self.assertRaises(exceptions.DoesNotExist):
+            self.run_async(models.Role.aget(id=666))
+
+    def test_aget_unsupported(self):
+        with self.assertRaises(exceptions.UnsupportedModelException):
+            self.run_async(models.Domain.aget(id=10))
+
+    def test_alist(self):
+        async def collect():
+            return [circle async for circle in models.Circle.alist()]
+
+        circles = self.run_async(collect())
+
+        self.assertEqual(['Circle 1', 'Circle 2'], [circle.name for circle in circles])
+
+    def test_async_links(self):
+        async def collect():
+            roles = []
+            async for circle in models.Circle.alist():
+                roles.extend([role async for role in circle.roles])
+            return roles
+
+        roles = self.run_async(collect())
+
+        self.assertEqual(['Role 10', 'Role 20', 'Role 30'], [role.name for role in roles])
+        self.assertEqual(['/circles', '/roles/10,20,30', '/roles/30'], self.requested_paths)
+
+    def test_async_detail(self):
+        async def collect():
+            role = await models.Role.aget(id=10)
+            return [assignment async for assignment in role.assignments]
+
+        [assignment] = self.run_async(collect())
+
+        self.assertEqual(100, assignment.id)
+
+    def test_aget_many_concurrency(self):
+        self.routes.update({f'/roles/{pk}': {'roles': [{'id': pk}]} for pk in range(100, 150)})
+        aio.AsyncGlassFrogClient.configure(concurrency=4)
+        self.addCleanup(aio.AsyncGlassFrogClient.configure, concurrency=50)
+
+        async def fetch():
+            with patch.object(models.Role, '_BATCH_SIZE', 1):
+                return await models.Role.aget_many(ids=list(range(100, 150)))
+
+        roles = self.run_async(fetch())
+
+        self.assertEqual(list(range(100, 150)), [role.id for role in roles])
+        self.assertLessEqual(len(self.connections), 4)
+
+    def test_sessions_closed_with_their_loop(self):
+        sessions = []
+
+        async def fetch():
+            role = await models.Role.aget(id=10)
+            sessions.append(aio.AsyncGlassFrogClient._session)
+            return role
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            asyncio.run(fetch())
+            asyncio.run(fetch())
+            self.run_async(fetch())
+            gc.collect()
+
+        self.assertTrue(all(session.closed for session in sessions))
+        self.assertEqual([], [str(warning.message) for warning in caught if warning.category is ResourceWarning])
+
+    def test_session(self):
+        async def fetch():
+            with glassfrog.session():
+                role_a = await models.Role.aget(id=10)
+                role_b = await models.Role.aget(id=10)
+            return role_a, role_b
+
+        role_a, role_b = self.run_async(fetch())
+
+        self.assertIs(role_a, role_b)
+        self.assertEqual(['/roles/10'], self.requested_paths)
+
+
+class TestAsyncClientWithoutDependency(unittest.TestCase):
+    def test_missing_aiohttp(self):
+        with patch('glassfrog.aio.aiohttp', None):
+            with patch('glassfrog.client.GlassFrogClient._TOKEN', '42'):
+                with self.assertRaises(exceptions.DependencyMissingException):
+                    asyncio.run(aio.AsyncGlassFrogClient.get(resource='roles'))
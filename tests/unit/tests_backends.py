@@ -0,0 +1,150 @@
+import os
+import tempfile
+import unittest
+from abc import ABC
+
+from glassfrog import backends
+from glassfrog.testing import FakeKeyValueStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000
+
+    def __call__(self):
+        return self.now
+
+
+class BackendTestMixin(ABC):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.backend = self.make_backend()
+
+    def make_backend(self):
+        raise NotImplementedError
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.backend.get('missing'))
+
+        self.backend.set('key', b'value')
+        self.backend.set('other', b'\x00\xff')
+
+        self.assertEqual(self.backend.get('key'), b'value')
+        self.assertEqual(self.backend.get_many(['other', 'missing', 'key']), [b'\x00\xff', None, b'value'])
+        self.assertEqual(self.backend.get_many([]), [])
+
+    def test_ttl(self):
+        self.backend.set('short', b'1', ttl=10)
+        self.backend.set('long', b'2', ttl=100)
+        self.backend.set('forever', b'3')
+        self.backend.set('expired', b'4', ttl=0)
+
+        self.clock.now += 10
+
+        self.assertIsNone(self.backend.get('short'))
+        self.assertEqual(self.backend.get('long'), b'2')
+        self.assertEqual(self.backend.get('forever'), b'3')
+        self.assertIsNone(self.backend.get('expired'))
+
+    def test_overwrite_and_delete(self):
+        self.backend.set('key', b'old', ttl=10)
+        self.backend.set('key', b'new')
+        self.clock.now += 20
+
+        self.assertEqual(self.backend.get('key'), b'new')
+
+        self.backend.delete('key')
+        self.backend.delete('missing')
+
+        self.assertIsNone(self.backend.get('key'))
+
+    def test_clear(self):
+        self.backend.set('a', b'1')
+        self.backend.set('b', b'2')
+
+        self.backend.clear()
+
+        self.assertEqual(self.backend.get_many(['a', 'b']), [None, None])
+
+
+class TestMemoryBackend(BackendTestMixin, unittest.TestCase):
+    def make_backend(self):
+        return backends.MemoryBackend(clock=self.clock)
+
+    def test_purge(self):
+        for index in range(1023):
+            self.backend.set(f'key{index}', b'1', ttl=10)
+        self.clock.now += 10
+
+        self.backend.set('fresh', b'1', ttl=10)
+
+        self.assertEqual(len(self.backend), 1)
+
+
+class TestSQLiteBackend(BackendTestMixin, unittest.TestCase):
+    def make_backend(self):
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'cache.sqlite')
+        return self.open_backend()
+
+    def open_backend(self):
+        backend = backends.SQLiteBackend(self.path, clock=self.clock)
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_shared_between_connections(self):
+        other = self.open_backend()
+
+        self.backend.set('key', b'value', ttl=10)
+
+        self.assertEqual(other.get('key'), b'value')
+        other.delete('key')
+        self.assertIsNone(self.backend.get('key'))
+
+    def test_purge(self):
+        self.backend.set('short', b'1', ttl=10)
+        self.backend.set('forever', b'2')
+        self.clock.now += 10
+
+        self.backend.purge()
+
+        rows = self.backend._execute('SELECT key FROM glassfrog_cache')
+        self.assertEqual(rows, [('forever',)])
+
+
+class TestKeyValueBackend(BackendTestMixin, unittest.TestCase):
+    def make_backend(self):
+        self.store = FakeKeyValueStore(clock=self.clock)
+        return backends.KeyValueBackend(self.store, prefix='gf:')
+
+    def test_prefix(self):
+        self.store.set('unrelated', b'kept')
+
+        self.backend.set('key', b'value')
+        self.backend.clear()
+
+        self.assertEqual(self.store.get('unrelated'), b'kept')
+        self.assertIsNone(self.store.get('gf:key'))
+
+    def test_ttl_rounded_up(self):
+        self.backend.set('key', b'value', ttl=0.5)
+        self.clock.now += 0.9
+
+        self.assertEqual(self.backend.get('key'), b'value')
+
+    def test_without_mget(self):
+        class Client:
+            def __init__(self):
+                self.values = {}
+
+            def get(self, key):
+                return self.values.get(key)
+
+            def set(self, key, value, ex=None):
+                self.values[key] = value
+
+        backend = backends.KeyValueBackend(Client())
+        backend.set('key', b'value', ttl=5)
+
+        self.assertEqual(backend.get_many(['key', 'missing']), [b'value', None])
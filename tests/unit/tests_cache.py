@@ -0,0 +1,392 @@
+import json
+import marshal
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import httpretty
+
+from glassfrog import backends, cache, client, models
+from tests.unit.tests_client import HTTPPrettyTestMixin
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_hit_and_miss(self):
+        response_cache = cache.ResponseCache(clock=self.clock)
+
+        self.assertIsNone(response_cache.get(('roles', 42, None)))
+        response_cache.set(('roles', 42, None), {'roles': []})
+        self.assertEqual({'roles': []}, response_cache.get(('roles', 42, None)))
+
+        stats = response_cache.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+        self.assertEqual(1, stats['entries'])
+
+    def test_ttl(self):
+        response_cache = cache.ResponseCache(ttl=10, ttls={'people': 100, 'projects': 0}, clock=self.clock)
+        response_cache.set(('roles', None, None), 'roles')
+        response_cache.set(('people', None, None), 'people')
+        response_cache.set(('projects', 42, 'circles'), 'projects')
+
+        self.clock.now = 10
+        self.assertIsNone(response_cache.get(('roles', None, None)))
+        self.assertEqual('people', response_cache.get(('people', None, None)))
+        self.assertIsNone(response_cache.get(('projects', 42, 'circles')))
+        self.assertEqual(1, len(response_cache))
+
+    def test_lru_eviction_by_entries(self):
+        response_cache = cache.ResponseCache(max_entries=2, clock=self.clock)
+        response_cache.set(('roles', 1, None), 1)
+        response_cache.set(('roles', 2, None), 2)
+        response_cache.get(('roles', 1, None))
+        response_cache.set(('roles', 3, None), 3)
+
+        self.assertEqual(1, response_cache.get(('roles', 1, None)))
+        self.assertIsNone(response_cache.get(('roles', 2, None)))
+        self.assertEqual(3, response_cache.get(('roles', 3, None)))
+        self.assertEqual(1, response_cache.stats()['evictions'])
+
+    def test_lru_eviction_by_bytes(self):
+        response_cache = cache.ResponseCache(max_bytes=100, clock=self.clock)
+        response_cache.set(('roles', 1, None), 1, size=60)
+        response_cache.set(('roles', 2, None), 2, size=60)
+        response_cache.set(('roles', 3, None), 3, size=200)
+
+        self.assertIsNone(response_cache.get(('roles', 1, None)))
+        self.assertEqual(2, response_cache.get(('roles', 2, None)))
+        self.assertIsNone(response_cache.get(('roles', 3, None)))
+        self.assertEqual(60, response_cache.stats()['bytes'])
+
+    def test_invalidate(self):
+        response_cache = cache.ResponseCache(clock=self.clock)
+        response_cache.set(('roles', 1, None), 1, size=10)
+        response_cache.set(('people', 1, None), 1, size=10)
+
+        response_cache.invalidate(resource='roles')
+        self.assertIsNone(response_cache.get(('roles', 1, None)))
+        self.assertEqual(10, response_cache.stats()['bytes'])
+
+        response_cache.invalidate()
+        self.assertEqual(0, len(response_cache))
+        self.assertEqual(0, response_cache.stats()['bytes'])
+
+
+class TestSharedResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.backend = backends.MemoryBackend(clock=self.clock)
+
+    def test_shared_between_workers(self):
+        worker_a = cache.SharedResponseCache(self.backend)
+        worker_b = cache.SharedResponseCache(self.backend)
+
+        self.assertIsNone(worker_b.get(('roles', 42, None)))
+        worker_a.set(('roles', 42, None), {'roles': [{'id': 42}]}, size=10)
+
+        self.assertEqual({'roles': [{'id': 42}]}, worker_b.get(('roles', 42, None)))
+        self.assertEqual({'hits': 1, 'misses': 1}, worker_b.stats())
+
+    def test_ttl(self):
+        response_cache = cache.SharedResponseCache(self.backend, ttl=10, ttls={'people': 100, 'circles': 0})
+        for resource in ('roles', 'people', 'circles'):
+            response_cache.set((resource, None, None), {resource: []})
+
+        self.assertIsNone(response_cache.get(('circles', None, None)))
+        self.clock.now = 10
+        self.assertIsNone(response_cache.get(('roles', None, None)))
+        self.assertEqual({'people': []}, response_cache.get(('people', None, None)))
+
+    def test_invalidate(self):
+        worker_a = cache.SharedResponseCache(self.backend)
+        worker_b = cache.SharedResponseCache(self.backend)
+        worker_a.set(('roles', 42, None), {'roles': []})
+        worker_a.set(('people', 1, None), {'people': []})
+
+        worker_b.invalidate('roles')
+
+        self.assertIsNone(worker_a.get(('roles', 42, None)))
+        self.assertEqual({'people': []}, worker_a.get(('people', 1, None)))
+
+        worker_a.set(('roles', 42, None), {'roles': [{'id': 42}]})
+        worker_b.invalidate()
+
+        self.assertIsNone(worker_a.get(('roles', 42, None)))
+        self.assertIsNone(worker_a.get(('people', 1, None)))
+
+    def test_tokens(self):
+        client.GlassFrogClient.set_cache(cache.SharedResponseCache(self.backend))
+        self.addCleanup(client.GlassFrogClient.set_cache, None)
+        responses = {'token-a': {'roles': [{'id': 1}]}, 'token-b': {'roles': [{'id': 2}]}}
+
+        def fetch(url, event=None):
+            return responses[client.GlassFrogClient._TOKEN], 10
+
+        with patch.object(client.GlassFrogClient, '_fetch', side_effect=fetch) as fetched:
+            for token in ('token-a', 'token-b', 'token-a'):
+                with patch.object(client.GlassFrogClient, '_TOKEN', token):
+                    self.assertEqual(responses[token], client.GlassFrogClient.get(resource='roles'))
+
+        self.assertEqual(2, fetched.call_count)
+
+    def test_namespaces(self):
+        cache.SharedResponseCache(self.backend, namespace='org-a').set(('roles', None, None), {'roles': []})
+
+        self.assertIsNone(cache.SharedResponseCache(self.backend, namespace='org-b').get(('roles', None, None)))
+
+
+class TestSharedModelCache(unittest.TestCase):
+    def test_round_trip(self):
+        backend = backends.MemoryBackend()
+        linked_data = models.LinkedData({'people': [{'id': 100, 'name': 'Chuck'}]})
+        roles = [models.Role(data={'id': id, 'links': {'people': [100]}}, linked_data=linked_data) for id in (1, 2)]
+
+        cache.SharedModelCache(backend).set(models.Role, 'list', roles)
+        cached = cache.SharedModelCache(backend).get(models.Role, 'list')
+
+        self.assertEqual([1, 2], [role.id for role in cached])
+        self.assertEqual(linked_data, cached[0]._linked_data)
+        self.assertIsNone(cache.SharedModelCache(backend).get(models.Circle, 'list'))
+
+        cache.SharedModelCache(backend).invalidate(models.Role)
+
+        self.assertIsNone(cache.SharedModelCache(backend).get(models.Role, 'list'))
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.directory = tmp_dir.name
+
+    def entry(self, data, etag='"v1"'):
+        return cache.DiskCacheEntry(etag=etag, last_modified=None, data=data, size=len(json.dumps(data)))
+
+    def test_round_trip(self):
+        disk_cache = cache.DiskCache(directory=self.directory)
+        self.assertIsNone(disk_cache.get('potato'))
+
+        disk_cache.set('potato', self.entry({'roles': [{'id': 42}]}))
+
+        entry = cache.DiskCache(directory=self.directory).get('potato')
+        self.assertEqual('"v1"', entry.etag)
+        self.assertEqual({'roles': [{'id': 42}]}, entry.data)
+
+    def test_corrupted_entry(self):
+        disk_cache = cache.DiskCache(directory=self.directory)
+        disk_cache.set('potato', self.entry({'answer': 42}))
+        with open(disk_cache._path('potato'), 'wb') as entry_file:
+            entry_file.write(b'garbage')
+
+        self.assertIsNone(disk_cache.get('potato'))
+
+    def test_eviction(self):
+        entry = self.entry({'answer': 'x' * 200})
+        entry_size = len(marshal.dumps(tuple(entry)))
+        disk_cache = cache.DiskCache(directory=self.directory, max_bytes=entry_size * 4)
+        for pk in range(4):
+            disk_cache.set(f'potato-{pk}', entry)
+            os.utime(disk_cache._path(f'potato-{pk}'), (pk, pk))
+
+        disk_cache.get('potato-0')
+        disk_cache.set('potato-4', entry)
+
+        # down to 90% of max_bytes, the two least recently used entries
+        self.assertEqual(3, len(disk_cache._entry_paths()))
+        self.assertIsNotNone(disk_cache.get('potato-0'))
+        self.assertIsNotNone(disk_cache.get('potato-4'))
+        self.assertIsNone(disk_cache.get('potato-1'))
+        self.assertIsNone(disk_cache.get('potato-2'))
+
+    def test_eviction_scans_rarely(self):
+        disk_cache = cache.DiskCache(directory=self.directory)
+
+        with patch.object(disk_cache, '_entry_paths', wraps=disk_cache._entry_paths) as entry_paths:
+            for pk in range(300):
+                disk_cache.set(f'potato-{pk}', self.entry({'answer': pk}))
+
+        self.assertEqual(2, entry_paths.call_count)  # the first write, then once every _RESCAN_EVERY writes
+
+    def test_concurrent_writers(self):
+        disk_cache = cache.DiskCache(directory=self.directory)
+
+        def write(pk):
+            for _ in range(20):
+                disk_cache.set('potato', self.entry({'answer': pk}))
+
+        threads = [threading.Thread(target=write, args=(pk,)) for pk in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIn(disk_cache.get('potato').data['answer'], range(4))
+        self.assertEqual(1, len(disk_cache._entry_paths()))
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith('.tmp')])
+
+    def test_clear(self):
+        disk_cache = cache.DiskCache(directory=self.directory)
+        disk_cache.set('potato', self.entry({'answer': 42}))
+
+        disk_cache.clear()
+        self.assertIsNone(disk_cache.get('potato'))
+
+
+class TestGlassFrogClientCache(HTTPPrettyTestMixin, unittest.TestCase):
+    API_URL = 'https://api.glassfrog.com/api/v3'
+
+    def setUp(self):
+        self.response_cache = cache.ResponseCache()
+        client.GlassFrogClient.set_cache(self.response_cache)
+        self.addCleanup(client.GlassFrogClient.set_cache, None)
+
+        token_patcher = patch('glassfrog.client.GlassFrogClient._TOKEN', '42')
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
+
+    @httpretty.activate
+    def test_cached(self):
+        httpretty.register_uri(httpretty.GET, f'{self.API_URL}/potato/314', body=json.dumps({'answer': 314}))
+
+        data_a = client.GlassFrogClient.get(resource='potato', id=314)
+        data_b = client.GlassFrogClient.get(resource='potato', id=314)
+
+        self.assertEqual({'answer': 314}, data_a)
+        self.assertEqual(data_a, data_b)
+        self.assertEqual(1, self.request_count)
+        self.assertEqual(1, self.response_cache.stats()['hits'])
+        self.assertEqual(len(json.dumps({'answer': 314})), self.response_cache.stats()['bytes'])
+
+    @httpretty.activate
+    def test_keyed_by_resource(self):
+        httpretty.register_uri(httpretty.GET, f'{self.API_URL}/potato/314', body=json.dumps({'answer': 314}))
+        httpretty.register_uri(httpretty.GET, f'{self.API_URL}/potato/314/answers', body=json.dumps({'answer': 42}))
+
+        self.assertEqual({'answer': 314}, client.GlassFrogClient.get(resource='potato', id=314))
+        self.assertEqual({'answer': 42}, client.GlassFrogClient.get(resource='answers', id=314, from_resource='potato'))
+        self.assertEqual(2, self.request_count)
+
+    @httpretty.activate
+    def test_errors_not_cached(self):
+        httpretty.register_uri(httpretty.GET, f'{self.API_URL}/potato', body='Not here', status=404)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                client.GlassFrogClient.get(resource='potato')
+
+        self.assertEqual(2, self.request_count)
+        self.assertEqual(0, len(self.response_cache))
+
+
+class TestGlassFrogClientSharedCache(HTTPPrettyTestMixin, unittest.TestCase):
+    API_URL = 'https://api.glassfrog.com/api/v3'
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'cache.sqlite')
+        self.addCleanup(client.GlassFrogClient.set_cache, None)
+
+        token_patcher = patch('glassfrog.client.GlassFrogClient._TOKEN', '42')
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
+
+    def worker_cache(self):
+        backend = backends.SQLiteBackend(self.path)
+        self.addCleanup(backend.close)
+        return cache.SharedResponseCache(backend)
+
+    @httpretty.activate
+    def test_warm_for_every_worker(self):
+        httpretty.register_uri(httpretty.GET, f'{self.API_URL}/potato/314', body=json.dumps({'answer': 314}))
+
+        client.GlassFrogClient.set_cache(self.worker_cache())
+        data_a = client.GlassFrogClient.get(resource='potato', id=314)
+        client.GlassFrogClient.set_cache(self.worker_cache())
+        data_b = client.GlassFrogClient.get(resource='potato', id=314)
+
+        self.assertEqual({'answer': 314}, data_a)
+        self.assertEqual(data_a, data_b)
+        self.assertEqual(1, self.request_count)
+
+
+class TestGlassFrogClientDiskCache(HTTPPrettyTestMixin, unittest.TestCase):
+    API_URL = 'https://api.glassfrog.com/api/v3'
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.disk_cache = cache.DiskCache(directory=tmp_dir.name)
+        client.GlassFrogClient.set_disk_cache(self.disk_cache)
+        self.addCleanup(client.GlassFrogClient.set_disk_cache, None)
+
+        token_patcher = patch('glassfrog.client.GlassFrogClient._TOKEN', '42')
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
+
+    @httpretty.activate
+    def test_revalidate_not_modified(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            f'{self.API_URL}/potato/314',
+            responses=[
+                httpretty.Response(body=json.dumps({'answer': 314}), adding_headers={'ETag': '"v1"'}),
+                httpretty.Response(body='', status=304),
+            ],
+        )
+
+        data_a = client.GlassFrogClient.get(resource='potato', id=314)
+        self.assertNotIn('If-None-Match', self.latest_request_header)
+
+        with patch('requests.Response.json') as decode:
+            data_b = client.GlassFrogClient.get(resource='potato', id=314)
+
+        self.assertEqual({'answer': 314}, data_a)
+        self.assertEqual(data_a, data_b)
+        self.assertEqual(2, self.request_count)
+        self.assertEqual('"v1"', self.latest_request_header['If-None-Match'])
+        self.assertEqual(0, decode.call_count)
+
+    @httpretty.activate
+    def test_revalidate_modified(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            f'{self.API_URL}/potato',
+            responses=[
+                httpretty.Response(
+                    body=json.dumps({'answer': 314}),
+                    adding_headers={'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'},
+                ),
+                httpretty.Response(body=json.dumps({'answer': 42}), adding_headers={'ETag': '"v2"'}),
+                httpretty.Response(body='', status=304),
+            ],
+        )
+
+        self.assertEqual({'answer': 314}, client.GlassFrogClient.get(resource='potato'))
+        self.assertEqual({'answer': 42}, client.GlassFrogClient.get(resource='potato'))
+        self.assertEqual('Wed, 21 Oct 2015 07:28:00 GMT', self.latest_request_header['If-Modified-Since'])
+        self.assertEqual({'answer': 42}, client.GlassFrogClient.get(resource='potato'))
+        self.assertEqual('"v2"', self.latest_request_header['If-None-Match'])
+
+    @httpretty.activate
+    def test_without_validators(self):
+        httpretty.register_uri(httpretty.GET, f'{self.API_URL}/potato', body=json.dumps({'answer': 314}))
+
+        client.GlassFrogClient.get(resource='potato')
+        client.GlassFrogClient.get(resource='potato')
+
+        self.assertEqual([], self.disk_cache._entry_paths())
+        self.assertNotIn('If-None-Match', self.latest_request_header)
@@ -1,5 +1,7 @@
 import json
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
 import httpretty
@@ -18,6 +20,63 @@ class HTTPPrettyTestMixin:
         return last_request.headers
 
 
+class LocalServerTestMixin:
+    # Serves `routes` (or `{"path": ...}`) over HTTP/1.1 keep-alive and counts the accepted TCP connections
+    def setUp(self):
+        super().setUp()
+        connections = self.connections = []
+        routes = self.routes = {}
+        requested = self.requested_paths = []
+        failures = self.failures = {}  # path -> statuses answered before the route itself
+        etags = self.etags = {}  # path -> ETag sent with it, answered with a 304 when the client has it
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                connections.append(self.client_address)
+
+            def do_GET(self):
+                requested.append(self.path)
+                payload = routes.get(self.path, {'path': self.path})
+                body = json.dumps(payload).encode()
+                statuses = failures.get(self.path)
+                etag = etags.get(self.path)
+                if etag is not None and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                if statuses:
+                    self.send_response(statuses.pop(0))
+                    self.send_header('Retry-After', '0')
+                else:
+                    self.send_response(200 if payload is not None else 404)
+                if etag is not None:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+
+        host, port = self.server.server_address
+        url_patcher = patch('glassfrog.client.GlassFrogClient._URL', f'http://{host}:{port}')
+        url_patcher.start()
+        self.addCleanup(url_patcher.stop)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(client.GlassFrogClient.close)
+
+
 class TestGlassFrogClient(HTTPPrettyTestMixin, unittest.TestCase):
     API_URL = 'https://api.glassfrog.com/api/v3'
 
@@ -112,3 +171,53 @@ class TestGlassFrogClient(HTTPPrettyTestMixin, unittest.TestCase):
                 )
 
         self.assertEqual(0, self.request_count)
+
+
+class TestGlassFrogClientConnectionPool(LocalServerTestMixin, unittest.TestCase):
+    def patch_token(self, token='42'):
+        return patch('glassfrog.client.GlassFrogClient._TOKEN', token)
+
+    def tearDown(self):
+        client.GlassFrogClient.configure(keep_alive=True)
+        super().tearDown()
+
+    def test_connection_reused(self):
+        with self.patch_token():
+            for pk in range(5):
+                data = client.GlassFrogClient.get(resource='potato', id=pk + 1)
+                self.assertEqual({'path': f'/potato/{pk + 1}'}, data)
+
+        self.assertEqual(1, len(self.connections))
+
+    def test_connection_reused_across_threads(self):
+        with self.patch_token():
+            threads = [
+                threading.Thread(target=client.GlassFrogClient.get, kwargs={'resource': 'potato'})
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            connections_after_burst = len(self.connections)
+            client.GlassFrogClient.get(resource='potato')
+
+        self.assertLessEqual(connections_after_burst, 4)
+        self.assertEqual(connections_after_burst, len(self.connections))
+
+    def test_keep_alive_disabled(self):
+        client.GlassFrogClient.configure(keep_alive=False)
+        with self.patch_token():
+            for _ in range(3):
+                client.GlassFrogClient.get(resource='potato')
+
+        self.assertEqual(3, len(self.connections))
+
+    def test_close(self):
+        with self.patch_token():
+            client.GlassFrogClient.get(resource='potato')
+            client.GlassFrogClient.close()
+            client.GlassFrogClient.get(resource='potato')
+
+        self.assertEqual(2, len(self.connections))
@@ -0,0 +1,122 @@
+import unittest
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import glassfrog
+from glassfrog.columnar import Column, ColumnarResult, Mask
+
+
+def roles_response():
+    return {
+        'roles': [
+            {'id': 10, 'name': 'Lead', 'is_core': True, 'elected_until': None, 'links': {'circle': 1}},
+            {'id': 11, 'name': 'Secretary', 'is_core': True, 'elected_until': '2021-03-01', 'links': {'circle': 1}},
+            {'id': 20, 'name': 'Seller', 'is_core': False, 'elected_until': '2020-01-15', 'links': {'circle': 2}},
+            {'id': 21, 'name': 'Buyer', 'is_core': False, 'elected_until': None, 'links': {'circle': None}},
+        ],
+        'linked': {'circles': [{'id': 1, 'name': 'GCC'}]},
+    }
+
+
+class TestMask(unittest.TestCase):
+    def test_combine(self):
+        left, right = Mask([1, 1, 0, 0]), Mask([1, 0, 1, 0])
+
+        self.assertEqual(list(left & right), [1, 0, 0, 0])
+        self.assertEqual(list(left | right), [1, 1, 1, 0])
+        self.assertEqual(list(~left), [0, 0, 1, 1])
+        self.assertEqual((left | right).count(), 3)
+        self.assertEqual((left | right).indexes(), [0, 1, 2])
+
+    def test_combine_different_lengths(self):
+        with self.assertRaises(glassfrog.exceptions.UnexpectedDataFormat):
+            Mask([1]) & Mask([1, 0])  # pylint: disable=expression-not-assigned
+
+
+class TestColumn(unittest.TestCase):
+    def test_null_strings(self):
+        names = Column.build(name='name', kind='str', raw_values=['Lead', None, 'Seller'])
+
+        self.assertEqual(list(names < 'M'), [1, 0, 0])
+        self.assertEqual(list(names != 'Lead'), [0, 0, 1])
+        self.assertEqual(list(names.isin(['Seller', None])), [0, 0, 1])
+        self.assertEqual(list(names.isnull()), [0, 1, 0])
+
+
+class TestColumnarResult(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('glassfrog.client.GlassFrogClient.get', return_value=roles_response())
+        self.get = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.roles = glassfrog.Role.list(columnar=True)
+
+    def test_single_request(self):
+        self.assertIsInstance(self.roles, ColumnarResult)
+        self.get.assert_called_once_with(resource='roles')
+        self.assertEqual(len(self.roles), 4)
+
+    def test_typed_columns(self):
+        self.assertEqual(self.roles['id'].values.typecode, 'q')
+        self.assertEqual(list(self.roles['id']), [10, 11, 20, 21])
+        self.assertEqual(list(self.roles['is_core']), [True, True, False, False])
+        self.assertEqual(list(self.roles['elected_until']), [None, date(2021, 3, 1), date(2020, 1, 15), None])
+        self.assertEqual(list(self.roles['circle']), [1, 1, 2, None])
+        self.assertEqual(self.roles['name'][2], 'Seller')
+
+    def test_masks(self):
+        core = self.roles[self.roles['is_core'] == 1]
+        self.assertEqual(list(core['id']), [10, 11])
+
+        mask = (self.roles['circle'] == 1) | (self.roles['elected_until'] < date(2021, 1, 1))
+        self.assertEqual(list(self.roles[mask]['id']), [10, 11, 20])
+        self.assertEqual(list(self.roles[~mask]['id']), [21])
+
+        self.assertEqual(list(self.roles[self.roles['circle'].isnull()]['id']), [21])
+        self.assertEqual(list(self.roles[self.roles['circle'].isin([2, 3])]['id']), [20])
+        self.assertEqual(list(self.roles.filter(circle=1, is_core=True)['id']), [10, 11])
+
+    def test_sort_by(self):
+        self.assertEqual(list(self.roles.sort_by('elected_until')['id']), [20, 11, 10, 21])
+        names = self.roles.sort_by('name', reverse=True)['name']
+        self.assertEqual(list(names), ['Seller', 'Secretary', 'Lead', 'Buyer'])
+
+    def test_group_by(self):
+        groups = self.roles.group_by('circle')
+
+        self.assertEqual({circle: len(roles) for circle, roles in groups.items()}, {1: 2, 2: 1, None: 1})
+        self.assertEqual(list(groups[1]['name']), ['Lead', 'Secretary'])
+
+    def test_aggregates(self):
+        self.assertEqual(self.roles['id'].sum(), 62)
+        self.assertEqual(self.roles['elected_until'].min(), date(2020, 1, 15))
+        self.assertEqual(self.roles['elected_until'].count(), 2)
+
+    def test_models_on_demand(self):
+        role = self.roles[self.roles['id'] == 10][0]
+
+        self.assertIsInstance(role, glassfrog.Role)
+        self.assertEqual(role.name, 'Lead')
+        self.assertTrue(role.is_core)
+        self.assertEqual([role.id for role in self.roles], [10, 11, 20, 21])
+
+    def test_session_instances(self):
+        with glassfrog.session():
+            roles = list(glassfrog.Role.list())
+            columnar = glassfrog.Role.list(columnar=True)
+
+            self.assertIs(columnar[0], roles[0])
+        self.assertEqual(list(columnar['id']), [10, 11, 20, 21])
+
+    def test_from_models(self):
+        project = glassfrog.Project(data={
+            'id': 3, 'value': 2.5, 'effort': None, 'roi': 1.0, 'private_to_circle': False,
+            'created_at': '2020-01-01T10:00:00Z', 'archived_at': None, 'links': {'circle': 1},
+        })
+        projects = ColumnarResult.from_models(model_klass=glassfrog.Project, objects=[project])
+
+        self.assertEqual(projects['value'].values.typecode, 'd')
+        self.assertEqual(projects['value'].mean(), 2.5)
+        self.assertIsNone(projects['effort'][0])
+        self.assertEqual(projects['created_at'][0], datetime(2020, 1, 1, 10, tzinfo=timezone.utc))
+        self.assertEqual(list(projects[projects['value'] > 2]['id']), [3])
+        self.assertIs(projects[0], project)
@@ -0,0 +1,96 @@
+# pylint: disable=redefined-builtin
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import glassfrog
+from glassfrog import concurrency, identity, models
+
+
+class ConcurrencyProbe:
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, item):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delays.get(item, 0.01))
+        with self.lock:
+            self.running -= 1
+        return item * 2
+
+
+class TestMapOrdered(unittest.TestCase):
+    def test_sequential(self):
+        probe = ConcurrencyProbe()
+        self.assertEqual([2, 4, 6], concurrency.map_ordered(probe, [1, 2, 3], max_workers=1))
+        self.assertEqual(1, probe.max_running)
+
+    def test_bounded_and_ordered(self):
+        probe = ConcurrencyProbe(delays={1: 0.05})
+        results = concurrency.map_ordered(probe, range(1, 9), max_workers=3)
+
+        self.assertEqual([2, 4, 6, 8, 10, 12, 14, 16], results)
+        self.assertEqual(3, probe.max_running)
+
+    def test_context_propagated(self):
+        with glassfrog.session() as current:
+            sessions = concurrency.map_ordered(lambda _: identity.Session.current(), range(4), max_workers=4)
+
+        self.assertEqual([current] * 4, sessions)
+
+
+class TestLinkWorkers(unittest.TestCase):
+    def tearDown(self):
+        concurrency.set_link_workers(None)
+
+    def test_default(self):
+        self.assertEqual(1, concurrency.get_link_workers())
+        self.assertEqual(4, concurrency.get_link_workers(default=4))
+
+    def test_global(self):
+        concurrency.set_link_workers(8)
+        self.assertEqual(8, concurrency.get_link_workers(default=4))
+
+    def test_scoped(self):
+        concurrency.set_link_workers(8)
+        with glassfrog.link_workers(2):
+            self.assertEqual(2, concurrency.get_link_workers())
+        self.assertEqual(8, concurrency.get_link_workers())
+
+    def test_links_resolved_concurrently(self):
+        circle = models.Circle(data={'id': 1, 'links': {'roles': list(range(10, 20))}})
+        probe = ConcurrencyProbe()
+
+        def fake_get(resource, id):
+            probe(0)
+            return {'roles': [{'id': int(pk)} for pk in str(id).split(',')]}
+
+        with patch.object(models.Role, '_BATCH_SIZE', 2):
+            with patch('glassfrog.client.GlassFrogClient.get', side_effect=fake_get) as get:
+                with glassfrog.link_workers(3):
+                    roles = list(circle.roles)
+
+        self.assertEqual(list(range(10, 20)), [role.id for role in roles])
+        self.assertEqual(5, get.call_count)
+        self.assertEqual(3, probe.max_running)
+
+    def test_batches_sequential_by_default(self):
+        circle = models.Circle(data={'id': 1, 'links': {'roles': list(range(10, 20))}})
+        probe = ConcurrencyProbe()
+
+        def fake_get(resource, id):
+            probe(0)
+            return {'roles': [{'id': int(pk)} for pk in str(id).split(',')]}
+
+        with patch.object(models.Role, '_BATCH_SIZE', 2):
+            with patch('glassfrog.client.GlassFrogClient.get', side_effect=fake_get):
+                roles = list(circle.roles)
+
+        self.assertEqual(list(range(10, 20)), [role.id for role in roles])
+        self.assertEqual(1, probe.max_running)
@@ -0,0 +1,93 @@
+import unittest
+
+from glassfrog import models
+from glassfrog.hierarchy import CircleTree
+from glassfrog.testing import generate_org
+
+
+def circle(id, supported_role=None):  # pylint: disable=redefined-builtin
+    return {'id': id, 'links': {'supported_role': supported_role}}
+
+
+def role(id, circle_id, supporting_circle=None):  # pylint: disable=redefined-builtin
+    return {'id': id, 'links': {'circle': circle_id, 'supporting_circle': supporting_circle}}
+
+
+class TestCircleTree(unittest.TestCase):
+    def setUp(self):
+        #  1 ─┬─ 2 ── 4
+        #     └─ 3
+        self.tree = CircleTree.from_data(
+            circles=[circle(1), circle(2, supported_role=11), circle(3, supported_role=12), circle(4)],
+            roles=[
+                role(10, 1), role(11, 1), role(12, 1),
+                role(20, 2), role(21, 2, supporting_circle=4),
+                role(30, 3), role(40, 4),
+            ],
+        )
+
+    def test_structure(self):
+        self.assertEqual(self.tree.roots, [1])
+        self.assertEqual(len(self.tree), 4)
+        self.assertEqual(self.tree.parent(4), 2)
+        self.assertEqual(self.tree.children(1), [2, 3])
+        self.assertEqual([self.tree.depth(circle_id) for circle_id in (1, 2, 3, 4)], [0, 1, 1, 2])
+
+    def test_ancestors(self):
+        self.assertEqual(self.tree.ancestors(4), [2, 1])
+        self.assertEqual(self.tree.ancestors(1), [])
+
+    def test_subtree(self):
+        self.assertEqual(self.tree.subtree(1), [1, 2, 4, 3])
+        self.assertEqual(self.tree.subtree(2), [2, 4])
+        self.assertEqual(self.tree.subtree(3), [3])
+
+        self.assertTrue(self.tree.is_descendant(4, 1))
+        self.assertTrue(self.tree.is_descendant(4, 4))
+        self.assertFalse(self.tree.is_descendant(3, 2))
+        self.assertFalse(self.tree.is_descendant(1, 2))
+
+    def test_roles_beneath(self):
+        self.assertEqual(self.tree.roles_beneath(1), [10, 11, 12, 20, 21, 40, 30])
+        self.assertEqual(self.tree.roles_beneath(2), [20, 21, 40])
+        self.assertEqual(self.tree.roles_beneath(4), [40])
+        self.assertTrue(self.tree.role_is_beneath(40, 2))
+        self.assertFalse(self.tree.role_is_beneath(30, 2))
+        self.assertEqual(self.tree.circle_of(21), 2)
+
+    def test_cycle(self):
+        tree = CircleTree.from_data(
+            circles=[circle(1, supported_role=20), circle(2, supported_role=10)],
+            roles=[role(10, 1), role(20, 2)],
+        )
+
+        self.assertEqual(len(tree), 2)
+        self.assertEqual(len(tree.roots), 1)
+        self.assertEqual(sorted(tree.subtree(tree.roots[0])), [1, 2])
+        self.assertEqual(len(tree.ancestors(1) + tree.ancestors(2)), 1)
+
+    def test_deep(self):
+        depth = 5000
+        tree = CircleTree.from_data(
+            circles=[circle(n, supported_role=n - 1 if n > 1 else None) for n in range(1, depth + 1)],
+            roles=[role(n, n) for n in range(1, depth + 1)],
+        )
+
+        self.assertEqual(tree.depth(depth), depth - 1)
+        self.assertEqual(len(tree.roles_beneath(1)), depth)
+
+    def test_generated_org(self):
+        org = generate_org(circles=20, roles=100, seed=4)
+        circles = [models.Circle(data=data) for data in org['circles'].values()]
+        roles = [models.Role(data=data) for data in org['roles'].values()]
+
+        tree = CircleTree.from_models(circles=circles, roles=roles)
+
+        self.assertEqual(tree.roots, [1])
+        self.assertEqual(sorted(tree.roles_beneath(1)), sorted(org['roles']))
+        for circle_id in org['circles']:
+            expected = {
+                role_id for role_id, data in org['roles'].items()
+                if data['links']['circle'] == circle_id or circle_id in tree.ancestors(data['links']['circle'])
+            }
+            self.assertEqual(set(tree.roles_beneath(circle_id)), expected)
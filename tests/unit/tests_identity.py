@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+
+import glassfrog
+from glassfrog import identity, models
+
+
+class TestSession(unittest.TestCase):
+    def patch_get(self, responses):
+        return patch('glassfrog.client.GlassFrogClient.get', side_effect=responses)
+
+    def test_no_session(self):
+        self.assertIsNone(identity.Session.current())
+
+        responses = [{'roles': [{'id': 42}]}, {'roles': [{'id': 42}]}]
+        with self.patch_get(responses) as get:
+            role_a = models.Role.get(id=42)
+            role_b = models.Role.get(id=42)
+
+        self.assertIsNot(role_a, role_b)
+        self.assertEqual(2, get.call_count)
+
+    def test_get_once(self):
+        responses = [{'roles': [{'id': 42}]}]
+        with glassfrog.session() as current:
+            with self.patch_get(responses) as get:
+                role_a = models.Role.get(id=42)
+                role_b = models.Role.get(id=42)
+
+            self.assertIs(current, identity.Session.current())
+            self.assertIn(role_a, current)
+
+        self.assertIsNone(identity.Session.current())
+        self.assertIs(role_a, role_b)
+        self.assertEqual(1, get.call_count)
+
+    def test_keyed_by_model(self):
+        responses = [{'roles': [{'id': 42}]}, {'circles': [{'id': 42}]}]
+        with glassfrog.session() as current:
+            with self.patch_get(responses) as get:
+                role = models.Role.get(id=42)
+                circle = models.Circle.get(id=42)
+
+        self.assertIsInstance(role, models.Role)
+        self.assertIsInstance(circle, models.Circle)
+        self.assertEqual(2, len(current))
+        self.assertEqual(2, get.call_count)
+
+    def test_links_reuse_instances(self):
+        responses = [
+            {'circles': [{'id': 1, 'links': {'roles': [10, 20]}}]},
+            {'roles': [{'id': 10, 'links': {'circle': 1}}, {'id': 20, 'links': {'circle': 1}}]},
+            {'roles': [{'id': 30}]},
+        ]
+        with glassfrog.session():
+            with self.patch_get(responses) as get:
+                [circle] = models.Circle.list()
+                roles = list(circle.roles)
+                same_roles = models.Role.get_many(ids=[10, 20, 30])
+                parents = [role.circle for role in roles]
+
+        self.assertEqual(roles, same_roles[:2])
+        self.assertIs(roles[0], same_roles[0])
+        self.assertIs(circle, parents[0])
+        self.assertIs(circle, parents[1])
+        self.assertEqual(3, get.call_count)
+        get.assert_called_with(resource='roles', id=30)
+
+    def test_build_reuses_instances(self):
+        with glassfrog.session():
+            with self.patch_get([{'roles': [{'id': 42, 'name': 'Answer'}]}]):
+                role = models.Role.get(id=42)
+
+            self.assertIs(role, models.Role.build(id=42, linked_data=None))
+
+        self.assertIsNot(role, models.Role.build(id=42, linked_data=None))
+
+    def test_linked_only_models_reuse_instances(self):
+        responses = [{'roles': [{'id': 42, 'links': {'domains': [10]}}], 'linked': {'domains': [{'id': 10}]}}]
+        with glassfrog.session() as current:
+            with self.patch_get(responses):
+                role = models.Role.get(id=42)
+                domains = list(role.domains)
+                same_domains = list(role.domains)
+
+            self.assertIn(domains[0], current)
+
+        self.assertIs(domains[0], same_domains[0])
+
+    def test_nested_sessions(self):
+        with glassfrog.session() as outer:
+            with glassfrog.session() as inner:
+                self.assertIs(inner, identity.Session.current())
+            self.assertIs(outer, identity.Session.current())
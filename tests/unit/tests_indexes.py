@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import patch
+
+import glassfrog
+from glassfrog import identity, models
+from glassfrog.indexes import ReverseIndex
+
+
+class TestReverseIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = ReverseIndex()
+        self.index.add('roles', {'id': 10, 'links': {
+            'circle': 1, 'supporting_circle': 2, 'people': [100, 101], 'domains': [900], 'accountabilities': [50],
+        }})
+        self.index.add('roles', {'id': 11, 'links': {'circle': 1, 'people': [100], 'domains': []}})
+        self.index.add('assignments', {'id': 1000, 'links': {'person': 100, 'role': 10}})
+
+    def test_lookups(self):
+        self.assertEqual(self.index.get('person_roles', 100), [10, 11])
+        self.assertEqual(self.index.get('person_roles', 101), [10])
+        self.assertEqual(self.index.get('person_assignments', 100), [1000])
+        self.assertEqual(self.index.get('role_assignments', 10), [1000])
+        self.assertEqual(self.index.get('circle_children', 1), [2])
+        self.assertEqual(self.index.get('domain_roles', 900), [10])
+        self.assertEqual(self.index.get('accountability_roles', 50), [10])
+        self.assertEqual(self.index.get('person_roles', 666), [])
+
+    def test_update(self):
+        self.index.add('roles', {'id': 10, 'links': {'circle': 1, 'people': [102]}})
+
+        self.assertEqual(self.index.get('person_roles', 100), [11])
+        self.assertEqual(self.index.get('person_roles', 102), [10])
+        self.assertEqual(self.index.get('circle_children', 1), [])
+        self.assertEqual(self.index.get('domain_roles', 900), [])
+
+    def test_remove(self):
+        self.index.remove('roles', 11)
+        self.index.remove('roles', 666)
+
+        self.assertEqual(self.index.get('person_roles', 100), [10])
+        self.assertEqual(len(self.index), 2)
+
+    def test_unindexed_resource(self):
+        self.index.add('circles', {'id': 1, 'links': {'roles': [10]}})
+
+        self.assertEqual(len(self.index), 3)
+
+
+class TestSessionIndexes(unittest.TestCase):
+    def test_maintained_as_entities_load(self):
+        responses = [
+            {'roles': [
+                {'id': 10, 'links': {'people': [100], 'domains': [900]}},
+                {'id': 11, 'links': {'people': [100, 101], 'domains': []}},
+            ]},
+            {'people': [{'id': 100, 'links': {}}]},
+        ]
+        with glassfrog.session() as current, \
+                patch('glassfrog.client.GlassFrogClient.get', side_effect=responses):
+            self.assertEqual(current.related('person_roles', 100), [])
+
+            roles = list(models.Role.list())
+            person = models.Person.get(id=100)
+
+            self.assertEqual(current.related('person_roles', person), roles)
+            self.assertEqual(current.related_ids('person_roles', 101), [11])
+            self.assertEqual(current.related('domain_roles', 900), roles[:1])
+            self.assertEqual(current.related('circle_children', 1), [])
+
+        current.clear()
+        self.assertEqual(current.related_ids('person_roles', 100), [])
+
+    def test_registered_once(self):
+        current = identity.Session()
+        role = current.register(models.Role(data={'id': 10, 'links': {'people': [100]}}))
+        current.register(models.Role(data={'id': 10, 'links': {'people': [101]}}))
+
+        self.assertEqual(current.related('person_roles', 100), [role])
+        self.assertEqual(current.related('person_roles', 101), [])
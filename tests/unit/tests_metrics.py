@@ -0,0 +1,122 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import httpretty
+import requests
+
+from glassfrog import cache, client, metrics, ratelimit
+from tests.unit.tests_client import HTTPPrettyTestMixin
+
+
+def event(resource='roles', *, source='network', status=200, size=100, attempts=1, duration=0.02, error=None):
+    recorded = metrics.RequestEvent(resource=resource, url=f'https://example.com/{resource}')
+    recorded.source = source
+    recorded.status = status
+    recorded.size = size
+    recorded.attempts = attempts
+    recorded.duration = duration
+    recorded.error = error
+    return recorded
+
+
+class TestMetricsAggregator(unittest.TestCase):
+    def setUp(self):
+        self.aggregator = metrics.MetricsAggregator(buckets=(0.01, 0.1))
+        self.aggregator(event())
+        self.aggregator(event(attempts=3, duration=0.5))
+        self.aggregator(event(source='memory', size=0, attempts=0, duration=0.0001))
+        self.aggregator(event(resource='people', status=404, size=0, error=requests.HTTPError()))
+
+    def test_as_dict(self):
+        stats = self.aggregator.snapshot().as_dict()
+
+        self.assertEqual(stats['roles'], {
+            'requests': {'network': 2, 'memory': 1},
+            'errors': {},
+            'bytes': 200,
+            'retries': 2,
+            'latency': {'buckets': {0.01: 0, 0.1: 1, float('inf'): 1}, 'sum': 0.52, 'count': 2},
+        })
+        self.assertEqual(stats['people']['errors'], {404: 1})
+
+    def test_prometheus(self):
+        text = self.aggregator.snapshot().to_prometheus()
+
+        self.assertIn('# TYPE glassfrog_requests_total counter', text)
+        self.assertIn('glassfrog_requests_total{resource="roles",source="network"} 2', text)
+        self.assertIn('glassfrog_request_errors_total{resource="people",status="404"} 1', text)
+        self.assertIn('glassfrog_request_retries_total{resource="roles"} 2', text)
+        self.assertIn('# TYPE glassfrog_request_duration_seconds histogram', text)
+        self.assertIn('glassfrog_request_duration_seconds_bucket{resource="roles",le="0.1"} 1', text)
+        self.assertIn('glassfrog_request_duration_seconds_bucket{resource="roles",le="+Inf"} 2', text)
+        self.assertIn('glassfrog_request_duration_seconds_count{resource="roles"} 2', text)
+
+    def test_snapshot_is_frozen(self):
+        snapshot = self.aggregator.snapshot()
+        self.aggregator(event())
+        self.aggregator.reset()
+
+        self.assertEqual(snapshot.as_dict()['roles']['requests']['network'], 2)
+        self.assertEqual(self.aggregator.snapshot().as_dict(), {})
+
+
+class TestGlassFrogClientObservers(HTTPPrettyTestMixin, unittest.TestCase):
+    API_URL = 'https://api.glassfrog.com/api/v3'
+
+    def setUp(self):
+        self.events = []
+        client.GlassFrogClient.add_observer(self.events.append)
+        self.addCleanup(client.GlassFrogClient.remove_observer, self.events.append)
+
+        limiter = ratelimit.RateLimiter(sleep=lambda seconds: None)
+        client.GlassFrogClient.set_rate_limiter(limiter)
+        self.addCleanup(client.GlassFrogClient.set_rate_limiter, ratelimit.RateLimiter())
+
+        token_patcher = patch('glassfrog.client.GlassFrogClient._TOKEN', '42')
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
+
+    @httpretty.activate
+    def test_network_and_memory(self):
+        body = json.dumps({'answer': 42})
+        httpretty.register_uri(httpretty.GET, f'{self.API_URL}/potato/1', body=body)
+        client.GlassFrogClient.set_cache(cache.ResponseCache())
+        self.addCleanup(client.GlassFrogClient.set_cache, None)
+
+        client.GlassFrogClient.get(resource='potato', id=1)
+        client.GlassFrogClient.get(resource='potato', id=1)
+
+        self.assertEqual(len(self.events), 2)
+        network, memory = self.events[0], self.events[1]
+        self.assertEqual((network.resource, network.source, network.status), ('potato', 'network', 200))
+        self.assertEqual((network.size, network.retries), (len(body), 0))
+        self.assertGreater(network.duration, 0)
+        self.assertEqual((memory.source, memory.attempts), ('memory', 0))
+
+    @httpretty.activate
+    def test_retries_and_errors(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            f'{self.API_URL}/potato',
+            responses=[httpretty.Response(body='', status=503), httpretty.Response(body='', status=404)],
+        )
+
+        with self.assertRaises(requests.HTTPError):
+            client.GlassFrogClient.get(resource='potato')
+
+        self.assertEqual(len(self.events), 1)
+        recorded = self.events[0]
+        self.assertEqual((recorded.status, recorded.retries), (404, 1))
+        self.assertIsInstance(recorded.error, requests.HTTPError)
+
+    @httpretty.activate
+    def test_aggregator(self):
+        aggregator = metrics.MetricsAggregator()
+        client.GlassFrogClient.add_observer(aggregator)
+        self.addCleanup(client.GlassFrogClient.remove_observer, aggregator)
+        httpretty.register_uri(httpretty.GET, f'{self.API_URL}/potato', body='{}')
+
+        client.GlassFrogClient.get(resource='potato')
+
+        self.assertEqual(aggregator.snapshot().as_dict()['potato']['requests'], {'network': 1})
@@ -3,7 +3,7 @@ from unittest.mock import patch
 
 from requests import HTTPError, Response
 
-from glassfrog import exceptions
+from glassfrog import exceptions, models
 from tests.unit.tests_client import HTTPPrettyTestMixin
 
 
@@ -41,6 +41,12 @@ class ModelTestMixin(HTTPPrettyTestMixin, ABC):
         obj = self.model_klass(data=sample)  # pylint: disable=not-callable
         self.assertEqual(sample['id'], obj.id)
 
+    def test_slots(self):
+        obj = self.model_klass(data=self.sample_data()[0])  # pylint: disable=not-callable
+        self.assertFalse(hasattr(obj, '__dict__'))
+        with self.assertRaises(AttributeError):
+            obj.potato = 42  # pylint: disable=attribute-defined-outside-init
+
     def test_invalid_field(self):
         obj = self.model_klass(data={})  # pylint: disable=not-callable
         with self.assertRaises(exceptions.UnexpectedDataFormat):
@@ -78,6 +84,49 @@ class ModelTestMixin(HTTPPrettyTestMixin, ABC):
 
         self.assertEqual(1, get.call_count)
 
+    def test_get_many(self):
+        data = self.sample_data()
+        ids = [item['id'] for item in reversed(data)]
+
+        with self.patch_get(resource=self.resource_key, data=data, many=False) as get:
+            objects = self.model_klass.get_many(ids=ids)
+
+        self.assertEqual(ids, [obj.id for obj in objects])
+        get.assert_called_once_with(resource=self.resource_key, id=','.join(str(pk) for pk in ids))
+
+    def test_get_many_batches(self):
+        data = self.sample_data()
+        ids = [item['id'] for item in data]
+
+        with patch.object(self.model_klass, '_BATCH_SIZE', 1):
+            with self.patch_get(resource=self.resource_key, data=data, many=True) as get:
+                objects = self.model_klass.get_many(ids=ids)
+
+        self.assertEqual(ids, [obj.id for obj in objects])
+        self.assertEqual(len(ids), get.call_count)
+
+    def test_get_many_fallback(self):
+        data = self.sample_data()
+        ids = [item['id'] for item in data]
+
+        responses = [
+            {self.resource_key: [data[0]]},  # the batch answer misses an id
+            {self.resource_key: [data[1]]},
+        ]
+        with patch('glassfrog.client.GlassFrogClient.get', side_effect=responses) as get:
+            objects = self.model_klass.get_many(ids=ids)
+
+        self.assertEqual(ids, [obj.id for obj in objects])
+        self.assertEqual(2, get.call_count)
+        get.assert_called_with(resource=self.resource_key, id=ids[1])
+
+    def test_get_many_not_found(self):
+        with self.patch_get_error(status_code=404) as get:
+            objects = self.model_klass.get_many(ids=[666, 999])
+
+        self.assertEqual([], objects)
+        self.assertEqual(3, get.call_count)
+
     def test_serialize(self):
         sample = self.sample_data()[0]
         obj = self.model_klass(data=sample)  # pylint: disable=not-callable
@@ -88,6 +137,21 @@ class ModelTestMixin(HTTPPrettyTestMixin, ABC):
         self.assertEqual(obj._data, new_obj._data)
         self.assertEqual(obj._linked_data, new_obj._linked_data)
 
+    def test_serialize_many(self):
+        linked_data = models.LinkedData({'domains': [{'id': 900, 'description': 'Everything'}]})
+        objects = [
+            self.model_klass(data=sample, linked_data=linked_data)  # pylint: disable=not-callable
+            for sample in self.sample_data()
+        ]
+
+        payload = self.model_klass.serialize_many(objects)
+        new_objects = self.model_klass.deserialize_many(payload)
+
+        self.assertEqual([obj._data for obj in objects], [obj._data for obj in new_objects])
+        self.assertEqual(linked_data, new_objects[0]._linked_data)
+        self.assertIs(new_objects[0]._linked_data, new_objects[-1]._linked_data)
+        self.assertEqual(payload, self.model_klass.serialize_many(new_objects))
+
 
 class UnsupportedModelTestMixin(ModelTestMixin, ABC):
     def sample_data(self):
@@ -122,3 +186,23 @@ class UnsupportedModelTestMixin(ModelTestMixin, ABC):
                 self.model_klass.get(id=666)
 
         self.assertEqual(0, get.call_count)
+
+    def test_get_many(self):
+        with self.patch_get(resource=self.resource_key, data=self.sample_data(), many=False) as get:
+            with self.assertRaises(exceptions.UnsupportedModelException):
+                self.model_klass.get_many(ids=[42, 314])
+
+        self.assertEqual(0, get.call_count)
+
+    def test_get_many_batches(self):
+        self.test_get_many()
+
+    def test_get_many_fallback(self):
+        self.test_get_many()
+
+    def test_get_many_not_found(self):
+        with self.patch_get_error(status_code=404) as get:
+            with self.assertRaises(exceptions.UnsupportedModelException):
+                self.model_klass.get_many(ids=[666, 999])
+
+        self.assertEqual(0, get.call_count)
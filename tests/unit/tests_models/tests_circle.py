@@ -74,7 +74,7 @@ class TestCircleModel(ModelTestMixin, unittest.TestCase):
         circle = models.Circle(data=data)
 
         role_data = [{'id': 10}, {'id': 20}]
-        with self.patch_get(resource='roles', data=role_data, many=True) as get:
+        with self.patch_get(resource='roles', data=role_data, many=False) as get:
             roles = list(circle.roles)
 
         self.assertEqual(2, len(roles))
@@ -82,7 +82,21 @@ class TestCircleModel(ModelTestMixin, unittest.TestCase):
         self.assertEqual(10, role_a.id)
         self.assertEqual(20, role_b.id)
 
-        self.assertEqual(2, get.call_count)
+        get.assert_called_once_with(resource='roles', id='10,20')
+
+    def test_fields_roles_next(self):
+        data = self.sample_data()[0]
+        circle = models.Circle(data=data)
+
+        role_data = [{'id': 10}, {'id': 20}]
+        with self.patch_get(resource='roles', data=role_data, many=False) as get:
+            roles = circle.roles
+            first = next(roles)
+            rest = list(roles)
+
+        self.assertEqual(10, first.id)
+        self.assertEqual([20], [role.id for role in rest])
+        get.assert_called_once_with(resource='roles', id='10,20')
 
     def test_fields_policies(self):
         data = self.sample_data()[0]
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch
+
+from glassfrog import models
+
+
+class TestLinkedData(unittest.TestCase):
+    def sample_data(self):
+        return {
+            'domains': [
+                {'id': 1000, 'description': 'potato 1000'},
+                {'id': 2000, 'description': 'potato 2000'},
+            ],
+            'accountabilities': [
+                {'id': 1000, 'description': 'tomato 1000'},
+            ],
+        }
+
+    def test_find(self):
+        linked_data = models.LinkedData(self.sample_data())
+
+        self.assertEqual('potato 2000', linked_data.find('domains', 2000)['description'])
+        self.assertEqual('tomato 1000', linked_data.find('accountabilities', 1000)['description'])
+        self.assertIsNone(linked_data.find('accountabilities', 2000))
+        self.assertIsNone(linked_data.find('policies', 1000))
+
+    def test_behaves_as_dict(self):
+        sample = self.sample_data()
+        linked_data = models.LinkedData(sample)
+
+        self.assertEqual(sample, linked_data)
+        self.assertEqual(sample['domains'], linked_data['domains'])
+
+    def test_coerce(self):
+        linked_data = models.LinkedData(self.sample_data())
+
+        self.assertIs(linked_data, models.LinkedData.coerce(linked_data))
+        self.assertIsNone(models.LinkedData.coerce(None))
+        self.assertIsInstance(models.LinkedData.coerce(self.sample_data()), models.LinkedData)
+
+    def test_shared_by_list_response(self):
+        response = {
+            'roles': [
+                {'id': 1, 'links': {'domains': [1000]}},
+                {'id': 2, 'links': {'domains': [2000]}},
+            ],
+            'linked': self.sample_data(),
+        }
+        with patch('glassfrog.client.GlassFrogClient.get', return_value=response):
+            role_a, role_b = models.Role.list()
+
+        self.assertIs(role_a._linked_data, role_b._linked_data)
+        [domain] = role_b.domains
+        self.assertEqual('potato 2000', domain.description)
+
+    def test_build_without_linked_resource(self):
+        obj = models.Policy.build(id=100, linked_data=self.sample_data())
+
+        self.assertEqual({'id': 100}, obj._data)
@@ -68,7 +68,7 @@ class TestPersonModel(ModelTestMixin, unittest.TestCase):
         person = models.Person(data=data)
 
         circle_data = [{'id': 100}, {'id': 200}]
-        with self.patch_get(resource='circles', data=circle_data, many=True) as get:
+        with self.patch_get(resource='circles', data=circle_data, many=False) as get:
             circles = list(person.circles)
 
         self.assertEqual(2, len(circles))
@@ -76,7 +76,7 @@ class TestPersonModel(ModelTestMixin, unittest.TestCase):
         self.assertEqual(100, circle_a.id)
         self.assertEqual(200, circle_b.id)
 
-        self.assertEqual(2, get.call_count)
+        get.assert_called_once_with(resource='circles', id='100,200')
 
     def test_fields_assignments(self):
         data = self.sample_data()[0]
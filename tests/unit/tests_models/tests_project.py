@@ -1,5 +1,6 @@
 import unittest
 from datetime import datetime, timezone
+from unittest.mock import patch
 
 from glassfrog import models
 from tests.unit.tests_models import UnsupportedModelTestMixin
@@ -83,6 +84,19 @@ class TestProjectModel(UnsupportedModelTestMixin, unittest.TestCase):
 
         self.assertEqual(None, project.archived_at)
 
+    def test_fields_parsed_once(self):
+        data = self.sample_data()[0]
+        project = models.Project(data=data)
+
+        with patch('glassfrog.models.datetime', wraps=datetime) as parser:
+            created_at = project.created_at
+            self.assertIs(created_at, project.created_at)
+            self.assertIs(project.archived_at, project.archived_at)
+
+        self.assertEqual(2, parser.strptime.call_count)
+        self.assertEqual(datetime(2016, 11, 6, 18, 51, 12, tzinfo=timezone.utc), created_at)
+        self.assertIs(created_at, project._created_at)  # its own slot, no per-instance dict
+
     def test_fields_person(self):
         data = self.sample_data()[0]
         project = models.Project(data=data)
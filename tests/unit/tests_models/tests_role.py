@@ -157,7 +157,7 @@ class TestRoleModel(ModelTestMixin, unittest.TestCase):
         role = models.Role(data=data)
 
         people_data = [{'id': 100000}, {'id': 200000}]
-        with self.patch_get(resource='people', data=people_data, many=True) as get:
+        with self.patch_get(resource='people', data=people_data, many=False) as get:
             people = list(role.people)
 
         self.assertEqual(2, len(people))
@@ -165,7 +165,7 @@ class TestRoleModel(ModelTestMixin, unittest.TestCase):
         self.assertEqual(100000, person_a.id)
         self.assertEqual(200000, person_b.id)
 
-        self.assertEqual(2, get.call_count)
+        get.assert_called_once_with(resource='people', id='100000,200000')
 
     def test_fields_assignments(self):
         data = self.sample_data()[0]
@@ -195,3 +195,9 @@ class TestRoleModel(ModelTestMixin, unittest.TestCase):
 
         election = role.elected_until
         self.assertIsNone(election)
+
+    def test_fields_elected_null(self):
+        data = dict(self.sample_data()[0], elected_until=None)
+        role = models.Role(data=data)
+
+        self.assertIsNone(role.elected_until)
@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import patch
+
+import glassfrog
+from glassfrog import models
+from glassfrog.prefetch import Prefetch
+from tests.unit.tests_client import LocalServerTestMixin
+
+
+class TestPrefetch(LocalServerTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        token_patcher = patch('glassfrog.client.GlassFrogClient._TOKEN', '42')
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
+
+        self.routes.update({
+            '/circles': {'circles': [
+                {'id': 1, 'name': 'GCC', 'links': {'roles': [10, 11], 'policies': [500], 'supported_role': None}},
+                {'id': 2, 'name': 'Sales', 'links': {'roles': [20], 'policies': [], 'supported_role': 11}},
+            ], 'linked': {'policies': [{'id': 500, 'title': 'No potatoes', 'body': 'Really'}]}},
+            '/circles/2': {'circles': [
+                {'id': 2, 'name': 'Sales', 'links': {'roles': [20], 'policies': [500], 'supported_role': 11}},
+            ], 'linked': {'policies': [{'id': 500, 'title': 'No potatoes', 'body': 'Really'}]}},
+            '/roles/10,11,20': {'roles': [
+                {'id': 10, 'name': 'Lead', 'links': {'circle': 1, 'people': [100]}},
+                {'id': 11, 'name': 'Sales', 'links': {'circle': 1, 'people': []}},
+                {'id': 20, 'name': 'Seller', 'links': {'circle': 2, 'people': [100, 101]}},
+            ]},
+            '/roles/10,11': {'roles': [
+                {'id': 10, 'name': 'Lead', 'links': {'circle': 1, 'people': [100]}},
+                {'id': 11, 'name': 'Sales', 'links': {'circle': 1, 'people': []}},
+            ]},
+            '/roles/20,11': {'roles': [
+                {'id': 20, 'name': 'Seller', 'links': {'circle': 2, 'people': [100, 101]}},
+                {'id': 11, 'name': 'Sales', 'links': {'circle': 1, 'people': []}},
+            ]},
+            '/people/100': {'people': [{'id': 100, 'name': 'Chuck', 'links': {'circles': [1, 2]}}]},
+            '/roles/20': {'roles': [
+                {'id': 20, 'name': 'Seller', 'links': {'circle': 2, 'people': [100, 101]}},
+            ]},
+            '/people/100,101': {'people': [
+                {'id': 100, 'name': 'Chuck', 'links': {'circles': [1, 2]}},
+                {'id': 101, 'name': 'Justin', 'links': {'circles': [2]}},
+            ]},
+            '/roles/10/assignments': {'assignments': [{'id': 1000, 'links': {'person': 100, 'role': 10}}]},
+            '/roles/11/assignments': {'assignments': []},
+            '/roles/20/assignments': {'assignments': [
+                {'id': 1001, 'links': {'person': 100, 'role': 20}},
+                {'id': 1002, 'links': {'person': 101, 'role': 20}},
+            ]},
+        })
+
+    def traverse(self, circles):
+        return [
+            (circle.name, role.name, person.name)
+            for circle in circles
+            for role in circle.roles
+            for person in role.people
+        ]
+
+    def test_list_prefetch(self):
+        prefetch = Prefetch('roles', 'roles.people')
+        circles = list(models.Circle.list(prefetch=prefetch))
+        self.assertEqual(['/circles', '/roles/10,11,20', '/people/100,101'], self.requested_paths)
+        self.assertEqual(2, prefetch.request_count)
+
+        rows = self.traverse(circles)
+
+        self.assertEqual(
+            [('GCC', 'Lead', 'Chuck'), ('Sales', 'Seller', 'Chuck'), ('Sales', 'Seller', 'Justin')],
+            rows,
+        )
+        self.assertEqual(3, len(self.requested_paths))
+
+    def test_list_prefetch_without_prefetch(self):
+        circles = list(models.Circle.list())
+        self.traverse(circles)
+
+        self.assertEqual(
+            ['/circles', '/roles/10,11', '/people/100', '/roles/20', '/people/100,101'],
+            self.requested_paths,
+        )
+
+    def test_get_prefetch(self):
+        prefetch = Prefetch('roles.people', 'supported_role', 'policies')
+        circle = models.Circle.get(id=2, prefetch=prefetch)
+
+        self.assertEqual('Sales', circle.supported_role.name)
+        self.assertEqual(['Seller'], [role.name for role in circle.roles])
+        self.assertEqual(['No potatoes'], [policy.title for policy in circle.policies])
+        self.assertEqual(['/circles/2', '/roles/20,11', '/people/100,101'], self.requested_paths)
+        self.assertEqual(2, prefetch.request_count)
+
+    def test_prefetch_details(self):
+        prefetch = Prefetch('roles.assignments.person')
+        with glassfrog.link_workers(3):
+            circles = list(models.Circle.list(prefetch=prefetch))
+        self.assertEqual(5, prefetch.request_count)
+
+        assignments = [
+            (role.name, assignment.person.name)
+            for circle in circles
+            for role in circle.roles
+            for assignment in role.assignments
+        ]
+
+        self.assertEqual([('Lead', 'Chuck'), ('Seller', 'Chuck'), ('Seller', 'Justin')], assignments)
+        self.assertEqual(6, len(self.requested_paths))
+
+    def test_prefetch_in_session(self):
+        with glassfrog.session() as current:
+            circles = list(models.Circle.list(prefetch=['roles']))
+            self.assertIn(circles[0], current)
+            self.assertIs(models.Role.get(id=10), next(iter(circles[0].roles)))
+
+        self.assertEqual(['/circles', '/roles/10,11,20'], self.requested_paths)
+
+    def test_prefetch_string(self):
+        [circle, _] = models.Circle.list(prefetch='roles')
+
+        self.assertEqual(['Lead', 'Sales'], [role.name for role in circle.roles])
+        self.assertEqual(['/circles', '/roles/10,11,20'], self.requested_paths)
+
+    def test_unknown_relationship(self):
+        with self.assertRaises(AttributeError):
+            list(models.Circle.list(prefetch=['name']))
+        with self.assertRaises(AttributeError):
+            list(models.Circle.list(prefetch=['potato']))
+
+
+class TestRelationship(unittest.TestCase):
+    def test_describe(self):
+        self.assertEqual(('roles', models.Role, True), models.Circle._relationship('roles'))
+        self.assertEqual(('supported_role', models.Role, False), models.Circle._relationship('supported_role'))
+        self.assertEqual((None, models.Project, True), models.Circle._relationship('projects'))
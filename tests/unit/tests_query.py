@@ -0,0 +1,180 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+import glassfrog
+from glassfrog import exceptions, models, snapshot
+from glassfrog.indexes import FieldIndexes
+
+
+def roles_response():
+    return {
+        'roles': [
+            {'id': 1, 'name': 'Secretary', 'is_core': True, 'elected_until': '2024-05-01', 'links': {'circle': 10}},
+            {'id': 2, 'name': 'Lead Link', 'is_core': True, 'elected_until': None, 'links': {'circle': 10}},
+            {'id': 3, 'name': 'Writer', 'is_core': False, 'elected_until': '2023-01-01', 'links': {'circle': 10}},
+            {'id': 4, 'name': 'Designer', 'is_core': False, 'elected_until': '2025-01-01', 'links': {'circle': 20}},
+            {'id': 5, 'name': 'Analyst', 'is_core': False, 'elected_until': None, 'links': {'circle': 10}},
+        ],
+    }
+
+
+def field_indexes(*values):
+    # Over roles 1, 2, ... holding the values in turn
+    return FieldIndexes.from_models(models.Role(data={'id': id, 'value': value}) for id, value in enumerate(values, 1))
+
+
+class TestQuery(unittest.TestCase):
+    def patch_get(self):
+        return patch('glassfrog.client.GlassFrogClient.get', side_effect=lambda resource: roles_response())
+
+    def test_where(self):
+        with self.patch_get(), glassfrog.session():
+            query = models.Role.query().where(is_core=False, circle=10)
+
+            self.assertEqual(query.ids(), [3, 5])
+            self.assertEqual([role.name for role in query], ['Writer', 'Analyst'])
+            self.assertEqual(query.where(name='Writer').count(), 1)
+            self.assertEqual(models.Role.query().where(name='Nobody').all(), [])
+
+    def test_model_operands(self):
+        circle = models.Circle(data={'id': 20})
+        with self.patch_get(), glassfrog.session():
+            self.assertEqual(models.Role.query().where(circle=circle).ids(), [4])
+            self.assertEqual(models.Role.query().where(circle__in=[circle, 30]).ids(), [4])
+
+    def test_ranges(self):
+        with self.patch_get(), glassfrog.session():
+            query = models.Role.query()
+
+            self.assertEqual(query.where(elected_until__gte=date(2024, 5, 1)).ids(), [1, 4])
+            self.assertEqual(query.where(elected_until__gt=date(2024, 5, 1)).ids(), [4])
+            self.assertEqual(query.where(elected_until__lt=date(2024, 5, 1)).ids(), [3])
+            self.assertEqual(query.where(elected_until__lte='2024-05-01', is_core=True).ids(), [1])
+            self.assertEqual(query.where(elected_until=None).ids(), [2, 5])
+
+    def test_order_by(self):
+        with self.patch_get(), glassfrog.session():
+            self.assertEqual(models.Role.query().order_by('name').ids(), [5, 4, 2, 1, 3])
+            self.assertEqual(models.Role.query().order_by('-elected_until').ids(), [4, 1, 3, 2, 5])
+            self.assertEqual(models.Role.query().order_by('is_core', '-name').ids(), [3, 4, 5, 1, 2])
+            self.assertEqual(models.Role.query().where(circle=10).order_by('name').first().name, 'Analyst')
+
+    def test_indexes_are_reused(self):
+        with self.patch_get() as get, glassfrog.session() as session:
+            models.Role.query().where(is_core=True).ids()
+            models.Role.query().where(is_core=False).order_by('name').ids()
+            indexes = session.query_indexes(models.Role)
+
+            self.assertEqual(get.call_count, 1)
+            self.assertIs(indexes.hash('is_core'), indexes.hash('is_core'))
+            circles = indexes.hash('circle')
+
+            with patch('glassfrog.client.GlassFrogClient.get', return_value={
+                'roles': [{'id': 6, 'name': 'Coach', 'is_core': False, 'links': {'circle': 20}}],
+            }):
+                models.Role.get(id=6)
+
+            self.assertEqual(models.Role.query().where(circle=20).ids(), [4, 6])
+            self.assertEqual(get.call_count, 1)
+            self.assertIs(indexes.hash('circle'), circles)  # updated, not rebuilt
+
+    def test_without_session(self):
+        with self.patch_get() as get:
+            query = models.Role.query().where(is_core=True)
+
+            self.assertEqual([role.id for role in query], [1, 2])
+            self.assertEqual(query.count(), 2)
+            self.assertEqual(get.call_count, 1)
+
+    def test_without_session_derived_queries(self):
+        with self.patch_get() as get:
+            roles = models.Role.query()
+            core = roles.where(is_core=True)
+
+            self.assertEqual(core.ids(), [1, 2])
+            self.assertEqual(core.order_by('name').ids(), [2, 1])
+            self.assertEqual(roles.where(is_core=False).where(circle=10).ids(), [3, 5])
+            self.assertEqual(get.call_count, 1)
+
+    def test_unknown_lookup(self):
+        with self.assertRaises(ValueError):
+            models.Role.query().where(name__like='Sec')
+
+    def test_snapshot(self):
+        org_snapshot = snapshot.OrganizationSnapshot(records={
+            'roles': {role['id']: role for role in roles_response()['roles']},
+        })
+        with patch('glassfrog.client.GlassFrogClient.get', side_effect=AssertionError("unexpected request")):
+            with org_snapshot.activate():
+                roles = models.Role.query().where(circle=10).order_by('-name').all()
+
+        self.assertEqual([role.id for role in roles], [3, 1, 2, 5])
+        self.assertIs(roles[0], org_snapshot.lookup(models.Role, 3))
+
+
+class TestFieldIndexes(unittest.TestCase):
+    def test_list_values(self):
+        indexes = FieldIndexes(records={
+            1: {'id': 1, 'links': {'people': [100, 101]}},
+            2: {'id': 2, 'links': {'people': [101]}},
+        })
+
+        self.assertEqual(indexes.hash('people'), {100: [1], 101: [1, 2]})
+        self.assertEqual(indexes.sorted('people'), ([], []))
+
+    def test_ranks(self):
+        indexes = FieldIndexes(records={
+            1: {'id': 1, 'value': 3},
+            2: {'id': 2, 'value': 1},
+            3: {'id': 3, 'value': 3},
+            4: {'id': 4, 'value': None},
+        })
+
+        self.assertEqual(indexes.sorted('value'), ([1, 3, 3], [2, 1, 3]))
+        self.assertEqual(indexes.ranks('value'), {2: 0, 1: 1, 3: 1})
+
+    def test_add(self):
+        indexes = field_indexes(3, 1)
+        hashed, ranks = indexes.hash('value'), indexes.ranks('value')
+
+        indexes.add(models.Role(data={'id': 3, 'value': 3}))
+
+        self.assertIs(indexes.hash('value'), hashed)
+        self.assertEqual(hashed, {3: [1, 3], 1: [2]})
+        self.assertEqual(indexes.sorted('value'), ([1, 3, 3], [2, 1, 3]))
+        self.assertIs(indexes.ranks('value'), ranks)
+        self.assertEqual(ranks, {2: 0, 1: 1, 3: 1})
+
+        indexes.add(models.Role(data={'id': 4, 'value': 2}))
+
+        self.assertEqual(indexes.sorted('value'), ([1, 2, 3, 3], [2, 4, 1, 3]))
+        self.assertEqual(indexes.ranks('value'), {2: 0, 4: 1, 1: 2, 3: 2})
+
+    def test_add_new_version(self):
+        indexes = field_indexes(3, 1)
+        indexes.hash('value')
+        indexes.ranks('value')
+
+        indexes.add(models.Role(data={'id': 1, 'value': 0}))
+
+        self.assertEqual(indexes.hash('value'), {1: [2], 0: [1]})
+        self.assertEqual(indexes.sorted('value'), ([0, 1], [1, 2]))
+        self.assertEqual(indexes.ranks('value'), {1: 0, 2: 1})
+        self.assertEqual(indexes.ids(), [1, 2])
+
+    def test_add_unorderable(self):
+        indexes = field_indexes(3)
+        indexes.sorted('value')
+
+        indexes.add(models.Role(data={'id': 2, 'value': 'three'}))
+
+        self.assertEqual(indexes.hash('value'), {3: [1], 'three': [2]})
+        with self.assertRaises(exceptions.UnexpectedDataFormat):
+            indexes.sorted('value')
+
+    def test_unorderable(self):
+        indexes = FieldIndexes(records={1: {'id': 1, 'value': 3}, 2: {'id': 2, 'value': 'three'}})
+
+        with self.assertRaises(exceptions.UnexpectedDataFormat):
+            indexes.sorted('value')
@@ -0,0 +1,172 @@
+import json
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import httpretty
+import requests
+
+from glassfrog import client, ratelimit
+from tests.unit.tests_client import HTTPPrettyTestMixin
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.time = FakeTime()
+
+    def limiter(self, **kwargs):
+        kwargs.setdefault('jitter', lambda: 1)
+        return ratelimit.RateLimiter(clock=self.time.clock, sleep=self.time.sleep, **kwargs)
+
+    def test_unlimited(self):
+        limiter = self.limiter()
+
+        for _ in range(100):
+            limiter.acquire()
+        self.assertEqual(self.time.sleeps, [])
+        self.assertIsNone(limiter.remaining)
+
+    def test_token_bucket(self):
+        limiter = self.limiter(rate=2, burst=4)
+
+        for _ in range(4):
+            limiter.acquire()
+        self.assertEqual(limiter.remaining, 0)
+        self.assertEqual(self.time.sleeps, [])
+
+        limiter.acquire()
+        self.assertEqual(self.time.sleeps, [0.5])
+
+        self.time.now += 10
+        self.assertEqual(limiter.remaining, 4)
+
+    def test_server_budget(self):
+        limiter = self.limiter()
+        limiter.update({'X-RateLimit-Limit': '100', 'X-RateLimit-Remaining': '2', 'X-RateLimit-Reset': '30'})
+
+        self.assertEqual(limiter.limit, 100)
+        self.assertEqual(limiter.remaining, 2)
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(limiter.remaining, 0)
+
+        limiter.acquire()  # waits for the window to reset
+        self.assertEqual(self.time.sleeps, [30])
+        self.assertIsNone(limiter.remaining)
+
+    def test_reset_as_timestamp(self):
+        limiter = self.limiter()
+
+        with patch('time.time', return_value=1600000000):
+            limiter.update({'RateLimit-Remaining': '0', 'RateLimit-Reset': '1600000005'})
+        limiter.acquire()
+
+        self.assertEqual(self.time.sleeps, [5])
+
+    def test_retry_after(self):
+        responses = [FakeResponse(429, {'Retry-After': '3'}), FakeResponse(200)]
+        limiter = self.limiter()
+
+        response = limiter.call(lambda: responses.pop(0))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.time.sleeps, [3])
+
+    def test_retry_after_date(self):
+        now = datetime(2015, 10, 21, 7, 28, tzinfo=timezone.utc)
+
+        self.assertEqual(ratelimit.parse_retry_after('Wed, 21 Oct 2015 07:28:05 GMT', now=now), 5)
+        self.assertIsNone(ratelimit.parse_retry_after('soon'))
+        self.assertIsNone(ratelimit.parse_retry_after(None))
+
+    def test_backoff_on_server_errors(self):
+        responses = [FakeResponse(503), FakeResponse(502), FakeResponse(200)]
+        limiter = self.limiter(backoff=1)
+
+        self.assertEqual(limiter.call(lambda: responses.pop(0)).status_code, 200)
+        self.assertEqual(self.time.sleeps, [1, 2])
+
+    def test_backoff_jitter(self):
+        limiter = self.limiter(backoff=1, max_backoff=5, jitter=lambda: 0.5)
+
+        self.assertEqual([limiter.backoff_delay(attempt) for attempt in range(5)], [0.5, 1, 2, 2.5, 2.5])
+
+    def test_no_retry_on_client_errors(self):
+        responses = [FakeResponse(404), FakeResponse(200)]
+        limiter = self.limiter()
+
+        self.assertEqual(limiter.call(lambda: responses.pop(0)).status_code, 404)
+        self.assertEqual(self.time.sleeps, [])
+
+    def test_gives_up(self):
+        responses = [FakeResponse(500) for _ in range(3)]
+        limiter = self.limiter(max_retries=2)
+
+        response = limiter.call(lambda: responses.pop(0))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(response.closed)
+        self.assertEqual(responses, [])
+
+    def test_connection_errors(self):
+        attempts = []
+
+        def send():
+            attempts.append(1)
+            raise requests.ConnectionError()
+
+        with self.assertRaises(requests.ConnectionError):
+            self.limiter(max_retries=2).call(send, retry_on=(requests.ConnectionError,))
+        self.assertEqual(len(attempts), 3)
+
+
+class TestGlassFrogClientRateLimit(HTTPPrettyTestMixin, unittest.TestCase):
+    API_URL = 'https://api.glassfrog.com/api/v3'
+
+    def setUp(self):
+        self.time = FakeTime()
+        limiter = ratelimit.RateLimiter(clock=self.time.clock, sleep=self.time.sleep)
+        client.GlassFrogClient.set_rate_limiter(limiter)
+        self.addCleanup(client.GlassFrogClient.set_rate_limiter, ratelimit.RateLimiter())
+
+        token_patcher = patch('glassfrog.client.GlassFrogClient._TOKEN', '42')
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
+
+    @httpretty.activate
+    def test_throttled(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            f'{self.API_URL}/potato',
+            responses=[
+                httpretty.Response(body='', status=429, adding_headers={'Retry-After': '2'}),
+                httpretty.Response(body=json.dumps({'answer': 42}), adding_headers={'X-RateLimit-Remaining': '7'}),
+            ],
+        )
+
+        self.assertEqual({'answer': 42}, client.GlassFrogClient.get(resource='potato'))
+        self.assertEqual(self.time.sleeps, [2])
+        self.assertEqual(client.GlassFrogClient.remaining_requests(), 7)
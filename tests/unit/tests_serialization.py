@@ -0,0 +1,80 @@
+import json
+import unittest
+
+from glassfrog import exceptions, models, serialization
+
+
+def linked():
+    return models.LinkedData({
+        'people': [{'id': 101, 'name': 'Justin'}, {'id': 100, 'name': 'Chuck'}],
+        'circles': [{'id': 1, 'name': 'GCC'}],
+    })
+
+
+class TestSerializeMany(unittest.TestCase):
+    def test_linked_entities_written_once(self):
+        linked_data = linked()
+        roles = [models.Role(data={'id': id, 'links': {'people': [100]}}, linked_data=linked_data) for id in range(50)]
+
+        payload = models.Role.serialize_many(roles)
+        decoded = json.loads(payload)
+
+        self.assertEqual(decoded['refs'], [0] * 50)
+        self.assertEqual(decoded['sets'], [{'circles': [0], 'people': [1, 0]}])  # positions in `linked`
+        self.assertEqual([item['id'] for item in decoded['linked']['people']], [100, 101])
+        self.assertEqual(payload.count(b'Justin'), 1)
+        self.assertLess(len(payload), len(json.dumps([role.serialize() for role in roles])) / 3)
+
+    def test_distinct_linked_data(self):
+        other = models.LinkedData({'people': [{'id': 100, 'name': 'Chuck'}]})
+        roles = [
+            models.Role(data={'id': 1}, linked_data=linked()),
+            models.Role(data={'id': 2}, linked_data=linked()),  # equal content, another instance
+            models.Role(data={'id': 3}, linked_data=other),
+            models.Role(data={'id': 4}),
+        ]
+
+        payload = models.Role.serialize_many(roles)
+        new_roles = models.Role.deserialize_many(payload)
+
+        self.assertEqual(json.loads(payload)['refs'], [0, 0, 1, None])
+        self.assertEqual(payload.count(b'Chuck'), 1)
+        self.assertIs(new_roles[0]._linked_data, new_roles[1]._linked_data)
+        self.assertEqual(new_roles[2]._linked_data, other)
+        self.assertIsNone(new_roles[3]._linked_data)
+        self.assertEqual(new_roles[0]._linked_data.find('people', 101), {'id': 101, 'name': 'Justin'})
+
+    def test_conflicting_versions(self):
+        roles = [
+            models.Role(data={'id': 1}, linked_data={'domains': [{'id': 5, 'description': 'old'}]}),
+            models.Role(data={'id': 2}, linked_data={'domains': [{'id': 5, 'description': 'new'}]}),
+            models.Role(data={'id': 3}, linked_data={'domains': [{'id': 5, 'description': 'old'}]}),
+        ]
+
+        payload = models.Role.serialize_many(roles)
+        new_roles = models.Role.deserialize_many(payload)
+
+        self.assertEqual(
+            [role._linked_data.find('domains', 5)['description'] for role in new_roles],
+            ['old', 'new', 'old'],
+        )
+        self.assertEqual(payload.count(b'"old"'), 1)
+        self.assertIs(new_roles[0]._linked_data, new_roles[2]._linked_data)
+
+    def test_byte_stable(self):
+        roles = [models.Role(data={'name': 'Ü', 'id': 1}, linked_data=linked())]
+        reordered = [models.Role(data={'id': 1, 'name': 'Ü'}, linked_data=linked())]
+
+        self.assertEqual(models.Role.serialize_many(roles), models.Role.serialize_many(reordered))
+        self.assertIn('Ü'.encode('utf-8'), models.Role.serialize_many(roles))
+
+    def test_wrong_resource(self):
+        payload = models.Role.serialize_many([models.Role(data={'id': 1})])
+
+        with self.assertRaises(exceptions.UnexpectedDataFormat):
+            models.Circle.deserialize_many(payload)
+
+    def test_invalid_payload(self):
+        for payload in (b'not json', b'[]', b'{"version": 99}'):
+            with self.assertRaises(exceptions.UnexpectedDataFormat):
+                serialization.decode(payload)
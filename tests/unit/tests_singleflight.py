@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from glassfrog import aio, client
+from glassfrog.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def run_concurrently(self, flight, key, func, count=5):
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(flight.do(key, func))
+            except ValueError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_coalesces_concurrent_calls(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait()
+            return {'answer': 42}
+
+        threads, results, _ = self.run_concurrently(flight, 'key', fetch)
+        while flight.stats()['coalesced'] < 4:
+            release.wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'answer': 42}] * 5)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.stats(), {'executed': 1, 'coalesced': 4, 'in_flight': 0})
+
+    def test_shares_errors(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fetch():
+            release.wait()
+            raise ValueError('boom')
+
+        threads, _, errors = self.run_concurrently(flight, 'key', fetch, count=3)
+        while flight.stats()['coalesced'] < 2:
+            release.wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(flight.stats()['in_flight'], 0)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+
+        self.assertEqual(flight.do('key', lambda: 1), 1)
+        self.assertEqual(flight.do('key', lambda: 2), 2)
+        self.assertEqual(flight.stats(), {'executed': 2, 'coalesced': 0, 'in_flight': 0})
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    def test_coalesces_concurrent_calls(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 42
+
+        async def run():
+            return await asyncio.gather(*(flight.do('key', fetch) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(run()), [42] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats(), {'executed': 1, 'coalesced': 4, 'in_flight': 0})
+
+
+class TestClientCoalescing(unittest.TestCase):
+    def setUp(self):
+        token_patcher = patch('glassfrog.client.GlassFrogClient._TOKEN', '42')
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
+
+    def test_sync(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fetch(url, event=None):  # pylint: disable=unused-argument
+            release.wait()
+            return {'url': url}, 10
+
+        results = []
+        with patch.object(client.GlassFrogClient, '_single_flight', flight), \
+                patch.object(client.GlassFrogClient, '_fetch', side_effect=fetch) as fetch_mock:
+            threads = [
+                threading.Thread(target=lambda: results.append(client.GlassFrogClient.get(resource='circles', id=1)))
+                for _ in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            while client.GlassFrogClient.coalescing_stats()['coalesced'] < 2:
+                release.wait(0.01)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(fetch_mock.call_count, 1)
+        self.assertEqual(len(results), 3)
+
+    def test_async(self):
+        async def fetch(url, headers, event=None):  # pylint: disable=unused-argument
+            await asyncio.sleep(0.01)
+            return {'url': url}, 10
+
+        async def run():
+            return await asyncio.gather(*(aio.AsyncGlassFrogClient.get(resource='circles', id=1) for _ in range(3)))
+
+        with patch.object(aio.AsyncGlassFrogClient, '_single_flight', AsyncSingleFlight()), \
+                patch.object(aio.AsyncGlassFrogClient, '_fetch', side_effect=fetch) as fetch_mock:
+            results = asyncio.run(run())
+            stats = aio.AsyncGlassFrogClient.coalescing_stats()
+
+        self.assertEqual(fetch_mock.call_count, 1)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(stats['coalesced'], 2)
@@ -0,0 +1,230 @@
+import os
+import struct
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from glassfrog import exceptions, identity, models, snapshot, storage
+
+
+def sample_org():
+    return {
+        'circles': {
+            'circles': [
+                {'id': 1, 'name': 'GCC', 'links': {'roles': [10, 11], 'supported_role': None, 'policies': [500]}},
+                {'id': 2, 'name': 'Sales', 'links': {'roles': [20], 'supported_role': 11, 'policies': []}},
+            ],
+            'linked': {'policies': [{'id': 500, 'title': 'No potatoes', 'body': 'Really'}]},
+        },
+        'roles': {
+            'roles': [
+                {'id': 10, 'name': 'Lead', 'links': {'circle': 1, 'people': [100], 'domains': [900]}},
+                {
+                    'id': 11,
+                    'name': 'Sales',
+                    'links': {'circle': 1, 'supporting_circle': 2, 'people': [], 'domains': []},
+                },
+                {'id': 20, 'name': 'Seller', 'links': {'circle': 2, 'people': [100, 101], 'domains': []}},
+            ],
+            'linked': {'domains': [{'id': 900, 'description': 'Everything'}]},
+        },
+        'people': {
+            'people': [
+                {'id': 100, 'name': 'Chuck', 'links': {'circles': [1, 2]}},
+                {'id': 101, 'name': 'Justin', 'links': {'circles': [2]}},
+            ],
+        },
+        'assignments': {
+            'assignments': [
+                {'id': 1000, 'links': {'person': 100, 'role': 10}},
+                {'id': 1001, 'links': {'person': 100, 'role': 20}},
+                {'id': 1002, 'links': {'person': 101, 'role': 20}},
+            ],
+        },
+    }
+
+
+class TestOrganizationSnapshot(unittest.TestCase):
+    def load(self):
+        org = sample_org()
+        with patch('glassfrog.client.GlassFrogClient.get', side_effect=lambda resource: org[resource]) as get:
+            org_snapshot = snapshot.OrganizationSnapshot.load()
+        self.assertEqual(4, get.call_count)
+        return org_snapshot
+
+    def patch_network(self):
+        return patch('glassfrog.client.GlassFrogClient.get', side_effect=AssertionError("unexpected request"))
+
+    def test_load(self):
+        org_snapshot = self.load()
+
+        self.assertEqual(['GCC', 'Sales'], [circle.name for circle in org_snapshot.circles])
+        self.assertEqual([10, 11, 20], [role.id for role in org_snapshot.roles])
+        self.assertEqual([100, 101], [person.id for person in org_snapshot.people])
+        self.assertEqual([1000, 1001, 1002], [assignment.id for assignment in org_snapshot.assignments])
+
+    def test_navigation_without_requests(self):
+        org_snapshot = self.load()
+
+        with self.patch_network():
+            gcc, sales = org_snapshot.circles
+            self.assertEqual(['Lead', 'Sales'], [role.name for role in gcc.roles])
+            self.assertEqual(['Chuck', 'Justin'], [person.name for role in sales.roles for person in role.people])
+            self.assertEqual('No potatoes', next(iter(gcc.policies)).title)
+            self.assertIsNone(gcc.supported_role)
+            self.assertIs(sales.supported_role.supporting_circle, sales)
+
+            lead = org_snapshot.lookup(models.Role, 10)
+            self.assertIs(lead.circle, gcc)
+            self.assertEqual(['Everything'], [domain.description for domain in lead.domains])
+
+            chuck = org_snapshot.lookup(models.Person, 100)
+            self.assertEqual([gcc, sales], list(chuck.circles))
+            self.assertEqual([1000, 1001], [assignment.id for assignment in chuck.assignments])
+
+            [assignment] = lead.assignments
+            self.assertIs(assignment.person, chuck)
+            self.assertIs(assignment.role, lead)
+
+    def test_shared_instances(self):
+        org_snapshot = self.load()
+
+        with self.patch_network():
+            people = [person for role in org_snapshot.roles for person in role.people]
+
+        self.assertIs(people[0], people[1])
+        self.assertEqual(3, len(people))
+
+    def test_activate(self):
+        org_snapshot = self.load()
+
+        with self.patch_network():
+            with org_snapshot.activate():
+                self.assertIs(org_snapshot, identity.Session.current())
+                role = models.Role.get(id=20)
+                self.assertEqual([20], [role.id for role in models.Role.get_many(ids=[20, 666])])
+                self.assertEqual(['GCC', 'Sales'], [circle.name for circle in models.Circle.list()])
+
+                with self.assertRaises(exceptions.DoesNotExist):
+                    models.Role.get(id=666)
+
+        self.assertIs(role, org_snapshot.lookup(models.Role, 20))
+
+    def test_reverse_indexes(self):
+        org_snapshot = self.load()
+
+        with self.patch_network():
+            chuck = org_snapshot.lookup(models.Person, 100)
+            self.assertEqual([10, 20], [role.id for role in org_snapshot.related('person_roles', chuck)])
+            self.assertEqual([1000, 1001], [item.id for item in org_snapshot.related('person_assignments', 100)])
+            self.assertEqual(['Sales'], [circle.name for circle in org_snapshot.related('circle_children', 1)])
+            self.assertEqual([10], [role.id for role in org_snapshot.related('domain_roles', 900)])
+            self.assertEqual([], org_snapshot.related('circle_children', 2))
+
+    def test_circle_tree(self):
+        org_snapshot = self.load()
+
+        with self.patch_network():
+            tree = org_snapshot.circle_tree
+
+        self.assertIs(tree, org_snapshot.circle_tree)
+        self.assertEqual(tree.subtree(1), [1, 2])
+        self.assertEqual(tree.ancestors(2), [1])
+        self.assertEqual(tree.roles_beneath(1), [10, 11, 20])
+
+    def test_unknown_link(self):
+        org_snapshot = snapshot.OrganizationSnapshot(records={
+            'roles': {10: {'id': 10, 'links': {'people': [100]}}},
+        })
+
+        with patch('glassfrog.client.GlassFrogClient.get', return_value={'people': [{'id': 100}]}) as get:
+            [person] = org_snapshot.lookup(models.Role, 10).people
+
+        self.assertEqual(100, person.id)
+        get.assert_called_once_with(resource='people', id=100)
+
+
+class TestOrganizationSnapshotFile(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, 'org.snapshot')
+
+        org = sample_org()
+        with patch('glassfrog.client.GlassFrogClient.get', side_effect=lambda resource: org[resource]):
+            self.org_snapshot = snapshot.OrganizationSnapshot.load()
+        self.org_snapshot.save(self.path)
+
+    def open(self, **kwargs):
+        org_snapshot = snapshot.OrganizationSnapshot.open(self.path, **kwargs)
+        self.addCleanup(org_snapshot.close)
+        return org_snapshot
+
+    def test_round_trip(self):
+        org_snapshot = self.open()
+
+        for model_klass in (models.Circle, models.Role, models.Person, models.Assignment):
+            expected = [obj._data for obj in self.org_snapshot.instances(model_klass)]
+            self.assertEqual(expected, [obj._data for obj in org_snapshot.instances(model_klass)])
+
+        with patch('glassfrog.client.GlassFrogClient.get', side_effect=AssertionError("unexpected request")):
+            lead = org_snapshot.lookup(models.Role, 10)
+            self.assertEqual('GCC', lead.circle.name)
+            self.assertEqual(['Everything'], [domain.description for domain in lead.domains])
+            self.assertEqual([1000], [assignment.id for assignment in lead.assignments])
+            self.assertIsNone(org_snapshot.lookup(models.Role, 666))
+
+    def test_values(self):
+        records = {7: {'id': 7, 'none': None, 'yes': True, 'no': False, 'pi': 3.14, 'negative': -42, 'text': 'çà'}}
+        storage.write(self.path, [(storage.LISTED, 'potatoes', records)])
+
+        stored = storage.MappedSnapshot(self.path)
+        self.addCleanup(stored.close)
+        self.assertEqual(1, len(stored.sections))
+        kind, name, section = stored.sections[0]
+
+        self.assertEqual((storage.LISTED, 'potatoes'), (kind, name))
+        self.assertEqual(records, dict(section))
+        with self.assertRaises(KeyError):
+            section['7']  # pylint: disable=pointless-statement
+
+    def test_unsupported_value(self):
+        with self.assertRaises(exceptions.UnexpectedDataFormat):
+            storage.write(self.path, [(storage.LISTED, 'potatoes', {1: {'id': 1, 'when': object()}})])
+
+    def test_decoded_lazily(self):
+        with patch.object(storage.MappedSnapshot, '_decode_record', autospec=True,
+                          side_effect=storage.MappedSnapshot._decode_record) as decode:
+            org_snapshot = self.open()
+            self.assertEqual(0, decode.call_count)
+
+            person = org_snapshot.lookup(models.Person, 101)
+            self.assertEqual('Justin', person.name)
+            self.assertEqual(1, decode.call_count)
+
+    def test_corrupted(self):
+        with open(self.path, 'r+b') as snapshot_file:
+            snapshot_file.seek(-1, os.SEEK_END)
+            last = snapshot_file.read(1)
+            snapshot_file.seek(-1, os.SEEK_END)
+            snapshot_file.write(bytes([last[0] ^ 0xFF]))
+
+        with self.assertRaises(exceptions.UnexpectedDataFormat):
+            self.open()
+        self.open(verify=False)
+
+    def test_unsupported_version(self):
+        with open(self.path, 'r+b') as snapshot_file:
+            snapshot_file.seek(4)
+            snapshot_file.write(struct.pack('<H', storage.VERSION + 1))
+
+        with self.assertRaises(exceptions.UnexpectedDataFormat):
+            self.open()
+
+    def test_not_a_snapshot(self):
+        for content in (b'', b'{"roles": []}', b'potato' * 10):
+            with open(self.path, 'wb') as snapshot_file:
+                snapshot_file.write(content)
+
+            with self.assertRaises(exceptions.UnexpectedDataFormat):
+                self.open()
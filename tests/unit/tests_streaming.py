@@ -0,0 +1,145 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from requests import HTTPError
+
+import glassfrog
+from glassfrog import exceptions
+from glassfrog.streaming import JSONStream, StreamedList
+from tests.unit.tests_client import LocalServerTestMixin
+
+
+def chunked(payload, size=3):
+    body = json.dumps(payload).encode()
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+class TestJSONStream(unittest.TestCase):
+    def test_events(self):
+        payload = {'meta': 12345, 'roles': [{'id': 1, 'name': 'Lead ✓'}, {'id': 2}], 'linked': {'circles': []}}
+
+        events = list(JSONStream(chunked(payload)).events(array_key='roles'))
+
+        self.assertEqual(events, [
+            ('member', 'meta', 12345),
+            ('item', {'id': 1, 'name': 'Lead ✓'}),
+            ('item', {'id': 2}),
+            ('member', 'linked', {'circles': []}),
+        ])
+
+    def test_empty(self):
+        self.assertEqual(list(JSONStream([b'{}']).events(array_key='roles')), [])
+        self.assertEqual(list(JSONStream([b' {"roles": [ ]} ']).events(array_key='roles')), [])
+
+    def test_large_value(self):
+        payload = {'roles': [{'id': 1, 'purpose': 'x' * 100000}]}
+
+        events = list(JSONStream(chunked(payload, size=10)).events(array_key='roles'))
+
+        self.assertEqual(events, [('item', payload['roles'][0])])
+
+    def test_truncated(self):
+        chunks = chunked({'roles': [{'id': 1}, {'id': 2}]})[:-2]
+
+        with self.assertRaises(exceptions.UnexpectedDataFormat):
+            list(JSONStream(chunks).events(array_key='roles'))
+
+    def test_not_an_object(self):
+        with self.assertRaises(exceptions.UnexpectedDataFormat):
+            list(JSONStream([b'[1, 2]']).events(array_key='roles'))
+
+
+class TestStreamedList(unittest.TestCase):
+    def test_items_are_decoded_lazily(self):
+        chunks = iter(chunked({'roles': [{'id': 1}, {'id': 2}]}, size=8))
+
+        items = iter(StreamedList(chunks=chunks, resource='roles'))
+
+        self.assertEqual(next(items), {'id': 1})
+        self.assertTrue(list(chunks))  # the rest of the body hasn't been read yet
+
+    def test_member_reads_ahead(self):
+        stream = StreamedList(chunks=chunked({'roles': [{'id': 1}, {'id': 2}], 'linked': {'a': []}}), resource='roles')
+        items = iter(stream)
+
+        self.assertEqual(next(items), {'id': 1})
+        self.assertEqual(stream.member('linked'), {'a': []})
+        self.assertEqual(list(items), [{'id': 2}])
+
+    def test_member_skips_items(self):
+        stream = StreamedList(chunks=chunked({'roles': [{'id': 1}, {'id': 2}], 'linked': {'a': []}}), resource='roles')
+
+        self.assertEqual(stream.member('linked', keep_items=False), {'a': []})
+        self.assertEqual(list(stream), [])
+
+    def test_close(self):
+        closed = []
+        stream = StreamedList(chunks=chunked({'roles': [{'id': 1}]}), resource='roles', close=lambda: closed.append(1))
+
+        self.assertEqual(list(stream), [{'id': 1}])
+        stream.close()
+        self.assertEqual(closed, [1])
+
+
+class TestStreamedListing(LocalServerTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        token_patcher = patch('glassfrog.client.GlassFrogClient._TOKEN', '42')
+        token_patcher.start()
+        self.addCleanup(token_patcher.stop)
+
+        self.routes['/roles'] = {
+            'roles': [
+                {'id': 10, 'name': 'Lead', 'links': {'circle': 1}},
+                {'id': 11, 'name': 'Secretary', 'links': {'circle': 2}},
+            ],
+            'linked': {'circles': [{'id': 1, 'name': 'GCC'}, {'id': 2, 'name': 'Sales'}]},
+        }
+        self.routes['/circles/1'] = None
+        self.routes['/circles/2'] = None
+
+    def test_list(self):
+        roles = glassfrog.Role.list(stream=True)
+
+        role = next(roles)
+        self.assertEqual(role.name, 'Lead')
+        self.assertEqual(role.circle.name, 'GCC')  # linked data comes after the roles in the body
+        self.assertEqual([role.circle.name for role in roles], ['Sales'])
+
+    def test_list_stopped_early(self):
+        for role in glassfrog.Role.list(stream=True):
+            break
+
+        self.assertEqual(role.circle.name, 'GCC')  # pylint: disable=undefined-loop-variable
+
+    def test_serialize(self):
+        roles = list(glassfrog.Role.list(stream=True))
+
+        serialized = json.loads(json.dumps(roles[0].serialize()))
+        role = glassfrog.Role.deserialize(**serialized)
+
+        self.assertEqual(role.circle.name, 'GCC')
+        self.assertEqual(serialized['linked_data'], self.routes['/roles']['linked'])
+
+    def test_linked_data_reads(self):
+        expected = self.routes['/roles']['linked']
+        for read in (dict, len, list, lambda linked: linked['circles'], lambda linked: linked.get('circles')):
+            [role, _] = list(glassfrog.Role.list(stream=True))
+            self.assertEqual(read(role._linked_data), read(expected))
+
+    def test_list_columnar(self):
+        roles = glassfrog.Role.list(columnar=True, stream=True)
+
+        self.assertEqual(list(roles['id']), [10, 11])
+
+    def test_list_in_session(self):
+        with glassfrog.session():
+            roles = list(glassfrog.Role.list(stream=True))
+            self.assertIs(glassfrog.Role.get(id=10), roles[0])
+
+    def test_error(self):
+        self.routes['/roles'] = None
+
+        with self.assertRaises(HTTPError):
+            list(glassfrog.Role.list(stream=True))
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+from contextlib import ExitStack
+
+import requests
+
+import glassfrog
+from glassfrog import exceptions, models, ratelimit
+from glassfrog.client import GlassFrogClient
+from glassfrog.sync import SyncState, Synchronizer, content_hash
+from glassfrog.testing import FakeGlassFrogServer, generate_org
+
+
+class TestContentHash(unittest.TestCase):
+    def test_key_order(self):
+        self.assertEqual(content_hash({'a': 1, 'b': [1, 2]}), content_hash({'b': [1, 2], 'a': 1}))
+        self.assertNotEqual(content_hash({'a': 1}), content_hash({'a': 2}))
+
+
+class TestSynchronizer(unittest.TestCase):
+    def setUp(self):
+        self.org = generate_org(circles=3, roles=10, people=6, assignments=15, seed=11)
+        self.server = FakeGlassFrogServer(self.org).start()
+        self.addCleanup(self.server.stop)
+        stack = ExitStack()
+        self.addCleanup(stack.close)
+        stack.enter_context(self.server.client())
+
+        GlassFrogClient.set_rate_limiter(ratelimit.RateLimiter(sleep=lambda seconds: None))
+        self.addCleanup(GlassFrogClient.set_rate_limiter, ratelimit.RateLimiter())
+
+    def test_first_sync(self):
+        changes = Synchronizer().sync()
+
+        self.assertTrue(changes)
+        self.assertEqual(sorted(changes[models.Role].added), sorted(self.org['roles']))
+        self.assertIsInstance(changes[models.Role].added[1001], models.Role)
+        self.assertEqual(changes.request_count, 4)
+
+    def test_steady_state(self):
+        synchronizer = Synchronizer()
+        synchronizer.sync()
+
+        changes = synchronizer.sync()
+
+        self.assertFalse(changes)
+        self.assertEqual(changes.request_count, 4)
+        self.assertEqual(changes.summary()['roles'], {'added': [], 'modified': [], 'removed': []})
+
+    def test_changes(self):
+        synchronizer = Synchronizer()
+        synchronizer.sync()
+
+        self.org['roles'][1001] = dict(self.org['roles'][1001], name='Renamed')
+        del self.org['people'][6]
+        self.org['circles'][4] = {'id': 4, 'name': 'New', 'links': {'roles': [], 'supported_role': None}}
+        changes = synchronizer.sync()
+
+        self.assertEqual(changes.summary(), {
+            'circles': {'added': [4], 'modified': [], 'removed': []},
+            'roles': {'added': [], 'modified': [1001], 'removed': []},
+            'people': {'added': [], 'modified': [], 'removed': [6]},
+            'assignments': {'added': [], 'modified': [], 'removed': []},
+        })
+        self.assertEqual(changes[models.Role].modified[1001].name, 'Renamed')
+
+    def test_changes_in_session(self):
+        synchronizer = Synchronizer(models=[models.Role])
+        with glassfrog.session():
+            stale = synchronizer.sync()[models.Role].added[1001]
+
+            self.org['roles'][1001] = dict(self.org['roles'][1001], name='Renamed')
+            modified = synchronizer.sync()[models.Role].modified[1001]
+
+            self.assertIsNot(modified, stale)
+            self.assertEqual(modified.name, 'Renamed')
+            self.assertIs(models.Role.get(id=1001), modified)
+
+    def test_prefetch_changed_only(self):
+        synchronizer = Synchronizer(models=[models.Role], prefetch={models.Role: ['assignments']})
+        synchronizer.sync()
+        del self.server.requested_paths[:]
+
+        self.org['roles'][1002] = dict(self.org['roles'][1002], purpose='Changed')
+        changes = synchronizer.sync()
+
+        self.assertEqual(self.server.requested_paths, ['/roles', '/roles/1002/assignments'])
+        self.assertEqual(changes.request_count, 2)
+
+    def test_failed_sync_keeps_state(self):
+        synchronizer = Synchronizer()
+        synchronizer.sync()
+        self.org['roles'][1001] = dict(self.org['roles'][1001], name='Renamed')
+        self.server.error_rate = 1
+
+        with self.assertRaises(requests.HTTPError):
+            synchronizer.sync()
+        self.server.error_rate = 0
+
+        self.assertEqual(list(synchronizer.sync()[models.Role].modified), [1001])
+
+
+class TestSyncState(unittest.TestCase):
+    def test_save_and_load(self):
+        state = SyncState(listings={'roles': 'abc'}, entities={'roles': {1: 'x', 2: 'y'}})
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'state.json')
+            state.save(path)
+            loaded = SyncState.load(path)
+
+        self.assertEqual(loaded.listings, state.listings)
+        self.assertEqual(loaded.entities, state.entities)
+
+    def test_unknown_version(self):
+        with self.assertRaises(exceptions.UnexpectedDataFormat):
+            SyncState.from_dict({'version': 99})
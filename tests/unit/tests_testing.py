@@ -0,0 +1,130 @@
+import unittest
+
+import requests
+
+import glassfrog
+from glassfrog import models, ratelimit
+from glassfrog.client import GlassFrogClient
+from glassfrog.testing import FakeGlassFrogServer, generate_org, respond
+
+
+class TestGenerateOrg(unittest.TestCase):
+    def setUp(self):
+        self.org = generate_org(circles=4, roles=20, people=10, assignments=30, projects=5, seed=7)
+
+    def test_counts(self):
+        counts = {resource: len(self.org[resource]) for resource in ('circles', 'roles', 'people', 'assignments')}
+
+        self.assertEqual(counts, {'circles': 4, 'roles': 20, 'people': 10, 'assignments': 30})
+        self.assertEqual(len(self.org['projects']), 5)
+
+    def test_seeded(self):
+        self.assertEqual(self.org, generate_org(circles=4, roles=20, people=10, assignments=30, projects=5, seed=7))
+        self.assertNotEqual(self.org, generate_org(circles=4, roles=20, people=10, assignments=30, projects=5, seed=8))
+
+    def test_consistent_links(self):
+        for assignment in self.org['assignments'].values():
+            role = self.org['roles'][assignment['links']['role']]
+            person = self.org['people'][assignment['links']['person']]
+            self.assertIn(person['id'], role['links']['people'])
+            self.assertIn(role['links']['circle'], person['links']['circles'])
+
+        for circle in list(self.org['circles'].values())[1:]:
+            supported_role = self.org['roles'][circle['links']['supported_role']]
+            self.assertEqual(supported_role['links']['supporting_circle'], circle['id'])
+
+
+class TestRespond(unittest.TestCase):
+    def setUp(self):
+        self.org = generate_org(circles=2, roles=4, people=3, assignments=5, seed=1)
+
+    def test_list(self):
+        payload = respond(self.org, '/roles')
+
+        self.assertEqual([role['id'] for role in payload['roles']], [1001, 1002, 1003, 1004])
+        linked_ids = {item['id'] for item in payload['linked']['accountabilities']}
+        self.assertEqual(linked_ids, {pk for role in payload['roles'] for pk in role['links']['accountabilities']})
+
+    def test_ids(self):
+        self.assertEqual([role['id'] for role in respond(self.org, '/roles/1003,1001')['roles']], [1003, 1001])
+        self.assertIsNone(respond(self.org, '/roles/42'))
+        self.assertIsNone(respond(self.org, '/potatoes'))
+        self.assertIsNone(respond(self.org, '/roles/1001,,1003'))
+
+    def test_nested(self):
+        assignments = respond(self.org, '/roles/1001/assignments')['assignments']
+
+        self.assertTrue(all(assignment['links']['role'] == 1001 for assignment in assignments))
+        self.assertIsNone(respond(self.org, '/roles/1001,1002/assignments'))
+
+
+class TestFakeGlassFrogServer(unittest.TestCase):
+    def setUp(self):
+        self.org = generate_org(circles=3, roles=9, people=6, assignments=12, seed=3)
+        GlassFrogClient.set_rate_limiter(ratelimit.RateLimiter(sleep=lambda seconds: None))
+        self.addCleanup(GlassFrogClient.set_rate_limiter, ratelimit.RateLimiter())
+
+    def test_traversal(self):
+        with FakeGlassFrogServer(self.org) as server, server.client():
+            people = {
+                person.id
+                for circle in models.Circle.list()
+                for role in circle.roles
+                for person in role.people
+            }
+            assignments = list(glassfrog.Role.get(id=1001).assignments)
+
+        self.assertEqual(people, {assignment['links']['person'] for assignment in self.org['assignments'].values()})
+        self.assertEqual(
+            [assignment.id for assignment in assignments],
+            [pk for pk, item in self.org['assignments'].items() if item['links']['role'] == 1001],
+        )
+        self.assertEqual(server.connections, 1)
+
+    def test_throttled_and_failing(self):
+        with FakeGlassFrogServer(self.org, throttle_rate=0.3, error_rate=0.2, retry_after=0, seed=5) as server, \
+                server.client():
+            roles = [(circle.name, role.name) for circle in models.Circle.list() for role in circle.roles]
+
+        self.assertEqual(len(roles), 9)
+
+    def test_knobs(self):
+        throttling = FakeGlassFrogServer(self.org, throttle_rate=1, retry_after=3)
+        failing = FakeGlassFrogServer(self.org, error_rate=1)
+        working = FakeGlassFrogServer(self.org)
+        for server in (throttling, failing, working):
+            self.addCleanup(server.stop)
+
+        self.assertEqual(throttling.handle('/circles', {})[:2], (429, {'Retry-After': '3'}))
+        self.assertEqual(failing.handle('/circles', {})[0], 503)
+        self.assertEqual(working.handle('/circles/42', {})[0], 404)
+
+    def test_errors(self):
+        with FakeGlassFrogServer(self.org, error_rate=1) as server, server.client():
+            with self.assertRaises(requests.HTTPError):
+                list(models.Circle.list())
+
+        self.assertEqual(len(server.requested_paths), 3)
+
+    def test_nested_batch_not_found(self):
+        with FakeGlassFrogServer(self.org) as server, server.client():
+            with self.assertRaises(requests.HTTPError) as raised:
+                GlassFrogClient.get(resource='assignments', id='1001,1002', from_resource='roles')
+
+        self.assertEqual(raised.exception.response.status_code, 404)
+
+    def test_token(self):
+        with FakeGlassFrogServer(self.org, token='secret') as server:
+            with server.client():
+                self.assertEqual(len(list(models.Circle.list())), 3)
+            with server.client(), self.assertRaises(requests.HTTPError):
+                GlassFrogClient._TOKEN = 'wrong'
+                list(models.Circle.list())
+
+    def test_client_restores(self):
+        url, token = GlassFrogClient._URL, GlassFrogClient._TOKEN
+
+        with FakeGlassFrogServer(self.org) as server, server.client():
+            self.assertEqual(GlassFrogClient._URL, server.url)
+
+        self.assertEqual((GlassFrogClient._URL, GlassFrogClient._TOKEN), (url, token))